@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import TYPE_CHECKING, Any
 from uuid import uuid4
 
 from django.contrib import admin
@@ -17,18 +18,25 @@ class BaseQuerySet(QuerySet):
 
 
 class BaseManager(models.Manager):
+    _queryset_class = BaseQuerySet
+
     def __init__(self, *args, **kwargs) -> None:
         self.include_deleted = kwargs.pop("include_deleted", False)
         super().__init__(*args, **kwargs)
 
     def get_queryset(self) -> BaseQuerySet:
+        queryset = self._queryset_class(model=self.model, using=self._db)
         if self.include_deleted:
-            return BaseQuerySet(model=self.model)
-        return BaseQuerySet(model=self.model).filter(deleted_at__isnull=True)
+            return queryset
+        return queryset.filter(deleted_at__isnull=True)
 
-    def delete(self, now=None, hard=False):
+    def delete(self, now: datetime | None = None, hard: bool = False):
         return self.get_queryset().delete(now, hard)
 
+    if TYPE_CHECKING:
+        # Copied from the queryset class at runtime, out of the type checker's sight
+        def filter(self, *args: Any, **kwargs: Any) -> BaseQuerySet: ...
+
 
 class BaseModel(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
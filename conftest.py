@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    # Uploads, image variants and garden thumbnails are written here, and served directly
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.MEDIA_OFFLOAD = ""
+    return tmp_path
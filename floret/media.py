@@ -0,0 +1,211 @@
+"""
+Serving user-uploaded media.
+
+Replaces ``django.views.static.serve``, which streams every byte through a gunicorn worker
+with no range support and weak caching. Files are served with:
+
+- ``Cache-Control: immutable`` for content-hashed names (see floret.storage), a short
+  max-age otherwise
+- ``ETag``/``Last-Modified`` and 304 responses to conditional requests
+- single ``Range`` requests (206/416), honouring ``If-Range``
+- a precompressed ``.gz``/``.br`` sibling when the client accepts it
+
+With ``MEDIA_OFFLOAD`` set, Django only resolves the file and answers conditional requests;
+the transfer itself is handed to the front proxy via ``X-Accel-Redirect`` (nginx) or
+``X-Sendfile`` (Apache, lighttpd, Caddy), so image traffic never occupies a worker.
+"""
+
+from __future__ import annotations
+
+import mimetypes
+import os
+import posixpath
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseNotAllowed,
+    StreamingHttpResponse,
+)
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from floret.storage import HASHED_NAME_RE
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+MUTABLE_CACHE_CONTROL = "public, max-age=3600"
+# Preferred encoding first
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+GZIP_ALIASES = {"x-gzip": "gzip"}
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+CHUNK_SIZE = 64 * 1024
+
+
+def serve_media(request, path):
+    if request.method not in ("GET", "HEAD"):
+        return HttpResponseNotAllowed(["GET", "HEAD"])
+
+    # Everything below, down to what the proxy is told to send, uses this validated path
+    relative_path = posixpath.normpath(path).lstrip("/")
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, relative_path)
+    except SuspiciousFileOperation as e:
+        raise Http404("Media file not found") from e
+    try:
+        stat = os.stat(full_path)
+    except (FileNotFoundError, NotADirectoryError) as e:
+        raise Http404("Media file not found") from e
+    if not os.path.isfile(full_path):
+        raise Http404("Media file not found")
+
+    # Byte ranges always address the identity encoding
+    encoding, served_path = None, full_path
+    if not settings.MEDIA_OFFLOAD and "Range" not in request.headers:
+        encoding, served_path = _precompressed(request, full_path)
+
+    hashed = bool(HASHED_NAME_RE.search(relative_path))
+    # Each encoding is a different representation, so it gets its own validator
+    etag = quote_etag(
+        f"{stat.st_size:x}-{stat.st_mtime_ns:x}" + (f"-{encoding}" if encoding else "")
+    )
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(stat.st_mtime),
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if hashed else MUTABLE_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+        "Vary": "Accept-Encoding",
+    }
+
+    not_modified = get_conditional_response(
+        request, etag=etag, last_modified=int(stat.st_mtime), response=None
+    )
+    if not_modified is not None:
+        for header, value in headers.items():
+            not_modified.headers.setdefault(header, value)
+        return not_modified
+
+    content_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+
+    if settings.MEDIA_OFFLOAD:
+        return _offload(relative_path, full_path, content_type, headers)
+
+    byte_range = _requested_range(request, etag, stat.st_size)
+    if byte_range == "unsatisfiable":
+        response = HttpResponse(status=416)
+        _set_headers(response, headers)
+        response["Content-Range"] = f"bytes */{stat.st_size}"
+        return response
+    if byte_range is not None:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            _read_range(full_path, start, end - start + 1),
+            status=206,
+            content_type=content_type,
+        )
+        _set_headers(response, headers)
+        response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+        response["Content-Length"] = str(end - start + 1)
+        return response
+
+    response = FileResponse(open(served_path, "rb"), content_type=content_type)
+    _set_headers(response, headers)
+    if encoding:
+        response["Content-Encoding"] = encoding
+    return response
+
+
+def _set_headers(response, headers):
+    for header, value in headers.items():
+        response[header] = value
+
+
+def _offload(relative_path, full_path, content_type, headers):
+    response = HttpResponse(content_type=content_type)
+    _set_headers(response, headers)
+    if settings.MEDIA_OFFLOAD == "accel":
+        # An nginx `internal` location aliased to MEDIA_ROOT, which decodes the URI
+        response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_PREFIX + quote(relative_path)
+    else:
+        response["X-Sendfile"] = full_path
+    return response
+
+
+def _requested_range(request, etag, size):
+    """
+    The inclusive (start, end) byte range to serve, None for the whole file, or
+    "unsatisfiable". Multi-range requests get the whole file, which RFC 9110 allows.
+    """
+    header = request.headers.get("Range")
+    if not header or size == 0:
+        return None
+    # A stale If-Range means the client's partial copy is outdated, send everything
+    if_range = request.headers.get("If-Range")
+    if if_range and if_range != etag:
+        return None
+
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if start >= size or (last and int(last) < start):
+            return "unsatisfiable"
+    else:
+        # Suffix range: the last N bytes
+        suffix = int(last)
+        if suffix == 0:
+            return "unsatisfiable"
+        start, end = max(size - suffix, 0), size - 1
+    return start, end
+
+
+def _read_range(full_path, start, length):
+    with open(full_path, "rb") as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _precompressed(request, full_path):
+    qualities = _accepted_encodings(request.headers.get("Accept-Encoding", ""))
+    for encoding, suffix in PRECOMPRESSED:
+        quality = qualities.get(encoding, qualities.get("*", 0))
+        if quality > 0 and os.path.isfile(full_path + suffix):
+            return encoding, full_path + suffix
+    return None, full_path
+
+
+def _accepted_encodings(header):
+    """
+    The q-value of each content coding in an Accept-Encoding header, e.g.
+    ``gzip;q=0, br`` -> {"gzip": 0.0, "br": 1.0}. Unparsable q-values count as 0.
+    """
+    qualities = {}
+    for element in header.split(","):
+        coding, *params = (part.strip() for part in element.split(";"))
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        coding = coding.lower()
+        # RFC 9110 treats x-gzip as an alias of gzip
+        qualities[GZIP_ALIASES.get(coding, coding)] = quality
+    return qualities
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -67,6 +68,7 @@ DJANGO_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 
 INSTALLED_APPS = INTERNAL_APPS + VENDOR_APPS + DJANGO_APPS
@@ -195,6 +197,8 @@ Q_CLUSTER = {
     "queue_limit": 50,
     "bulk": 10,
     "orm": "default",
+    # Run tasks inline under test, so their effects can be asserted on directly
+    "sync": IS_TESTING,
 }
 
 # ==============================================================================
@@ -245,11 +249,19 @@ STATICFILES_DIRS = [
     os.path.join(BASE_DIR, "theme/static/"),
 ]
 
-STATICFILES_STORAGE = (
-    "whitenoise.storage.CompressedManifestStaticFilesStorage"
-    if IS_PROD
-    else "whitenoise.storage.CompressedStaticFilesStorage"
-)
+STORAGES = {
+    # Content-hashed upload names, so media can be cached as immutable (see floret.media)
+    "default": {
+        "BACKEND": "floret.storage.HashedMediaStorage",
+    },
+    "staticfiles": {
+        "BACKEND": (
+            "whitenoise.storage.CompressedManifestStaticFilesStorage"
+            if IS_PROD
+            else "whitenoise.storage.CompressedStaticFilesStorage"
+        ),
+    },
+}
 
 # ==============================================================================
 # MEDIA FILES
@@ -258,6 +270,30 @@ STATICFILES_STORAGE = (
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
+# Hand media transfers to the front proxy instead of streaming them from a worker:
+# "accel" sends X-Accel-Redirect to MEDIA_ACCEL_PREFIX (an nginx `internal` location
+# aliased to MEDIA_ROOT), "sendfile" sends X-Sendfile with the absolute path
+MEDIA_OFFLOAD = os.environ.get("MEDIA_OFFLOAD", "")
+MEDIA_ACCEL_PREFIX = os.environ.get("MEDIA_ACCEL_PREFIX", "/_media/")
+
+# ==============================================================================
+# PLANNER
+# ==============================================================================
+
+# Serve plant_list filtering from a memory-mapped bitmap index of the catalog
+# (see planner/catalog_index.py) instead of compiling a query per request
+CATALOG_INDEX_ENABLED = os.environ.get("CATALOG_INDEX_ENABLED", "false").lower() == "true"
+CATALOG_INDEX_DIR = os.environ.get(
+    "CATALOG_INDEX_DIR", os.path.join(tempfile.gettempdir(), "floret-catalog")
+)
+
+# Upper bounds on a garden posted to save_garden, enforced while the body is streamed in
+# (see planner/ingest.py). JSON bodies are read past DATA_UPLOAD_MAX_MEMORY_SIZE, up to
+# GARDEN_MAX_BYTES.
+GARDEN_MAX_BYTES = int(os.environ.get("GARDEN_MAX_BYTES", 16 * 1024 * 1024))
+GARDEN_MAX_PLANTS = int(os.environ.get("GARDEN_MAX_PLANTS", 2_000))
+GARDEN_MAX_POSITIONS = int(os.environ.get("GARDEN_MAX_POSITIONS", 200_000))
+
 # ==============================================================================
 # DEFAULT PRIMARY KEY FIELD TYPE
 # ==============================================================================
@@ -0,0 +1,162 @@
+import gzip
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.urls import reverse
+
+
+@pytest.fixture
+def photo():
+    return default_storage.save("plants/bergamot.jpg", ContentFile(bytes(range(256)) * 4))
+
+
+def _get(client, name, **headers):
+    return client.get(reverse("media", args=[name]), headers=headers)
+
+
+class TestHashedMediaStorage:
+    """Test content-hashed media names."""
+
+    def test_names_follow_content(self):
+        first = default_storage.save("plants/a.jpg", ContentFile(b"one"))
+        same = default_storage.save("plants/b.jpg", ContentFile(b"one"))
+        other = default_storage.save("plants/a.jpg", ContentFile(b"two"))
+
+        assert first.startswith("plants/a.") and first.endswith(".jpg")
+        assert same.startswith("plants/b.")
+        assert first.split(".")[1] == same.split(".")[1]
+        assert other != first
+
+    def test_rehashing_replaces_the_digest(self):
+        first = default_storage.save("icons/leaf.png", ContentFile(b"leaf"))
+        second = default_storage.save(first, ContentFile(b"other leaf"))
+
+        assert second.count(".") == 2
+
+    def test_text_uploads_get_gzip_sibling(self):
+        name = default_storage.save("icons/leaf.svg", ContentFile(b"<svg></svg>" * 50))
+
+        with default_storage.open(f"{name}.gz") as f:
+            assert gzip.decompress(f.read()) == b"<svg></svg>" * 50
+
+        default_storage.delete(name)
+        assert not default_storage.exists(f"{name}.gz")
+
+
+class TestServeMedia:
+    """Test the media serving view."""
+
+    def test_hashed_files_are_immutable(self, client, photo):
+        response = _get(client, photo)
+
+        assert response.status_code == 200
+        assert b"".join(response.streaming_content) == bytes(range(256)) * 4
+        assert response["Content-Type"] == "image/jpeg"
+        assert response["Cache-Control"] == "public, max-age=31536000, immutable"
+        assert response["Accept-Ranges"] == "bytes"
+        assert response["ETag"]
+
+    def test_unhashed_files_get_short_max_age(self, client, media_root):
+        (media_root / "robots.txt").write_text("User-agent: *")
+
+        response = _get(client, "robots.txt")
+
+        assert response["Cache-Control"] == "public, max-age=3600"
+
+    def test_if_none_match_returns_304(self, client, photo):
+        etag = _get(client, photo)["ETag"]
+
+        response = _get(client, photo, if_none_match=etag)
+
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+        assert not response.content
+
+    def test_byte_range(self, client, photo):
+        response = _get(client, photo, range="bytes=10-19")
+
+        assert response.status_code == 206
+        assert b"".join(response.streaming_content) == bytes(range(10, 20))
+        assert response["Content-Range"] == "bytes 10-19/1024"
+        assert response["Content-Length"] == "10"
+
+    def test_suffix_and_open_ended_ranges(self, client, photo):
+        suffix = _get(client, photo, range="bytes=-4")
+        open_ended = _get(client, photo, range="bytes=1020-")
+
+        assert suffix["Content-Range"] == "bytes 1020-1023/1024"
+        assert b"".join(open_ended.streaming_content) == bytes(range(252, 256))
+
+    def test_unsatisfiable_range(self, client, photo):
+        response = _get(client, photo, range="bytes=5000-")
+
+        assert response.status_code == 416
+        assert response["Content-Range"] == "bytes */1024"
+
+    def test_stale_if_range_sends_whole_file(self, client, photo):
+        response = _get(client, photo, range="bytes=0-9", if_range='"stale"')
+
+        assert response.status_code == 200
+
+    def test_precompressed_sibling(self, client):
+        name = default_storage.save("icons/leaf.svg", ContentFile(b"<svg></svg>" * 50))
+
+        response = _get(client, name, accept_encoding="gzip, deflate")
+        plain = _get(client, name)
+
+        assert response["Content-Encoding"] == "gzip"
+        assert response["Content-Type"] == "image/svg+xml"
+        assert "Accept-Encoding" in response["Vary"]
+        assert response["ETag"] != plain["ETag"]
+        assert "Content-Encoding" not in plain
+
+    @pytest.mark.parametrize(
+        "accept_encoding", ["gzip;q=0, deflate", "gzip; q=0.0", "x-gzip-foo", "*;q=0", "identity"]
+    )
+    def test_precompressed_sibling_not_accepted(self, client, accept_encoding):
+        name = default_storage.save("icons/leaf.svg", ContentFile(b"<svg></svg>" * 50))
+
+        response = _get(client, name, accept_encoding=accept_encoding)
+
+        assert "Content-Encoding" not in response
+
+    @pytest.mark.parametrize("accept_encoding", ["GZIP;q=0.5", "x-gzip", "*", "br;q=0, *"])
+    def test_precompressed_sibling_accepted(self, client, accept_encoding):
+        name = default_storage.save("icons/leaf.svg", ContentFile(b"<svg></svg>" * 50))
+
+        response = _get(client, name, accept_encoding=accept_encoding)
+
+        assert response["Content-Encoding"] == "gzip"
+
+    def test_accel_redirect_offload(self, client, photo, settings):
+        settings.MEDIA_OFFLOAD = "accel"
+
+        response = _get(client, photo)
+
+        assert response.status_code == 200
+        assert response["X-Accel-Redirect"] == f"/_media/{photo}"
+        assert response["Cache-Control"] == "public, max-age=31536000, immutable"
+        assert not response.content
+
+    def test_accel_redirect_uses_the_validated_path(self, client, photo, settings):
+        settings.MEDIA_OFFLOAD = "accel"
+        name = default_storage.save("plants/wild bergamot.jpg", ContentFile(b"photo"))
+        directory, filename = photo.split("/")
+
+        dotted = _get(client, f"{directory}/./other/../{filename}")
+        spaced = _get(client, name)
+
+        assert dotted["X-Accel-Redirect"] == f"/_media/{photo}"
+        assert spaced["X-Accel-Redirect"] == f"/_media/{name.replace(' ', '%20')}"
+
+    def test_sendfile_offload(self, client, photo, settings, media_root):
+        settings.MEDIA_OFFLOAD = "sendfile"
+
+        response = _get(client, photo)
+
+        assert response["X-Sendfile"] == str(media_root / photo)
+
+    def test_path_traversal_is_404(self, client):
+        assert _get(client, "../settings.py").status_code == 404
+        assert _get(client, "missing.jpg").status_code == 404
@@ -1,13 +1,8 @@
 from django.contrib import admin
 
 from common.mixins.base import BaseModelAdmin, BaseTabularInline
-from planner.models import Color, Garden, GardenPlant, Niche, Plant, PlantFeature, PlantPosition
-
-
-class PlantPositionInline(BaseTabularInline):
-    model = PlantPosition
-    extra = 1
-    fields = ("x", "y")
+from planner.gardens import recount_gardens, refresh_gardens
+from planner.models import Color, Garden, GardenPlant, Niche, Plant, PlantFeature
 
 
 class GardenPlantInline(BaseTabularInline):
@@ -20,32 +15,77 @@ class GardenPlantInline(BaseTabularInline):
 
 @admin.register(Garden)
 class GardenAdmin(BaseModelAdmin):
-    list_display = ("name", "user", "width", "length", "created_at")
+    list_display = (
+        "name",
+        "user",
+        "width",
+        "length",
+        "plant_count",
+        "position_count",
+        "created_at",
+    )
     list_filter = ("user", "created_at")
     search_fields = ("name", "description", "user__email")
-    readonly_fields = ("id", "created_at", "updated_at", "deleted_at")
+    readonly_fields = (
+        "id",
+        "created_at",
+        "updated_at",
+        "deleted_at",
+        "plant_count",
+        "position_count",
+    )
     autocomplete_fields = ("user",)
     inlines = [GardenPlantInline]
     fieldsets = (
         ("Garden Info", {"fields": ("name", "user", "width", "length")}),
+        ("Counts", {"fields": ("plant_count", "position_count")}),
         ("Description", {"fields": ("description",)}),
         ("Metadata", {"fields": ("created_at", "updated_at"), "classes": ("collapse",)}),
     )
 
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # Inline rows are saved one by one, outside of save_packed_plants
+        gardens = Garden.all_objects.filter(pk=form.instance.pk)
+        recount_gardens(gardens)
+        if form.has_changed() or any(formset.has_changed() for formset in formsets):
+            # Like a save: a new revision, and a hash for the next save to compare with
+            refresh_gardens(gardens)
+
 
 @admin.register(GardenPlant)
 class GardenPlantAdmin(BaseModelAdmin):
-    list_display = ("garden", "plant", "color", "get_quantity")
+    list_display = ("garden", "plant", "color", "position_count")
     list_filter = ("garden", "plant", "color")
     search_fields = ("garden__name", "plant__common_name", "color__name")
     autocomplete_fields = ("garden", "plant", "color")
-    readonly_fields = ("id", "created_at", "updated_at", "deleted_at")
-    inlines = [PlantPositionInline]
+    readonly_fields = ("id", "created_at", "updated_at", "deleted_at", "get_positions")
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        # The plant may have been moved from another garden
+        gardens = Garden.all_objects.filter(pk__in={obj.garden_id, form.initial.get("garden")})
+        recount_gardens(gardens)
+        refresh_gardens(gardens)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        gardens = Garden.all_objects.filter(pk=obj.garden_id)
+        recount_gardens(gardens)
+        refresh_gardens(gardens)
+
+    def delete_queryset(self, request, queryset):
+        gardens = Garden.all_objects.filter(
+            pk__in=list(queryset.values_list("garden_id", flat=True))
+        )
+        super().delete_queryset(request, queryset)
+        recount_gardens(gardens)
+        refresh_gardens(gardens)
 
-    def get_quantity(self, obj):
-        return obj.quantity
+    def get_positions(self, obj):
+        return ", ".join(f"({x:g}, {y:g})" for x, y in obj.positions)
 
-    get_quantity.short_description = "Quantity"
+    get_positions.short_description = "Positions"
 
 
 @admin.register(Plant)
@@ -105,12 +145,3 @@ class ColorAdmin(BaseModelAdmin):
         "hex_code",
     )
     ordering = ("name",)
-
-
-@admin.register(PlantPosition)
-class PlantPositionAdmin(BaseModelAdmin):
-    list_display = ("garden_plant", "x", "y", "created_at")
-    list_filter = ("garden_plant__garden", "garden_plant__plant")
-    search_fields = ("garden_plant__garden__name", "garden_plant__plant__common_name")
-    autocomplete_fields = ("garden_plant",)
-    readonly_fields = ("created_at", "updated_at")
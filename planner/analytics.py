@@ -0,0 +1,130 @@
+"""
+Analytics of a saved garden, for the garden summary.
+
+The garden's plant/color combinations and position counts are read in one query, together
+with the garden's revision so both come from the same snapshot. Everything else comes from
+the cached plant details (see planner.plant_details), in one pass over the combinations.
+
+Results only change with the garden's revision or the catalog (a plant's bloom months,
+say), so load_garden_analytics caches them under both: no invalidation needed, a new
+revision or catalog version simply misses.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import Counter
+from uuid import UUID
+
+from django.db.models import FilteredRelation, Q
+
+from planner.constants import DEFAULT_PLANT_SPREAD
+from planner.models import BloomOptions, Garden, Niche
+from planner.plant_details import plant_details
+
+
+def analytics_cache_key(garden_id, revision: int, catalog_version: int) -> str:
+    return f"planner:garden_analytics:{garden_id}:{revision}:{catalog_version}"
+
+
+def garden_analytics(garden_id, user_id) -> tuple[int, dict]:
+    """
+    A garden's analytics, with the revision they describe. Raises Garden.DoesNotExist if
+    the user has no such garden.
+    """
+    rows = list(
+        Garden.objects.filter(id=garden_id, user_id=user_id)
+        .annotate(
+            live=FilteredRelation(
+                "garden_plants", condition=Q(garden_plants__deleted_at__isnull=True)
+            )
+        )
+        .values_list(
+            "revision",
+            "width",
+            "length",
+            "live__plant_id",
+            "live__color_id",
+            "live__position_count",
+        )
+    )
+    if not rows:
+        raise Garden.DoesNotExist
+    revision, width, length = rows[0][:3]
+    quantities = {
+        (str(plant_id), str(color_id)): count
+        for *_, plant_id, color_id, count in rows
+        if plant_id is not None
+    }
+    details = plant_details(list(quantities))
+
+    colors: dict[str, dict] = {}
+    niches: dict[str, str] = {}
+    features: dict[UUID, dict] = {}
+    # Positions per color, and combinations, in bloom each month
+    bloom = {month: Counter() for month in BloomOptions.values}
+    blooming = Counter()
+    positions = native = native_positions = canopy = 0
+    for detail in details:
+        quantity = quantities[detail["plant_id"], detail["color_id"]]
+        positions += quantity
+        color = colors.setdefault(
+            detail["color_id"],
+            {"id": detail["color_id"], "hex": detail["color_hex"], "name": detail["color_name"]},
+        )
+        color["positions"] = color.get("positions", 0) + quantity
+        if detail["niche_id"]:
+            niches[str(detail["niche_id"])] = detail["niche_name"]
+        for feature in detail["features"]:
+            features.setdefault(feature["id"], {**feature, "count": 0})["count"] += 1
+        for month in set(detail["bloom"] or ()) & bloom.keys():
+            bloom[month][detail["color_id"]] += quantity
+            blooming[month] += 1
+        if detail["native"]:
+            native += 1
+            native_positions += quantity
+        spread = detail["spread"] or DEFAULT_PLANT_SPREAD
+        canopy += quantity * math.pi * (spread / 2) ** 2
+
+    return revision, {
+        "plant_count": len(details),
+        "species_count": len({detail["plant_id"] for detail in details}),
+        "position_count": positions,
+        "color_count": len(colors),
+        "colors": list(colors.values()),
+        "native": {
+            "plants": native,
+            "positions": native_positions,
+            "ratio": native_positions / positions if positions else 0,
+        },
+        "niches": {
+            "covered": len(niches),
+            "total": Niche.objects.count(),
+            "names": sorted(niches.values()),
+        },
+        "features": sorted(features.values(), key=lambda feature: -feature["count"]),
+        # Bloom histogram, and which colors (by positions) bloom in each month
+        "bloom": [
+            {
+                "month": month,
+                "label": label,
+                "plants": blooming[month],
+                "positions": sum(bloom[month].values()),
+                "colors": dict(bloom[month]),
+            }
+            for month, label in BloomOptions.choices
+        ],
+        "canopy_area": canopy,
+        "canopy_ratio": canopy / (width * length) if width and length else 0,
+        "plants": [
+            {
+                "plant_id": detail["plant_id"],
+                "color_id": detail["color_id"],
+                "common_name": detail["common_name"],
+                "scientific_name": detail["scientific_name"],
+                "height": detail["height"],
+                "quantity": quantities[detail["plant_id"], detail["color_id"]],
+            }
+            for detail in details
+        ],
+    }
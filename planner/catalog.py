@@ -0,0 +1,60 @@
+"""
+Catalog versioning for caches derived from the plant catalog.
+
+Plants, colors, features and niches only change when an admin edits them, so everything
+computed from them (rendered plant lists, facet counts) is cached under a key that embeds
+a catalog version. Any catalog write bumps the version once its transaction commits, which
+orphans every old entry at once instead of having to find and delete them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+CATALOG_VERSION_KEY = "planner:catalog_version"
+
+
+def _start_catalog_version() -> None:
+    # A missing key (first run, flushed or evicted cache) starts a new series from the
+    # current time, so it can never collide with entries cached under an older series
+    cache.add(CATALOG_VERSION_KEY, time.time_ns() // 1000, timeout=None)
+
+
+def get_catalog_version() -> int:
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        _start_catalog_version()
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def _bump_catalog_version() -> None:
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        _start_catalog_version()
+
+
+def bump_catalog_version() -> None:
+    """Invalidate every catalog-derived cache entry once the current transaction commits."""
+    transaction.on_commit(_bump_catalog_version)
+
+
+def catalog_cache_key(prefix: str, params: dict) -> str:
+    """
+    Versioned cache key for a set of request parameters (e.g. validated filters).
+
+    Empty values are dropped and lists are sorted, so equivalent filter sets share a key.
+    """
+    canonical = {
+        key: sorted(value) if isinstance(value, list) else value
+        for key, value in params.items()
+        if value not in (None, "", [], False)
+    }
+    digest = hashlib.sha256(json.dumps(canonical, sort_keys=True).encode()).hexdigest()
+    return f"{prefix}:{get_catalog_version()}:{digest}"
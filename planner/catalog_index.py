@@ -0,0 +1,331 @@
+"""
+In-process bitmap index over the plant catalog.
+
+The catalog is small and read-mostly, so instead of compiling a multi-join query for every
+plant_list request, all non-deleted plants are loaded once per catalog version into
+array-backed columns, in plant_list order (common name, id):
+
+- one bitset per sun option, bloom month, niche, color and feature, plus native/buyable
+- height and spread as sorted value arrays with the row each value belongs to
+
+Filters become bitwise AND/OR over bitsets plus a bisection per range filter, and only
+the ids of the requested page are hydrated from the database.
+
+The columns are written once to a snapshot file per catalog version and memory-mapped,
+so every gunicorn worker on a host shares the same pages of the OS page cache instead of
+holding its own copy.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import struct
+import tempfile
+from pathlib import Path
+from uuid import UUID
+
+import numpy as np
+from django.conf import settings
+
+from planner.catalog import get_catalog_version
+from planner.pagination import KeysetPage, decode_cursor, keyset_page
+
+MAGIC = b"FLRTIDX1"
+HEADER = struct.Struct("<8sQ")
+ALIGNMENT = 64
+ORDERING = ("common_name", "id")
+SNAPSHOT_NAME_RE = re.compile(r"catalog-(\d+)\.idx")
+
+_current: CatalogIndex | None = None
+
+
+def get_catalog_index() -> CatalogIndex:
+    """The index for the current catalog version, built on first use."""
+    global _current
+    version = get_catalog_version()
+    if _current is None or _current.version != version:
+        _current = CatalogIndex.open(version)
+    return _current
+
+
+class CatalogIndex:
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            magic, meta_length = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a catalog index snapshot")
+            meta = json.loads(f.read(meta_length))
+
+        self.version: int = meta["version"]
+        self.size: int = meta["size"]
+        self._bitset_keys: dict[str, int] = meta["bitsets"]
+
+        columns = {}
+        for name, (dtype, offset, shape) in meta["columns"].items():
+            if 0 in shape:
+                columns[name] = np.zeros(shape, dtype=dtype)
+            else:
+                columns[name] = np.memmap(
+                    path, dtype=dtype, mode="r", offset=offset, shape=tuple(shape)
+                )
+
+        self.ids = columns["ids"]
+        self.ids_sorted = columns["ids_sorted"]
+        self.ids_order = columns["ids_order"]
+        self.bitsets = columns["bitsets"]
+        self.ranges = {
+            field: (columns[f"{field}_values"], columns[f"{field}_rows"])
+            for field in ("height", "spread")
+        }
+
+    @classmethod
+    def open(cls, version: int) -> CatalogIndex:
+        directory = Path(settings.CATALOG_INDEX_DIR)
+        path = directory / f"catalog-{version}.idx"
+        if not path.exists():
+            cls.build(version, path)
+        return cls(path)
+
+    @classmethod
+    def build(cls, version: int, path: Path) -> None:
+        """Write a snapshot of the current catalog to ``path``."""
+        from planner.models import BloomOptions, Plant, SunOptions
+
+        rows = list(
+            Plant.objects.order_by(*ORDERING).values_list(
+                "id",
+                "sun",
+                "bloom",
+                "niche_id",
+                "native",
+                "link",
+                "height",
+                "spread",
+                "color_ids",
+                "feature_ids",
+            )
+        )
+        size = len(rows)
+
+        masks: dict[str, np.ndarray] = {}
+
+        def mask(key: str) -> np.ndarray:
+            if key not in masks:
+                masks[key] = np.zeros(size, dtype=bool)
+            return masks[key]
+
+        mask("all")[:] = True
+        for value in SunOptions.values:
+            mask(f"sun:{value}")
+        for value in BloomOptions.values:
+            mask(f"bloom:{value}")
+
+        for index, row in enumerate(rows):
+            _, sun, bloom, niche_id, native, link, _, _, color_ids, feature_ids = row
+            for value in sun:
+                mask(f"sun:{value}")[index] = True
+            for value in bloom:
+                mask(f"bloom:{value}")[index] = True
+            if niche_id:
+                mask(f"niche:{niche_id}")[index] = True
+            mask("native")[index] = native
+            mask("buyable")[index] = bool(link)
+            for color_id in color_ids:
+                mask(f"color:{color_id}")[index] = True
+            for feature_id in feature_ids:
+                mask(f"feature:{feature_id}")[index] = True
+
+        keys = sorted(masks)
+        words = max(1, -(-size // 64))
+        bitsets = np.zeros((len(keys), words), dtype=np.uint64)
+        for index, key in enumerate(keys):
+            packed = np.packbits(masks[key], bitorder="little")
+            bitsets[index].view(np.uint8)[: packed.size] = packed
+
+        ids = np.array([row[0].bytes for row in rows], dtype="S16")
+        ids_order = np.argsort(ids, kind="stable").astype(np.int32)
+        columns = {
+            "ids": ids,
+            "ids_sorted": ids[ids_order],
+            "ids_order": ids_order,
+            "bitsets": bitsets,
+        }
+        for field, column in (("height", 6), ("spread", 7)):
+            values = np.array(
+                [np.nan if row[column] is None else row[column] for row in rows],
+                dtype=np.float64,
+            )
+            present = np.flatnonzero(~np.isnan(values))
+            order = np.argsort(values[present], kind="stable")
+            columns[f"{field}_values"] = values[present][order]
+            columns[f"{field}_rows"] = present[order].astype(np.int32)
+
+        cls._write(path, version, size, dict(zip(keys, range(len(keys)))), columns)
+
+    @staticmethod
+    def _write(path: Path, version: int, size: int, bitset_keys: dict, columns: dict) -> None:
+        # Lay the columns out after a header that is padded to a fixed size
+        layout, offset = {}, 0
+        for name, array in columns.items():
+            layout[name] = (array.dtype.str, offset, list(array.shape))
+            offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+        def encode_meta(base: int) -> bytes:
+            shifted = {
+                name: (dtype, base + start, shape)
+                for name, (dtype, start, shape) in layout.items()
+            }
+            meta = {"version": version, "size": size, "bitsets": bitset_keys, "columns": shifted}
+            return json.dumps(meta).encode()
+
+        # The data offset depends on the metadata length, which depends on the offsets
+        base = 0
+        while True:
+            meta = encode_meta(base)
+            needed = -(-(HEADER.size + len(meta)) // ALIGNMENT) * ALIGNMENT
+            if needed <= base:
+                break
+            base = needed
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".catalog-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(meta)))
+            f.write(meta)
+            for name, array in columns.items():
+                f.seek(base + layout[name][1])
+                f.write(np.ascontiguousarray(array).tobytes())
+        # Atomic, so concurrent builders and readers never see a partial file
+        os.replace(tmp_path, path)
+
+        # Workers still mapping an older snapshot keep their pages until they move on. Only
+        # older ones go: a concurrent builder may just have written a newer one.
+        for stale in path.parent.glob("catalog-*.idx"):
+            match = SNAPSHOT_NAME_RE.fullmatch(stale.name)
+            if match and int(match[1]) < version:
+                stale.unlink(missing_ok=True)
+
+    def _bitset(self, key: str) -> np.ndarray:
+        index = self._bitset_keys.get(key)
+        if index is None:
+            return np.zeros(self.bitsets.shape[1], dtype=np.uint64)
+        return self.bitsets[index]
+
+    def _any(self, keys) -> np.ndarray:
+        result = np.zeros(self.bitsets.shape[1], dtype=np.uint64)
+        for key in keys:
+            result |= self._bitset(key)
+        return result
+
+    def _related_bitset(self, prefix: str, value: str) -> np.ndarray:
+        # Ids arrive as strings from the query string, in whatever case the client sent
+        try:
+            return self._bitset(f"{prefix}:{UUID(value)}")
+        except ValueError:
+            return self._bitset("")
+
+    def _range(self, field: str, low: float | None, high: float | None) -> np.ndarray:
+        values, rows = self.ranges[field]
+        start = 0 if low is None else np.searchsorted(values, low, side="left")
+        stop = len(values) if high is None else np.searchsorted(values, high, side="right")
+        selected = np.zeros(self.bitsets.shape[1] * 64, dtype=bool)
+        selected[rows[start:stop]] = True
+        return np.packbits(selected, bitorder="little").view(np.uint64)
+
+    def match(self, filters: dict) -> np.ndarray:
+        """
+        Row positions, in plant_list order, of plants matching a validated filter set.
+
+        Mirrors ``PlantQuerySet.apply_filters`` for every filter except ``search``.
+        """
+        result = np.array(self._bitset("all"))
+
+        if filters.get("niche"):
+            result &= self._related_bitset("niche", filters["niche"])
+        if filters.get("sun"):
+            result &= self._any(f"sun:{value}" for value in filters["sun"])
+        if filters.get("bloom"):
+            keys = [f"bloom:{value}" for value in filters["bloom"]]
+            if filters.get("bloomMatch") == "all":
+                for key in keys:
+                    result &= self._bitset(key)
+            else:
+                result &= self._any(keys)
+        for key in ("native", "buyable"):
+            if filters.get(key):
+                result &= self._bitset(key)
+
+        for field in ("height", "spread"):
+            low, high = filters.get(f"{field}Min"), filters.get(f"{field}Max")
+            if low is not None or high is not None:
+                result &= self._range(field, low, high)
+
+        if filters.get("colors"):
+            any_color = np.zeros_like(result)
+            for color_id in filters["colors"]:
+                any_color |= self._related_bitset("color", color_id)
+            result &= any_color
+
+        for feature_id in filters.get("features", []):
+            result &= self._related_bitset("feature", feature_id)
+
+        bits = np.unpackbits(result.view(np.uint8), bitorder="little")[: self.size]
+        return np.flatnonzero(bits)
+
+    def position_of(self, plant_id: str) -> int | None:
+        try:
+            key = UUID(plant_id).bytes
+        except (TypeError, ValueError):
+            return None
+        index = int(np.searchsorted(self.ids_sorted, key))
+        if index < self.size and bytes(self.ids_sorted[index]).ljust(16, b"\0") == key:
+            return int(self.ids_order[index])
+        return None
+
+    def page(self, filters: dict, token: str | None, per_page: int) -> KeysetPage | None:
+        """
+        A plant_list page for a filter set and cursor, hydrating only the page's plants.
+
+        Returns None when the cursor points at a plant this snapshot does not know, so the
+        caller can fall back to the database.
+        """
+        from planner.models import Plant
+
+        positions = self.match(filters)
+        cursor = decode_cursor(token)
+        if cursor is not None and len(cursor["v"]) != len(ORDERING):
+            cursor = None
+
+        if cursor is None:
+            number, has_previous = 1, False
+            window = positions[: per_page + 1]
+            has_next = len(window) > per_page
+            window = window[:per_page]
+        else:
+            anchor = self.position_of(cursor["v"][-1])
+            if anchor is None:
+                return None
+            number = max(cursor["p"], 1)
+            if cursor["d"] == "next":
+                start = int(np.searchsorted(positions, anchor, side="right"))
+                window = positions[start : start + per_page + 1]
+                has_previous, has_next = True, len(window) > per_page
+                window = window[:per_page]
+            else:
+                stop = int(np.searchsorted(positions, anchor, side="left"))
+                window = positions[max(stop - per_page - 1, 0) : stop]
+                has_previous, has_next = len(window) > per_page, True
+                window = window[-per_page:]
+
+        ids = [UUID(bytes=bytes(self.ids[position]).ljust(16, b"\0")) for position in window]
+        plants = (
+            Plant.objects.select_related("niche")
+            .prefetch_related("colors", "features")
+            .in_bulk(ids)
+        )
+        rows = [plants[plant_id] for plant_id in ids if plant_id in plants]
+        return keyset_page(
+            rows, ORDERING, per_page, number, len(positions), has_previous, has_next
+        )
@@ -0,0 +1,103 @@
+"""
+Request and response bodies of the planner API.
+
+Bodies are JSON, parsed and encoded with orjson: several times faster than the ``json``
+module, straight from and to bytes, and with UUIDs and datetimes serialized natively, so
+views put model values in responses as they are.
+
+Clients may also send ``application/msgpack`` bodies and ask for MessagePack responses by
+listing it in ``Accept``. The structures are the same either way; UUIDs and datetimes become
+the strings they are in JSON. Clients that don't ask for MessagePack get JSON.
+"""
+
+from __future__ import annotations
+
+import datetime
+import uuid
+from typing import Any
+
+import msgpack
+import orjson
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+
+
+class DecodeError(ValueError):
+    """A request body that isn't valid in its content type."""
+
+
+def dumps(data: Any) -> bytes:
+    return orjson.dumps(data)
+
+
+def loads(data: bytes | str) -> Any:
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError as e:
+        raise DecodeError(f"Invalid JSON: {e}") from e
+
+
+def encode(data: Any, content_type: str) -> bytes:
+    if content_type == MSGPACK:
+        packed = msgpack.packb(data, default=_msgpack_default)
+        # None only comes back from a Packer told not to reset, which packb never is
+        assert packed is not None
+        return packed
+    return dumps(data)
+
+
+def _msgpack_default(value):
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def transcode(body: bytes | str, content_type: str) -> bytes | str:
+    """A JSON body (e.g. cached, or built by Postgres) in the negotiated content type."""
+    if content_type == MSGPACK:
+        return encode(loads(body), MSGPACK)
+    return body
+
+
+def read(request) -> Any:
+    """The request body decoded according to its Content-Type. Raises DecodeError."""
+    if request.content_type != MSGPACK:
+        return loads(request.body)
+    try:
+        return msgpack.unpackb(request.body)
+    except ValueError as e:
+        raise DecodeError(f"Invalid MessagePack: {e}") from e
+
+
+def negotiate(request) -> str:
+    """MSGPACK when the client lists it in Accept, else JSON."""
+    if any(
+        (accepted.main_type, accepted.sub_type) == ("application", "msgpack")
+        for accepted in request.accepted_types
+    ):
+        return MSGPACK
+    return JSON
+
+
+def variant_etag(etag: str, content_type: str) -> str:
+    """
+    The ETag of a response in ``content_type``: strong validators must differ between
+    representations, so MessagePack ones get a suffix.
+    """
+    if content_type == MSGPACK:
+        return f'{etag[:-1]}+msgpack"'
+    return etag
+
+
+class ApiResponse(HttpResponse):
+    """``data`` encoded in the content type negotiated with the request, see ``negotiate``."""
+
+    def __init__(self, request, data: Any, **kwargs):
+        content_type = negotiate(request)
+        super().__init__(encode(data, content_type), content_type=content_type, **kwargs)
+        patch_vary_headers(self, ["Accept"])
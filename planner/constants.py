@@ -0,0 +1,57 @@
+PLANT_LIST_PAGE_SIZE = 24
+
+# Catalog caches are versioned (see planner.catalog), so these only bound memory use
+PLANT_LIST_CACHE_TIMEOUT = 60 * 60 * 24
+FACET_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Responsive image variants (see planner.images), widths in px
+PLANT_IMAGE_WIDTHS = (320, 640, 960, 1280)
+ICON_IMAGE_WIDTHS = (32, 64, 96)
+# Preferred format first, it is listed first in <picture>
+IMAGE_VARIANT_QUALITY = {"avif": 55, "webp": 78}
+# Longest side in px of the inline blurred placeholder shown while an image loads
+IMAGE_PLACEHOLDER_SIZE = 20
+
+# Upper bound on the operations in one incremental garden sync
+GARDEN_SYNC_MAX_OPERATIONS = 2000
+
+# Cached garden responses (see planner.garden_cache). Writes invalidate them on commit, so
+# the timeout only bounds staleness after writes that bypass signals (queryset updates)
+GARDEN_CACHE_TIMEOUT = 60 * 60
+# How long a fresh entry may not be cached again after an invalidation, in seconds
+GARDEN_CACHE_INVALIDATION_GRACE = 10
+
+# Upper bound on the plant/color combinations in one garden summary request
+GARDEN_PLANTS_MAX_SELECTIONS = 500
+# Plant details are versioned with the catalog (see planner.catalog), this only bounds memory
+PLANT_DETAIL_CACHE_TIMEOUT = 60 * 60 * 24
+# Browser/proxy freshness of GET garden summaries, which revalidate by ETag afterwards
+GARDEN_PLANTS_MAX_AGE = 60 * 5
+
+# Garden plant rows per bulk INSERT/UPDATE statement when saving a garden
+GARDEN_WRITE_BATCH_SIZE = 200
+
+# Layout validation (see planner.layout). Plants without a spread are drawn this wide, in ft
+DEFAULT_PLANT_SPREAD = 1.0
+# Overlap in ft below which touching plants don't count as overcrowded (positions are float32)
+LAYOUT_TOLERANCE = 1e-3
+# Problems of each kind listed in a report, all of them are counted
+LAYOUT_REPORT_LIMIT = 100
+# Candidate pairs compared at once, bounds memory use on very crowded layouts
+LAYOUT_PAIR_CHUNK = 1 << 20
+
+# Canopy coverage rasters (see planner.coverage): default cell size in ft, and the most
+# cells a raster may have (a 500 x 500 ft garden at the default)
+COVERAGE_RESOLUTION = 0.25
+COVERAGE_MAX_CELLS = 4_000_000
+# Side in ft of the areas ranked as overlap hotspots, and how many are listed
+COVERAGE_HOTSPOT_SIZE = 2
+COVERAGE_HOTSPOT_LIMIT = 10
+# Candidate cells tested at once, bounds memory use for large spreads
+COVERAGE_CHUNK = 1 << 21
+
+# Garden previews (see planner.thumbnails), px along the longer side, drawn over soil
+GARDEN_THUMBNAIL_SIZE = 240
+GARDEN_THUMBNAIL_BACKGROUND = "#efe7da"
+# Palette size of the PNG
+GARDEN_THUMBNAIL_COLORS = 64
@@ -0,0 +1,179 @@
+"""
+Canopy coverage rasters of garden layouts.
+
+Each position's spread circle is rasterized onto a grid of square cells over the garden,
+a cell counting as covered when its center is within the circle. The grid holds how many
+plants cover each cell, and a bitmask of the months (see BloomOptions) something covering
+it is in bloom. From those come the share of bare soil, of overlapping canopy and where
+it overlaps most, and the share in bloom each month.
+
+Circles are rasterized a plant/color combination at a time, with numpy: the cells around
+every position are taken from one stencil per spread (the cells a circle can reach),
+tested against the exact circle, and added to the grid in place (``np.add.at``), so the
+work follows the number of covered cells rather than the size of the grid. Memory is
+bounded by rasterizing in chunks of positions.
+"""
+
+from __future__ import annotations
+
+import base64
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from planner.constants import (
+    COVERAGE_CHUNK,
+    COVERAGE_HOTSPOT_LIMIT,
+    COVERAGE_HOTSPOT_SIZE,
+    COVERAGE_MAX_CELLS,
+    DEFAULT_PLANT_SPREAD,
+)
+from planner.gardens import PlantKey
+from planner.models import BloomOptions, Plant
+
+
+@dataclass
+class Coverage:
+    resolution: float
+    width: float
+    length: float
+    # Plants covering each cell, rows along y
+    counts: np.ndarray
+    # Months in bloom over each cell, one bit per BloomOptions value in order
+    bloom: np.ndarray
+
+    def as_dict(self, raster: bool = False) -> dict:
+        cells = self.counts.size
+        data = {
+            "resolution": self.resolution,
+            "columns": self.counts.shape[1],
+            "rows": self.counts.shape[0],
+            "bare_ratio": _share(self.counts == 0, cells),
+            "overlap_ratio": _share(self.counts > 1, cells),
+            "max_overlap": int(self.counts.max(initial=0)),
+            "hotspots": self.hotspots(),
+            "bloom": [
+                {"month": month, "label": label, "ratio": _share(self.bloom & 1 << bit, cells)}
+                for bit, (month, label) in enumerate(BloomOptions.choices)
+            ],
+        }
+        if raster:
+            # Row-major plant counts (capped at 255) of rows x columns cells, from y = 0
+            counts = np.minimum(self.counts, 255).astype(np.uint8)
+            data["raster"] = base64.b64encode(counts.tobytes()).decode()
+        return data
+
+    def hotspots(self) -> list[dict]:
+        """
+        The areas of COVERAGE_HOTSPOT_SIZE ft square with the most overlapping canopy, as the
+        share of their cells covered more than once and the most plants covering one cell.
+        """
+        size = max(1, round(COVERAGE_HOTSPOT_SIZE / self.resolution))
+        rows, columns = (-(-length // size) for length in self.counts.shape)
+        padded = np.zeros((rows * size, columns * size), dtype=self.counts.dtype)
+        padded[: self.counts.shape[0], : self.counts.shape[1]] = self.counts
+        blocks = (
+            padded.reshape(rows, size, columns, size).swapaxes(1, 2).reshape(rows, columns, -1)
+        )
+        excess = np.maximum(blocks.astype(np.int64) - 1, 0).sum(axis=2).ravel()
+
+        top = np.argsort(-excess, kind="stable")[:COVERAGE_HOTSPOT_LIMIT]
+        block_size = size * self.resolution
+        hotspots = []
+        for index in top[excess[top] > 0]:
+            row, column = divmod(int(index), columns)
+            x, y = column * block_size, row * block_size
+            cells = blocks[row, column]
+            hotspots.append(
+                {
+                    "x": x,
+                    "y": y,
+                    "width": min(block_size, self.width - x),
+                    "length": min(block_size, self.length - y),
+                    "overlap_ratio": float(np.mean(cells > 1)),
+                    "max_overlap": int(cells.max()),
+                }
+            )
+        return hotspots
+
+
+def grid_shape(width: float, length: float, resolution: float) -> tuple[int, int]:
+    """Rows and columns of the grid, raising ValueError for an unusable resolution."""
+    if not (math.isfinite(resolution) and resolution > 0):
+        raise ValueError(f"Invalid resolution {resolution!r}")
+    rows, columns = max(math.ceil(length / resolution), 1), max(math.ceil(width / resolution), 1)
+    if rows * columns > COVERAGE_MAX_CELLS:
+        raise ValueError(f"Resolution {resolution} gives more than {COVERAGE_MAX_CELLS} cells")
+    return rows, columns
+
+
+def rasterize(
+    width: float, length: float, plants: dict[PlantKey, bytes], resolution: float
+) -> Coverage:
+    """
+    Coverage of packed positions (see planner.positions) per plant/color combination over
+    a ``width`` by ``length`` garden. Plants without a spread, or unknown ones, count as
+    DEFAULT_PLANT_SPREAD wide, like in the planner.
+    """
+    rows, columns = grid_shape(width, length, resolution)
+    counts = np.zeros(rows * columns, dtype=np.int32)
+    bloom = np.zeros(rows * columns, dtype=np.uint16)
+
+    catalog = {
+        str(plant_id): (spread or DEFAULT_PLANT_SPREAD, bloom_mask)
+        for plant_id, spread, bloom_mask in Plant.objects.filter(
+            id__in={plant_id for plant_id, _ in plants}
+        ).values_list("id", "spread", "bloom_mask")
+    }
+    for (plant_id, _), data in plants.items():
+        if not data:
+            continue
+        spread, bloom_mask = catalog.get(plant_id, (DEFAULT_PLANT_SPREAD, 0))
+        points = np.frombuffer(data, dtype="<f4").reshape(-1, 2).astype(np.float64)
+        for cells in _circle_cells(points, spread / 2, resolution, rows, columns):
+            # Unbuffered, so cells listed more than once are all counted
+            np.add.at(counts, cells, 1)
+            if bloom_mask:
+                # Duplicate cells all get the same bits, so a fancy |= is exact
+                bloom[cells] |= bloom_mask
+
+    return Coverage(
+        resolution,
+        width,
+        length,
+        counts.reshape(rows, columns),
+        bloom.reshape(rows, columns),
+    )
+
+
+def _circle_cells(points: np.ndarray, radius: float, resolution: float, rows: int, columns: int):
+    """Flat indices of the grid cells centered within ``radius`` of each point, in chunks."""
+    # Cell offsets from a point's own cell that a circle can reach from anywhere within it
+    reach = math.ceil(radius / resolution) + 1
+    steps = np.arange(-reach, reach + 1)
+    row_steps, column_steps = (offsets.ravel() for offsets in np.meshgrid(steps, steps))
+    nearest = (
+        np.maximum(np.abs(row_steps) - 1, 0) ** 2 + np.maximum(np.abs(column_steps) - 1, 0) ** 2
+    )
+    reachable = nearest * resolution**2 <= radius**2
+    row_steps, column_steps = row_steps[reachable], column_steps[reachable]
+
+    # Positions this far out cover no cell wherever they are, and clipping them there keeps
+    # the integer cell indices from overflowing
+    margin = radius + resolution
+    points = np.clip(points, -margin, (columns * resolution + margin, rows * resolution + margin))
+    cells = np.floor(points / resolution).astype(np.int64)
+    chunk = max(1, COVERAGE_CHUNK // len(row_steps))
+    for start in range(0, len(points), chunk):
+        x, y = points[start : start + chunk, 0:1], points[start : start + chunk, 1:2]
+        column = cells[start : start + chunk, 0:1] + column_steps
+        row = cells[start : start + chunk, 1:2] + row_steps
+        dx, dy = (column + 0.5) * resolution - x, (row + 0.5) * resolution - y
+        covered = dx * dx + dy * dy <= radius**2
+        covered &= (column >= 0) & (column < columns) & (row >= 0) & (row < rows)
+        yield row[covered] * columns + column[covered]
+
+
+def _share(mask: np.ndarray, cells: int) -> float:
+    return float(np.count_nonzero(mask)) / cells
@@ -0,0 +1,96 @@
+"""
+The garden document load_garden returns.
+
+``garden_document`` builds it from model instances. ``garden_document_json`` has Postgres
+assemble the same document with ``json_build_object``/``json_agg``, decoding the packed
+positions with ``planner_float4le`` (migration 0012), and returns the serialized text. For
+large gardens that skips per-row model instantiation and JSON encoding in Python, which is
+where nearly all of the ORM path's time goes. Both order plants the same way; numbers may
+be formatted differently (``10`` rather than ``10.0``) but parse to the same values.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import UUID
+
+from django.db import connection
+
+from planner.models import Garden
+
+GARDEN_DOCUMENT_SQL = """
+SELECT garden.revision, garden.updated_at, json_build_object(
+    'garden_id', garden.id,
+    'name', garden.name,
+    'width', garden.width,
+    'length', garden.length,
+    'description', garden.description,
+    'revision', garden.revision,
+    'plants', COALESCE(
+        (
+            SELECT json_agg(
+                json_build_object(
+                    'plant_id', gp.plant_id,
+                    'color_id', gp.color_id,
+                    'niche_id', plant.niche_id,
+                    'positions', COALESCE(
+                        (
+                            SELECT json_agg(
+                                json_build_object(
+                                    'x', planner_float4le(packed.data, pair * 8),
+                                    'y', planner_float4le(packed.data, pair * 8 + 4)
+                                )
+                                ORDER BY pair
+                            )
+                            FROM generate_series(0, length(packed.data) / 8 - 1) AS pair
+                        ),
+                        '[]'
+                    )
+                )
+                ORDER BY gp.created_at, gp.id
+            )
+            FROM planner_gardenplant AS gp
+            JOIN planner_plant AS plant ON plant.id = gp.plant_id
+            -- Detoast each buffer once, instead of in every get_byte() call
+            CROSS JOIN LATERAL (SELECT gp.position_data || ''::bytea AS data OFFSET 0) AS packed
+            WHERE gp.garden_id = garden.id AND gp.deleted_at IS NULL
+        ),
+        '[]'
+    )
+)::text
+FROM planner_garden AS garden
+WHERE garden.id = %s AND garden.user_id = %s AND garden.deleted_at IS NULL
+"""
+
+
+def garden_document(garden: Garden) -> dict:
+    """The document built in Python, one model instance per plant/color combination."""
+    return {
+        "garden_id": str(garden.id),
+        "name": garden.name,
+        "width": garden.width,
+        "length": garden.length,
+        "description": garden.description,
+        "revision": garden.revision,
+        "plants": [
+            {
+                "plant_id": str(gp.plant_id),
+                "color_id": str(gp.color_id),
+                "niche_id": str(gp.plant.niche_id) if gp.plant.niche_id else None,
+                "positions": [{"x": x, "y": y} for x, y in gp.positions],
+            }
+            for gp in garden.garden_plants.select_related("plant").order_by("created_at", "id")
+        ],
+    }
+
+
+def garden_document_json(garden_id: UUID, user_id) -> tuple[int, datetime, str] | None:
+    """
+    The revision, last update and serialized document of one of the user's gardens,
+    built by Postgres.
+
+    None when the garden doesn't exist or belongs to someone else.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(GARDEN_DOCUMENT_SQL, [garden_id, user_id])
+        return cursor.fetchone()
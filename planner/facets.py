@@ -0,0 +1,130 @@
+"""
+Facet counts for the plant filter sidebar.
+
+Counts are computed from a single query over the plants that match the non-facet filters
+(search, height, spread), followed by one pass in Python. Facets are disjunctive: the
+count for a value is computed with every *other* active filter applied, so it answers
+"how many plants would I get if I picked this option instead". Features are the
+exception, because they combine with AND, so their counts also include the features that
+are already selected.
+"""
+
+from __future__ import annotations
+
+from django.core.cache import cache
+
+from planner.catalog import catalog_cache_key
+from planner.constants import FACET_CACHE_TIMEOUT
+from planner.models import BloomOptions, Plant, SunOptions
+
+# Filters that are counted per value instead of being applied in SQL
+FACET_FILTERS = (
+    "niche",
+    "sun",
+    "bloom",
+    "bloomMatch",
+    "native",
+    "buyable",
+    "colors",
+    "features",
+)
+
+
+def get_facet_counts(filters: dict) -> dict:
+    """Return cached facet counts for a validated filter set."""
+    key = catalog_cache_key("plant_facets", filters)
+    counts = cache.get(key)
+    if counts is None:
+        counts = compute_facet_counts(filters)
+        cache.set(key, counts, FACET_CACHE_TIMEOUT)
+    return counts
+
+
+def compute_facet_counts(filters: dict) -> dict:
+    base_filters = {key: value for key, value in filters.items() if key not in FACET_FILTERS}
+    rows = (
+        Plant.objects.apply_filters(base_filters)
+        .order_by()
+        .values_list("sun", "bloom", "niche_id", "native", "link", "color_ids", "feature_ids")
+    )
+
+    selected_sun = set(filters.get("sun", []))
+    selected_bloom = set(filters.get("bloom", []))
+    bloom_all = filters.get("bloomMatch") == "all"
+    selected_colors = set(filters.get("colors", []))
+    selected_features = set(filters.get("features", []))
+
+    total = 0
+    sun = dict.fromkeys(SunOptions.values, 0)
+    bloom = dict.fromkeys(BloomOptions.values, 0)
+    niche: dict[str, int] = {}
+    colors: dict[str, int] = {}
+    features: dict[str, int] = {}
+    native = 0
+    buyable = 0
+
+    for plant_sun, plant_bloom, niche_id, is_native, link, color_ids, feature_ids in rows:
+        niche_id = str(niche_id) if niche_id else None
+        color_ids = {str(color_id) for color_id in color_ids}
+        feature_ids = {str(feature_id) for feature_id in feature_ids}
+
+        failed = [
+            name
+            for name, passes in (
+                ("niche", not filters.get("niche") or niche_id == filters["niche"]),
+                ("sun", not selected_sun or not selected_sun.isdisjoint(plant_sun)),
+                (
+                    "bloom",
+                    not selected_bloom
+                    or (
+                        selected_bloom.issubset(plant_bloom)
+                        if bloom_all
+                        else not selected_bloom.isdisjoint(plant_bloom)
+                    ),
+                ),
+                ("native", not filters.get("native") or is_native),
+                ("buyable", not filters.get("buyable") or bool(link)),
+                ("colors", not selected_colors or not selected_colors.isdisjoint(color_ids)),
+                ("features", selected_features <= feature_ids),
+            )
+            if not passes
+        ]
+        if len(failed) > 1:
+            continue
+        # A plant failing exactly one filter still counts towards that filter's facet
+        counts_for = failed[0] if failed else None
+
+        if counts_for is None:
+            total += 1
+            for feature_id in feature_ids:
+                features[feature_id] = features.get(feature_id, 0) + 1
+        if counts_for in (None, "sun"):
+            for value in plant_sun:
+                if value in sun:
+                    sun[value] += 1
+        if counts_for in (None, "bloom"):
+            for value in plant_bloom:
+                if value in bloom:
+                    bloom[value] += 1
+        if counts_for in (None, "niche") and niche_id:
+            niche[niche_id] = niche.get(niche_id, 0) + 1
+        if counts_for in (None, "colors"):
+            for color_id in color_ids:
+                colors[color_id] = colors.get(color_id, 0) + 1
+        if counts_for in (None, "native") and is_native:
+            native += 1
+        if counts_for in (None, "buyable") and link:
+            buyable += 1
+
+    return {
+        "total": total,
+        "facets": {
+            "sun": sun,
+            "bloom": bloom,
+            "niche": niche,
+            "colors": colors,
+            "features": features,
+            "native": native,
+            "buyable": buyable,
+        },
+    }
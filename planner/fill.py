@@ -0,0 +1,147 @@
+"""
+Filling a garden with chosen plants.
+
+The garden is split along its longer side into one drift per plant/color selection, each as
+wide as its quantity needs or its share of the rest, and every drift is hex packed with its
+plant's spread: rows spread x sqrt(3)/2 apart, every other row shifted by half a spread.
+That is the densest spacing at which plants of a drift don't overlap, and keeping centers a
+radius away from the drift's edges keeps neighbouring drifts and the garden's border clear
+too, so a filled layout passes planner.layout's validation. Each drift's lattice is built
+by numpy in one go: a bed of hundreds of plants takes well under a millisecond.
+
+A selection asks either for a ``quantity``, sized to fit that many plants, or for a
+``ratio`` of the area that the quantities leave, filled completely.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+from django.conf import settings
+
+from planner.gardens import parse_id
+from planner.layout import plant_spreads
+
+# Row spacing of a hex lattice, per unit of spacing within a row
+ROW_HEIGHT = math.sqrt(3) / 2
+# Slack for lattice points that land on a drift's edge by float rounding
+EPSILON = 1e-9
+
+
+@dataclass
+class FillSelection:
+    plant_id: str
+    color_id: str
+    quantity: int | None = None
+    ratio: float | None = None
+
+
+@dataclass
+class Drift:
+    """The positions filled in for one selection."""
+
+    selection: FillSelection
+    # Plants that fit in the drift, at most quantity of them are placed
+    capacity: int
+    positions: np.ndarray
+
+    def as_dict(self) -> dict:
+        return {
+            "plant_id": self.selection.plant_id,
+            "color_id": self.selection.color_id,
+            "requested": self.selection.quantity,
+            "capacity": self.capacity,
+            "placed": len(self.positions),
+            "positions": [{"x": x, "y": y} for x, y in self.positions.tolist()],
+        }
+
+
+def parse_fill_selections(raw) -> list[FillSelection]:
+    """
+    Selections from ``[{"plant_id", "color_id", "quantity": 12}, {..., "ratio": 2}]``.
+    Raises ValueError, KeyError or TypeError for unusable entries.
+    """
+    if not isinstance(raw, list) or not raw:
+        raise ValueError("Expected a list of plants")
+    if len(raw) > settings.GARDEN_MAX_PLANTS:
+        raise ValueError(f"More than {settings.GARDEN_MAX_PLANTS} plants")
+    selections = []
+    for entry in raw:
+        selection = FillSelection(parse_id(entry["plant_id"]), parse_id(entry["color_id"]))
+        if entry.get("quantity") is not None:
+            selection.quantity = int(entry["quantity"])
+            if selection.quantity < 0:
+                raise ValueError(f"Invalid quantity {entry['quantity']!r}")
+        else:
+            selection.ratio = float(entry.get("ratio", 1))
+            if not (math.isfinite(selection.ratio) and selection.ratio > 0):
+                raise ValueError(f"Invalid ratio {entry['ratio']!r}")
+        selections.append(selection)
+    return selections
+
+
+def fill_layout(width: float, length: float, selections: list[FillSelection]) -> list[Drift]:
+    """
+    One drift per selection, in order, laid out across a ``width`` by ``length`` garden.
+    Raises ValueError when the drifts would hold more than GARDEN_MAX_POSITIONS plants.
+    """
+    spreads = plant_spreads({selection.plant_id for selection in selections})
+    spacing = np.array([spreads[selection.plant_id] for selection in selections])
+
+    # Drifts are cut across the longer side, and run the full shorter side
+    transposed = length > width
+    long_side, short_side = (length, width) if transposed else (width, length)
+    rows = _rows(short_side, spacing)
+
+    # Drift widths: enough for each quantity, then ratios share what is left. Half a spread
+    # more lets the shifted rows hold as many plants as the others.
+    quantities = np.array([selection.quantity or 0 for selection in selections])
+    ratios = np.array([selection.ratio or 0 for selection in selections])
+    columns = np.ceil(quantities / np.maximum(rows, 1))
+    widths = np.where(columns > 0, (columns + 0.5) * spacing, 0)
+    if widths.sum() > long_side:
+        # Overbooked: every quantity gets its share of the room, and falls short
+        widths *= long_side / widths.sum()
+    elif ratios.any():
+        widths += (long_side - widths.sum()) * ratios / ratios.sum()
+    if (widths / spacing * rows).sum() > settings.GARDEN_MAX_POSITIONS:
+        raise ValueError(f"Garden would have more than {settings.GARDEN_MAX_POSITIONS} positions")
+    edges = np.concatenate(([0], np.cumsum(widths)))
+
+    drifts = []
+    for index, selection in enumerate(selections):
+        lattice = _hex_lattice(edges[index], edges[index + 1], rows[index], spacing[index])
+        positions = lattice[: selection.quantity] if selection.quantity is not None else lattice
+        if transposed:
+            positions = positions[:, ::-1]
+        drifts.append(Drift(selection, len(lattice), positions))
+    return drifts
+
+
+def _rows(depth: float, spacing: np.ndarray) -> np.ndarray:
+    """Hex lattice rows that fit ``depth`` with centers a radius from either side."""
+    rows = np.floor((depth - spacing) / (spacing * ROW_HEIGHT) + EPSILON) + 1
+    return np.maximum(rows, 0).astype(np.int64)
+
+
+def _hex_lattice(start: float, end: float, rows: int, spacing: float) -> np.ndarray:
+    """
+    Hex lattice points, row by row from y = 0, with centers ``spacing`` apart and at least
+    half of it inside [start, end].
+    """
+    radius = spacing / 2
+    if end - start < spacing or not rows:
+        return np.empty((0, 2))
+    columns = int((end - start - spacing) / spacing + EPSILON) + 1
+    xs = (
+        start
+        + radius
+        + np.arange(columns)[None, :] * spacing
+        + (np.arange(rows)[:, None] % 2) * radius
+    )
+    ys = np.broadcast_to(radius + np.arange(rows)[:, None] * spacing * ROW_HEIGHT, xs.shape)
+    # Shifted rows can hold one plant less
+    inside = xs <= end - radius + EPSILON
+    return np.column_stack((xs[inside], ys[inside]))
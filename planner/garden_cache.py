@@ -0,0 +1,65 @@
+"""
+Caching a user's saved gardens.
+
+Opening the planner reloads the same garden and garden list over and over between saves,
+so load_garden and list_gardens keep their serialized responses in the cache, per user,
+together with their validators: a repeat request costs one cache lookup, and a conditional
+request whose ETag still matches is answered 304 from that same lookup.
+
+Any write to a Garden (save, sync, admin edit, delete) drops the owner's entries once its
+transaction commits (see planner.signals). Garden plants are only written together with
+their garden, whose revision is bumped on every change. The garden document also carries
+catalog data (each plant's niche), so its key includes the catalog version, and a catalog
+change simply misses.
+
+A load that read the garden just before a save committed must not cache what it read. So
+instead of deleting them, invalidation briefly replaces entries with a marker, and entries
+are only ever added, never overwritten: a stale fill finds the marker and is dropped.
+"""
+
+from __future__ import annotations
+
+from django.core.cache import cache
+from django.db import transaction
+
+from planner.catalog import get_catalog_version
+from planner.constants import GARDEN_CACHE_INVALIDATION_GRACE, GARDEN_CACHE_TIMEOUT
+
+# Browsers keep the response but revalidate it on every use
+GARDEN_CACHE_CONTROL = "private, no-cache"
+INVALIDATED = "invalidated"
+
+
+def garden_cache_key(user_id, garden_id, catalog_version: int) -> str:
+    return f"planner:garden:{user_id}:{garden_id}:{catalog_version}"
+
+
+def garden_list_cache_key(user_id) -> str:
+    return f"planner:gardens:{user_id}"
+
+
+def get_cached(key: str) -> dict | None:
+    """
+    A cached response: {"body": str, "etag": str, "last_modified": int | None}, the
+    last modification as a Unix timestamp.
+    """
+    entry = cache.get(key)
+    return entry if isinstance(entry, dict) else None
+
+
+def fill_cache(key: str, entry: dict) -> None:
+    cache.add(key, entry, GARDEN_CACHE_TIMEOUT)
+
+
+def invalidate_gardens(user_id, garden_id) -> None:
+    """Drop the cached garden and garden list once the current transaction commits."""
+
+    def invalidate():
+        # Entries under older catalog versions are never read again
+        keys = [
+            garden_cache_key(user_id, garden_id, get_catalog_version()),
+            garden_list_cache_key(user_id),
+        ]
+        cache.set_many(dict.fromkeys(keys, INVALIDATED), GARDEN_CACHE_INVALIDATION_GRACE)
+
+    transaction.on_commit(invalidate)
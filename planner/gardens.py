@@ -0,0 +1,406 @@
+"""
+Writing garden designs.
+
+The planner posts a whole garden on every save, but between two saves usually only a few
+plants move. Positions are stored packed per plant/color combination (see
+planner.positions), and the incoming design is diffed against what is stored so only the
+difference is written:
+
+- removed combinations are deleted in one statement
+- new combinations are inserted with one ``bulk_create``
+- combinations whose positions changed are rewritten with one ``bulk_update``
+
+So a save costs a fixed handful of statements, and the rows written grow with what changed.
+
+Once a garden is stored, the planner can send just its edits instead (see
+``apply_operations``): an ordered list of operations against the garden's revision, each
+naming a plant/color combination and the positions involved::
+
+    {"op": "move", "plant_id": "uuid", "color_id": "uuid",
+     "from": {"x": 2.5, "y": 1.0}, "to": {"x": 3.0, "y": 1.5}}
+
+Positions are addressed by their coordinates, which is all the planner keeps locally.
+
+Every garden also stores a content hash of its fields and layout, so a save that would not
+change anything is answered without a single write. The hash is the sum of a digest per
+field, plant and position modulo 2**256: it does not depend on order, and a sync can
+update it from just the elements it added and removed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import uuid
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db.models import Count, F, OuterRef, QuerySet, Subquery, Sum
+from django.db.models.functions import Coalesce, Length
+from django.utils import timezone
+
+from planner import positions as packed_positions
+from planner.constants import GARDEN_WRITE_BATCH_SIZE
+from planner.models import Color, Garden, GardenPlant, Plant
+from planner.positions import Point
+
+PlantKey = tuple[str, str]
+
+# Positions each sync operation carries; "set" changes garden fields instead
+OPERATION_POINTS = {
+    "add_plant": (),
+    "remove_plant": (),
+    "add": ("to",),
+    "move": ("from", "to"),
+    "remove": ("from",),
+}
+
+
+HASH_MODULUS = 2**256
+
+
+@dataclass
+class SaveResult:
+    """Row counts written by a save, for logging and tests."""
+
+    plants_created: int = 0
+    plants_updated: int = 0
+    plants_deleted: int = 0
+
+
+def parse_plants(plants_data: list) -> dict[PlantKey, list[Point]]:
+    """
+    Positions per (plant_id, color_id) from the planner's JSON.
+
+    Malformed positions are skipped, as they always were. A combination listed twice keeps
+    its last entry. Raises ValueError/KeyError for unusable values.
+    """
+    plants: dict[PlantKey, list[Point]] = {}
+    for plant_data in plants_data:
+        key = (parse_id(plant_data["plant_id"]), parse_id(plant_data["color_id"]))
+        plants[key] = [
+            (parse_coordinate(pos["x"]), parse_coordinate(pos["y"]))
+            for pos in plant_data.get("positions", [])
+            if isinstance(pos, dict) and "x" in pos and "y" in pos
+        ]
+    return plants
+
+
+def parse_id(value) -> str:
+    return str(uuid.UUID(str(value)))
+
+
+def _finite(value) -> float:
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(f"Invalid number {value!r}")
+    return number
+
+
+def parse_coordinate(value) -> float:
+    return packed_positions.quantize(_finite(value))
+
+
+def _point(value) -> Point:
+    if not isinstance(value, dict):
+        raise ValueError(f"Invalid position {value!r}")
+    return (parse_coordinate(value["x"]), parse_coordinate(value["y"]))
+
+
+# Garden fields a "set" operation may change, with their parsers
+GARDEN_FIELDS = {"name": str, "width": _finite, "length": _finite, "description": str}
+
+
+def content_hash(fields: dict, plants: dict[PlantKey, list[Point]]) -> str:
+    """Digest of a garden's fields (see GARDEN_FIELDS) and layout, independent of order."""
+    return _hex(_fields_sum(fields) + _plants_sum(plants))
+
+
+def packed_content_hash(fields: dict, plants: dict[PlantKey, bytes]) -> str:
+    """content_hash of packed positions, unpacking one combination at a time."""
+    total = _fields_sum(fields)
+    for key, position_data in plants.items():
+        total += _plants_sum({key: packed_positions.unpack(position_data)})
+    return _hex(total)
+
+
+def _hex(total: int) -> str:
+    return f"{total % HASH_MODULUS:064x}"
+
+
+def _element(*parts) -> int:
+    digest = hashlib.sha256("\x1f".join(parts).encode()).digest()
+    return int.from_bytes(digest, "big")
+
+
+def _fields_sum(fields: dict) -> int:
+    return sum(_element("field", name, repr(fields[name])) for name in GARDEN_FIELDS)
+
+
+def _plants_sum(plants: dict[PlantKey, list[Point]]) -> int:
+    total = 0
+    for (plant_id, color_id), points in plants.items():
+        total += _element("plant", plant_id, color_id)
+        for x, y in points:
+            # repr() is the shortest exact form, so equal doubles always hash the same
+            total += _element("position", plant_id, color_id, repr(x), repr(y))
+    return total
+
+
+def save_garden_plants(
+    garden: Garden,
+    plants: dict[PlantKey, list[Point]],
+    scope: set[PlantKey] | None = None,
+) -> SaveResult:
+    """
+    Make the garden's stored plants and positions match ``plants``.
+
+    With a ``scope``, only those combinations are compared and written and the rest of the
+    garden is left alone; ``plants`` must not contain keys outside of it.
+
+    Must run inside a transaction. Raises Plant.DoesNotExist or Color.DoesNotExist when a
+    new combination references an unknown plant or color.
+    """
+    packed = {key: packed_positions.pack(points) for key, points in plants.items()}
+    return save_packed_plants(garden, packed, scope)
+
+
+def save_packed_plants(
+    garden: Garden,
+    plants: dict[PlantKey, bytes],
+    scope: set[PlantKey] | None = None,
+) -> SaveResult:
+    """
+    save_garden_plants, with each combination's positions already packed.
+
+    Also keeps the position counters of the garden plants and the garden in step, the
+    garden's with an F() update that is mirrored on ``garden``.
+    """
+    result = SaveResult()
+    plant_delta = position_delta = 0
+    # Rows soft deleted by older versions of the planner still hold the unique
+    # (garden, plant, color) slot, so they are cleaned up here too
+    existing: dict[PlantKey, GardenPlant] = {}
+    stale_ids = []
+    for garden_plant in _scoped(GardenPlant.all_objects.filter(garden=garden), scope).only(
+        "id", "plant_id", "color_id", "deleted_at", "position_data", "position_count"
+    ):
+        key = (str(garden_plant.plant_id), str(garden_plant.color_id))
+        if scope is not None and key not in scope:
+            continue
+        if garden_plant.deleted_at is None and key in plants:
+            existing[key] = garden_plant
+        else:
+            stale_ids.append(garden_plant.id)
+            if garden_plant.deleted_at is None:
+                plant_delta -= 1
+                position_delta -= garden_plant.position_count
+
+    if stale_ids:
+        result.plants_deleted, _ = GardenPlant.all_objects.filter(id__in=stale_ids).delete(
+            hard=True
+        )
+
+    new_keys = [key for key in plants if key not in existing]
+    if new_keys:
+        _check_references(new_keys)
+        GardenPlant.objects.bulk_create(
+            (
+                GardenPlant(
+                    garden=garden,
+                    plant_id=plant_id,
+                    color_id=color_id,
+                    position_data=plants[plant_id, color_id],
+                    position_count=packed_positions.count(plants[plant_id, color_id]),
+                )
+                for plant_id, color_id in new_keys
+            ),
+            batch_size=GARDEN_WRITE_BATCH_SIZE,
+        )
+        result.plants_created = len(new_keys)
+        plant_delta += len(new_keys)
+        position_delta += sum(packed_positions.count(plants[key]) for key in new_keys)
+
+    now = timezone.now()
+    changed = []
+    for key, garden_plant in existing.items():
+        position_data = plants[key]
+        if bytes(garden_plant.position_data) != position_data:
+            position_count = packed_positions.count(position_data)
+            position_delta += position_count - garden_plant.position_count
+            garden_plant.position_data = position_data
+            garden_plant.position_count = position_count
+            garden_plant.updated_at = now
+            changed.append(garden_plant)
+    if changed:
+        GardenPlant.objects.bulk_update(
+            changed,
+            ["position_data", "position_count", "updated_at"],
+            batch_size=GARDEN_WRITE_BATCH_SIZE,
+        )
+        result.plants_updated = len(changed)
+
+    if plant_delta or position_delta:
+        Garden.all_objects.filter(pk=garden.pk).update(
+            plant_count=F("plant_count") + plant_delta,
+            position_count=F("position_count") + position_delta,
+        )
+        garden.plant_count += plant_delta
+        garden.position_count += position_delta
+    return result
+
+
+def recount_gardens(gardens: QuerySet[Garden] | None = None) -> tuple[int, int]:
+    """
+    Recompute the position counters of ``gardens`` (all by default) and their plants, in
+    a couple of UPDATE statements. Returns how many garden plants and gardens were off.
+    """
+    if gardens is None:
+        gardens = Garden.all_objects.all()
+    garden_plants = GardenPlant.all_objects.filter(garden__in=gardens.values("pk"))
+    actual_count = Length("position_data") / packed_positions.POSITION_SIZE
+    plants_fixed = garden_plants.exclude(position_count=actual_count).update(
+        position_count=actual_count
+    )
+
+    live = GardenPlant.objects.filter(garden=OuterRef("pk")).values("garden")
+    plant_count = Coalesce(Subquery(live.annotate(n=Count("pk")).values("n")), 0)
+    position_count = Coalesce(Subquery(live.annotate(n=Sum("position_count")).values("n")), 0)
+    gardens_fixed = (
+        gardens.annotate(actual_plants=plant_count, actual_positions=position_count)
+        .exclude(plant_count=F("actual_plants"), position_count=F("actual_positions"))
+        .update(plant_count=plant_count, position_count=position_count)
+    )
+    return plants_fixed, gardens_fixed
+
+
+def refresh_gardens(gardens: QuerySet[Garden]) -> None:
+    """
+    Recompute the content hash of ``gardens`` from what is stored and bump their revision,
+    after changes made outside of save_garden and sync_garden (in the admin). Gardens are
+    saved one by one, so their caches are invalidated and thumbnails queued as on a save.
+    """
+    for garden in gardens:
+        plants = {
+            (str(plant_id), str(color_id)): bytes(position_data)
+            for plant_id, color_id, position_data in GardenPlant.objects.filter(
+                garden=garden
+            ).values_list("plant_id", "color_id", "position_data")
+        }
+        garden.content_hash = packed_content_hash(_garden_fields(garden), plants)
+        garden.revision += 1
+        garden.save(update_fields=["content_hash", "revision", "updated_at"])
+
+
+def apply_operations(garden: Garden, operations: list) -> SaveResult | None:
+    """
+    Apply the planner's ordered edit operations to a garden.
+
+    Only the plant/color combinations the operations mention are read and written, so the
+    cost follows the size of the edit rather than of the garden. Field changes from "set"
+    operations and the new content hash are set on ``garden`` but not saved. Must run
+    inside a transaction. Returns None, without writing, when the operations cancel out.
+
+    Raises ValueError naming the first operation that is malformed or does not apply to
+    the stored garden, or when the garden would grow past GARDEN_MAX_PLANTS or
+    GARDEN_MAX_POSITIONS, and Plant.DoesNotExist/Color.DoesNotExist for unknown references.
+    """
+    parsed = [_parse_operation(index, operation) for index, operation in enumerate(operations)]
+    scope = {key for _, _, key, _ in parsed if key is not None}
+    plants = _current_plants(garden, scope)
+    before = _fields_sum(_garden_fields(garden)) + _plants_sum(plants)
+    # The rest of the garden, for the limits whole saves are held to (see planner.ingest)
+    other_plants = garden.plant_count - len(plants)
+    other_positions = garden.position_count - sum(map(len, plants.values()))
+
+    for index, kind, key, args in parsed:
+        # Only "set" operations name no plant
+        if key is None:
+            for field, value in args.items():
+                setattr(garden, field, value)
+            continue
+        points = plants.get(key)
+        if kind == "add_plant":
+            if points is not None:
+                raise ValueError(f"Operation {index}: plant is already in the garden")
+            plants[key] = []
+        elif points is None:
+            raise ValueError(f"Operation {index}: plant is not in the garden")
+        elif kind == "remove_plant":
+            del plants[key]
+        elif kind == "add":
+            points.append(args["to"])
+        elif args["from"] not in points:
+            raise ValueError(f"Operation {index}: no position at {args['from']}")
+        elif kind == "move":
+            points[points.index(args["from"])] = args["to"]
+        else:
+            points.remove(args["from"])
+
+    after = _fields_sum(_garden_fields(garden)) + _plants_sum(plants)
+    if after == before:
+        return None
+    if other_plants + len(plants) > settings.GARDEN_MAX_PLANTS:
+        raise ValueError(f"Garden would have more than {settings.GARDEN_MAX_PLANTS} plants")
+    if other_positions + sum(map(len, plants.values())) > settings.GARDEN_MAX_POSITIONS:
+        raise ValueError(f"Garden would have more than {settings.GARDEN_MAX_POSITIONS} positions")
+    # An unknown hash (a garden never fully saved since hashes were added) stays unknown
+    if garden.content_hash:
+        garden.content_hash = _hex(int(garden.content_hash, 16) - before + after)
+    return save_garden_plants(garden, plants, scope)
+
+
+def _garden_fields(garden: Garden) -> dict:
+    return {name: getattr(garden, name) for name in GARDEN_FIELDS}
+
+
+def _parse_operation(index: int, operation) -> tuple[int, str, PlantKey | None, dict]:
+    try:
+        kind = operation["op"]
+        if kind == "set":
+            args = {
+                field: parse(operation[field])
+                for field, parse in GARDEN_FIELDS.items()
+                if field in operation
+            }
+            return index, kind, None, args
+        if kind not in OPERATION_POINTS:
+            raise ValueError(f"unknown operation {kind!r}")
+        key = (parse_id(operation["plant_id"]), parse_id(operation["color_id"]))
+        args = {name: _point(operation[name]) for name in OPERATION_POINTS[kind]}
+        return index, kind, key, args
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Operation {index}: {e}") from e
+
+
+def _current_plants(garden: Garden, scope: set[PlantKey]) -> dict[PlantKey, list[Point]]:
+    """Stored positions of the scoped combinations."""
+    if not scope:
+        return {}
+    rows = _scoped(GardenPlant.objects.filter(garden=garden), scope).values_list(
+        "plant_id", "color_id", "position_data"
+    )
+    plants = {
+        (str(plant_id), str(color_id)): packed_positions.unpack(position_data)
+        for plant_id, color_id, position_data in rows
+    }
+    return {key: points for key, points in plants.items() if key in scope}
+
+
+def _scoped(garden_plants, scope: set[PlantKey] | None):
+    if scope is None:
+        return garden_plants
+    # Narrowed further in Python, a pair of IN lists is simpler than OR-ing every key
+    return garden_plants.filter(
+        plant_id__in={plant_id for plant_id, _ in scope},
+        color_id__in={color_id for _, color_id in scope},
+    )
+
+
+def _check_references(keys: list[PlantKey]) -> None:
+    plant_ids = {plant_id for plant_id, _ in keys}
+    color_ids = {color_id for _, color_id in keys}
+    if Plant.objects.filter(id__in=plant_ids).count() != len(plant_ids):
+        raise Plant.DoesNotExist("Unknown plant")
+    if Color.objects.filter(id__in=color_ids).count() != len(color_ids):
+        raise Color.DoesNotExist("Unknown color")
@@ -0,0 +1,179 @@
+"""
+Responsive variants of uploaded catalog images.
+
+Plant photos are uploaded as multi-megabyte camera originals but displayed a few hundred
+pixels wide. After an image is saved, a django-q task (planner.tasks) re-encodes it as
+AVIF and WebP at a few widths, with EXIF metadata stripped, and records every variant's
+storage name and dimensions on the model. Templates build ``srcset`` from that record
+(see planner.templatetags.planner_images) without touching storage.
+
+Models that also declare ``<field>_width``, ``<field>_height`` and ``<field>_placeholder``
+(Plant) get the original's intrinsic size and a tiny blurred WebP as a data URI, so cards
+can reserve their box and paint something before any image bytes arrive.
+
+The record lives in a JSON field named after the image field, e.g. ``image_variants``::
+
+    {
+        "source": "plants/bergamot.9a8b7c6d5e4f.jpg",
+        "width": 4032,
+        "height": 3024,
+        "variants": {
+            "avif": [{"name": "plants/variants/bergamot-320.1f2e3d4c5b6a.avif",
+                      "width": 320, "height": 240}, ...],
+            "webp": [...],
+        },
+    }
+"""
+
+from __future__ import annotations
+
+import base64
+import io
+import posixpath
+from typing import Any
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from PIL import Image, ImageFilter, ImageOps
+
+from floret.storage import HASHED_NAME_RE
+from planner.constants import (
+    ICON_IMAGE_WIDTHS,
+    IMAGE_PLACEHOLDER_SIZE,
+    IMAGE_VARIANT_QUALITY,
+    PLANT_IMAGE_WIDTHS,
+)
+
+# Image field and variant widths per model
+IMAGE_FIELDS: dict[str, tuple[str, tuple[int, ...]]] = {
+    "planner.plant": ("image", PLANT_IMAGE_WIDTHS),
+    "planner.niche": ("icon", ICON_IMAGE_WIDTHS),
+    "planner.plantfeature": ("icon", ICON_IMAGE_WIDTHS),
+}
+
+
+def variants_field(field: str) -> str:
+    return f"{field}_variants"
+
+
+def needs_variants(instance) -> bool:
+    """Whether the instance's image changed since its variants were generated."""
+    field, _ = IMAGE_FIELDS[instance._meta.label_lower]
+    name = getattr(instance, field).name or None
+    if name != getattr(instance, variants_field(field)).get("source"):
+        return True
+    # Images processed before placeholders existed
+    placeholder = getattr(instance, f"{field}_placeholder", None)
+    return bool(name) and placeholder == ""
+
+
+def generate_variants(model_label: str, pk) -> dict | None:
+    """
+    (Re)generate the variants of one instance's image and store the record.
+
+    Idempotent: an up-to-date record is left alone, and the media storage names files
+    after their content, so re-encoding the same upload stores nothing new. Returns the
+    new record, or None when there was nothing to do.
+    """
+    model = apps.get_model(model_label)
+    field, widths = IMAGE_FIELDS[model_label]
+    instance = model.all_objects.filter(pk=pk).first()
+    if instance is None or not needs_variants(instance):
+        return None
+
+    image_file = getattr(instance, field)
+    previous = getattr(instance, variants_field(field))
+    record, placeholder = _encode(image_file, widths) if image_file.name else ({}, "")
+
+    values: dict[str, Any] = {variants_field(field): record}
+    if _has_field(model, f"{field}_placeholder"):
+        values[f"{field}_width"] = record.get("width")
+        values[f"{field}_height"] = record.get("height")
+        values[f"{field}_placeholder"] = placeholder
+
+    # Only store the record if the image wasn't replaced while we were encoding
+    updated = model.all_objects.filter(pk=pk, **{field: image_file.name or ""}).update(**values)
+    if updated:
+        kept = {variant["name"] for variant in _iter_variants(record)}
+        for variant in _iter_variants(previous):
+            if variant["name"] not in kept:
+                delete_media(variant["name"])
+    return record
+
+
+def delete_media(name: str) -> bool:
+    """
+    Delete a stored file unless a catalog image, image variant or garden thumbnail still
+    refers to it. The media storage stores identical content once (see floret.storage), so
+    another record may well share the name. Returns whether the file was deleted.
+    """
+    if not name or media_in_use(name):
+        return False
+    default_storage.delete(name)
+    return True
+
+
+def media_in_use(name: str) -> bool:
+    for model_label, (field, _) in IMAGE_FIELDS.items():
+        references = Q(**{field: name}) | Q(
+            *(
+                # jsonb containment, so the variant lists need no unpacking
+                Q(**{f"{variants_field(field)}__contains": {"variants": {fmt: [{"name": name}]}}})
+                for fmt in IMAGE_VARIANT_QUALITY
+            ),
+            _connector=Q.OR,
+        )
+        if apps.get_model(model_label).all_objects.filter(references).exists():
+            return True
+    return apps.get_model("planner.garden").all_objects.filter(thumbnail=name).exists()
+
+
+def _has_field(model, name: str) -> bool:
+    return any(field.name == name for field in model._meta.get_fields())
+
+
+def _encode(image_file, widths: tuple[int, ...]) -> tuple[dict, str]:
+    with image_file.open("rb") as f, Image.open(f) as opened:
+        # Bake the EXIF orientation into the pixels, since the metadata is dropped
+        image = ImageOps.exif_transpose(opened)
+        image.load()
+    has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+    image = image.convert("RGBA" if has_alpha else "RGB")
+    width, height = image.size
+
+    directory, filename = posixpath.split(image_file.name)
+    # Variants get their own content hash from the storage, drop the original's
+    stem = posixpath.splitext(HASHED_NAME_RE.sub("", filename) or filename)[0]
+    variants: dict[str, list[dict]] = {fmt: [] for fmt in IMAGE_VARIANT_QUALITY}
+
+    # Never upscale: widths beyond the original collapse onto the original width
+    for target in sorted({min(w, width) for w in widths}):
+        size = (target, max(1, round(height * target / width)))
+        resized = image if size == image.size else image.resize(size, Image.Resampling.LANCZOS)
+        for fmt, quality in IMAGE_VARIANT_QUALITY.items():
+            buffer = io.BytesIO()
+            # No exif= argument, so none of the original metadata is written
+            resized.save(buffer, format=fmt.upper(), quality=quality)
+            name = posixpath.join(directory, "variants", f"{stem}-{target}.{fmt}")
+            name = default_storage.save(name, ContentFile(buffer.getvalue()))
+            variants[fmt].append({"name": name, "width": size[0], "height": size[1]})
+
+    record = {"source": image_file.name, "width": width, "height": height, "variants": variants}
+    return record, _placeholder(image)
+
+
+def _placeholder(image: Image.Image) -> str:
+    """A blurred thumbnail a few hundred bytes long, as a data URI."""
+    thumbnail = image.copy()
+    thumbnail.thumbnail((IMAGE_PLACEHOLDER_SIZE, IMAGE_PLACEHOLDER_SIZE))
+    thumbnail = thumbnail.filter(ImageFilter.GaussianBlur(1))
+    buffer = io.BytesIO()
+    thumbnail.save(buffer, format="WEBP", quality=40)
+    return f"data:image/webp;base64,{base64.b64encode(buffer.getvalue()).decode()}"
+
+
+def _iter_variants(record: dict):
+    for entries in record.get("variants", {}).values():
+        yield from entries
@@ -0,0 +1,169 @@
+"""
+Reading the gardens posted to save_garden.
+
+JSON bodies are parsed incrementally from the request stream with ijson. Each position is
+quantized and appended to its plant's float32 buffer (see planner.positions) as soon as it
+is read, so a save holds 8 bytes per position: not the raw body, a parsed document and a
+dict per position on top of that. The limits in settings are checked while reading, and
+an oversized garden is rejected at the first byte, plant or position over them rather than
+after it has all been parsed:
+
+- GARDEN_MAX_BYTES, also checked against Content-Length before reading anything
+- GARDEN_MAX_PLANTS, plant/color entries in "plants"
+- GARDEN_MAX_POSITIONS, positions over all plants
+
+Other content types (MessagePack, see planner.codec) are decoded whole, within Django's
+DATA_UPLOAD_MAX_MEMORY_SIZE, and checked against the same limits afterwards.
+
+The packed buffers of the whole garden are kept until the body has been read, rather than
+flushed to the database plant by plant: the If-Match check, the unchanged-save check
+against the content hash and ?strict=1 layout validation all need the complete garden
+before anything is written, and "garden_id" may come after "plants" in the body. Memory
+stays bounded all the same, at 8 bytes x GARDEN_MAX_POSITIONS (1.6 MB by default), and
+the writes themselves go out in batches of GARDEN_WRITE_BATCH_SIZE rows (see
+planner.gardens.save_packed_plants).
+"""
+
+from __future__ import annotations
+
+import uuid
+from array import array
+from dataclasses import dataclass
+
+import ijson
+from django.conf import settings
+
+from planner import codec
+from planner import positions as packed_positions
+from planner.gardens import GARDEN_FIELDS, PlantKey, parse_coordinate, parse_id, parse_plants
+
+REQUIRED = ("name", "width", "length", "plants")
+SCALARS = ("string", "number", "boolean", "null")
+POSITION = "plants.item.positions.item"
+COORDINATES = {f"{POSITION}.x": 0, f"{POSITION}.y": 1}
+PLANT_IDS = {"plants.item.plant_id": "plant_id", "plants.item.color_id": "color_id"}
+
+
+class GardenTooLarge(Exception):
+    """A posted garden over one of the configured limits."""
+
+
+@dataclass
+class GardenPayload:
+    fields: dict
+    # Packed positions per (plant_id, color_id), see planner.positions
+    plants: dict[PlantKey, bytes]
+    garden_id: uuid.UUID | None = None
+
+
+def read_garden(request) -> GardenPayload:
+    """
+    The garden posted in a save_garden request.
+
+    Raises GardenTooLarge, codec.DecodeError for a malformed body, and ValueError,
+    KeyError or TypeError for unusable values.
+    """
+    if int(request.META.get("CONTENT_LENGTH") or 0) > settings.GARDEN_MAX_BYTES:
+        raise GardenTooLarge(f"Garden larger than {settings.GARDEN_MAX_BYTES} bytes")
+    if request.content_type == codec.MSGPACK:
+        return _read_decoded(codec.read(request))
+    try:
+        return _read_stream(_LimitedReader(request, settings.GARDEN_MAX_BYTES))
+    except ijson.JSONError as e:
+        raise codec.DecodeError(f"Invalid JSON: {e}") from e
+
+
+def _payload(raw: dict, plants: dict[PlantKey, bytes]) -> GardenPayload:
+    if not all(field in raw for field in REQUIRED):
+        raise ValueError("Missing required fields")
+    raw.setdefault("description", "")
+    garden_id = raw.get("garden_id")
+    return GardenPayload(
+        fields={name: parse(raw[name]) for name, parse in GARDEN_FIELDS.items()},
+        plants=plants,
+        garden_id=uuid.UUID(str(garden_id)) if garden_id else None,
+    )
+
+
+def _read_decoded(data) -> GardenPayload:
+    if not isinstance(data, dict):
+        raise TypeError("Expected an object")
+    plants_data = data.get("plants", [])
+    _check_limit("plants", len(plants_data), settings.GARDEN_MAX_PLANTS)
+    position_count = sum(
+        len(plant["positions"])
+        for plant in plants_data
+        if isinstance(plant, dict) and isinstance(plant.get("positions"), list)
+    )
+    _check_limit("positions", position_count, settings.GARDEN_MAX_POSITIONS)
+    plants = {
+        key: packed_positions.pack(points) for key, points in parse_plants(plants_data).items()
+    }
+    return _payload(data, plants)
+
+
+def _read_stream(reader) -> GardenPayload:
+    raw: dict = {}
+    plants: dict[PlantKey, bytes] = {}
+    plant_count = position_count = 0
+    ids: dict = {}
+    coordinates = array("f")
+    point: list | None = None
+
+    for prefix, event, value in ijson.parse(reader, use_float=True):
+        if prefix in COORDINATES:
+            if event not in SCALARS:
+                raise ValueError(f"Invalid number at {prefix}")
+            if point is not None:
+                point[COORDINATES[prefix]] = value
+        elif prefix == POSITION:
+            # Anything but an object with both x and y is skipped, as it always was
+            if event == "start_map":
+                point = [None, None]
+            elif event == "end_map":
+                if point is not None and None not in point:
+                    position_count += 1
+                    _check_limit("positions", position_count, settings.GARDEN_MAX_POSITIONS)
+                    coordinates.extend(parse_coordinate(coordinate) for coordinate in point)
+                point = None
+        elif prefix in PLANT_IDS:
+            ids[PLANT_IDS[prefix]] = value
+        elif prefix == "plants.item":
+            if event == "start_map":
+                plant_count += 1
+                _check_limit("plants", plant_count, settings.GARDEN_MAX_PLANTS)
+                ids, coordinates = {}, array("f")
+            elif event == "end_map":
+                # A combination listed twice keeps its last entry
+                key = (parse_id(ids["plant_id"]), parse_id(ids["color_id"]))
+                plants[key] = packed_positions.pack_coordinates(coordinates)
+            elif event != "map_key":
+                raise TypeError("Plants must be objects")
+        elif prefix == "plants" and event == "start_array":
+            raw["plants"] = True
+        elif prefix in GARDEN_FIELDS or prefix == "garden_id":
+            if event not in SCALARS:
+                raise ValueError(f"Invalid {prefix}")
+            raw[prefix] = value
+    return _payload(raw, plants)
+
+
+def _check_limit(name: str, count: int, limit: int) -> None:
+    if count > limit:
+        raise GardenTooLarge(f"Garden has more than {limit} {name}")
+
+
+class _LimitedReader:
+    """A request stream that raises GardenTooLarge past ``limit`` bytes."""
+
+    def __init__(self, stream, limit: int):
+        self.stream = stream
+        self.remaining = limit
+
+    def read(self, size: int = -1) -> bytes:
+        # One byte more than allowed tells an oversized body from one exactly at the limit
+        chunk = self.stream.read(self.remaining + 1 if size < 0 else size)
+        self.remaining -= len(chunk)
+        if self.remaining < 0:
+            raise GardenTooLarge(f"Garden larger than {settings.GARDEN_MAX_BYTES} bytes")
+        return chunk
@@ -0,0 +1,166 @@
+"""
+Checking a garden layout against the garden's bounds and the plants' spread.
+
+Each plant covers a circle as wide as its spread, as the planner draws it. A layout is
+reported for positions outside of the garden and for overcrowded pairs: plants closer than
+their two radii, so their circles overlap.
+
+Comparing every pair is quadratic, seconds for a large garden. Instead positions are
+bucketed into a uniform grid (a spatial hash) whose cells are as wide as the largest
+spread, so two plants can only overlap if they are in the same or adjacent cells. Each
+position is compared with its own cell and four of its neighbours (the other four see it
+from their side), with numpy doing the comparisons for all positions at once: time grows
+with the number of positions and how crowded they are, not with its square.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from planner.constants import (
+    DEFAULT_PLANT_SPREAD,
+    LAYOUT_PAIR_CHUNK,
+    LAYOUT_REPORT_LIMIT,
+    LAYOUT_TOLERANCE,
+)
+from planner.gardens import PlantKey
+from planner.models import Plant
+
+# Neighbouring cells each position is compared with, (column, row) steps. With the cell
+# itself and its mirror images, these cover all eight neighbours exactly once per pair.
+HALF_NEIGHBOURHOOD = ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
+@dataclass
+class LayoutReport:
+    """Problems found in a layout. Lists hold the first LAYOUT_REPORT_LIMIT of each."""
+
+    out_of_bounds_count: int = 0
+    overcrowded_count: int = 0
+    out_of_bounds: list[dict] = field(default_factory=list)
+    overcrowded: list[dict] = field(default_factory=list)
+
+    @property
+    def valid(self) -> bool:
+        return not (self.out_of_bounds_count or self.overcrowded_count)
+
+    def as_dict(self) -> dict:
+        return {
+            "valid": self.valid,
+            "out_of_bounds": {"count": self.out_of_bounds_count, "positions": self.out_of_bounds},
+            "overcrowded": {"count": self.overcrowded_count, "pairs": self.overcrowded},
+        }
+
+
+def validate_layout(width: float, length: float, plants: dict[PlantKey, bytes]) -> LayoutReport:
+    """
+    Check packed positions (see planner.positions) per plant/color combination against a
+    ``width`` by ``length`` garden.
+    """
+    report = LayoutReport()
+    keys = [key for key, data in plants.items() if data]
+    if not keys:
+        return report
+
+    spreads = plant_spreads({plant_id for plant_id, _ in keys})
+    arrays = [np.frombuffer(plants[key], dtype="<f4").reshape(-1, 2) for key in keys]
+    owner = np.repeat(np.arange(len(keys)), [len(points) for points in arrays])
+    points = np.concatenate(arrays).astype(np.float64)
+    radius = (np.array([spreads[plant_id] for plant_id, _ in keys]) / 2)[owner]
+
+    def position(index: int) -> dict:
+        plant_id, color_id = keys[owner[index]]
+        x, y = points[index]
+        return {"plant_id": plant_id, "color_id": color_id, "x": float(x), "y": float(y)}
+
+    x, y = points[:, 0], points[:, 1]
+    outside = np.flatnonzero((x < 0) | (x > width) | (y < 0) | (y > length))
+    report.out_of_bounds_count = len(outside)
+    report.out_of_bounds = [position(i) for i in outside[:LAYOUT_REPORT_LIMIT]]
+
+    for first, second, distance in _overlaps(points, radius, width, length):
+        report.overcrowded_count += len(first)
+        for i, j, d in zip(first, second, distance, strict=True):
+            if len(report.overcrowded) >= LAYOUT_REPORT_LIMIT:
+                break
+            report.overcrowded.append(
+                {
+                    "a": position(i),
+                    "b": position(j),
+                    "distance": float(d),
+                    "required": float(radius[i] + radius[j]),
+                }
+            )
+    return report
+
+
+def plant_spreads(plant_ids) -> dict[str, float]:
+    """
+    Spread of each plant by id, in feet. Plants without one, or unknown ones, count as
+    DEFAULT_PLANT_SPREAD wide, like in the planner.
+    """
+    spreads = dict.fromkeys(plant_ids, DEFAULT_PLANT_SPREAD)
+    for plant_id, spread in Plant.objects.filter(id__in=spreads).values_list("id", "spread"):
+        spreads[str(plant_id)] = spread or DEFAULT_PLANT_SPREAD
+    return spreads
+
+
+def _overlaps(
+    points: np.ndarray, radius: np.ndarray, width: float, length: float
+) -> Iterator[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Index pairs (and distances) of positions whose circles overlap, in chunks."""
+    cell_size = max(2 * float(radius.max()), LAYOUT_TOLERANCE)
+    # Positions far outside the garden would overflow the integer cell indices. Clipping
+    # never moves two positions further apart, so overlapping ones still land in the same
+    # or adjacent cells; distances are measured between the real positions.
+    bounded = np.clip(points, -cell_size, (width + cell_size, length + cell_size))
+    cells = np.floor(bounded / cell_size).astype(np.int64)
+    cells -= cells.min(axis=0)
+    # One integer per cell, with a spare row on either side so that stepping a row up or
+    # down never wraps into the next column
+    rows = int(cells[:, 1].max()) + 3
+    cell_ids = cells[:, 0] * rows + cells[:, 1] + 1
+
+    # Positions of a cell are contiguous once sorted, and so are the ones compared
+    order = np.argsort(cell_ids, kind="stable")
+    sorted_ids = cell_ids[order]
+    x, y = points[order].T
+    reach = radius[order]
+    count = len(order)
+    for column_step, row_step in HALF_NEIGHBOURHOOD:
+        target = sorted_ids + column_step * rows + row_step
+        end = np.searchsorted(sorted_ids, target, side="right")
+        if (column_step, row_step) == (0, 0):
+            # Within a cell, each position only looks at the ones after it
+            start = np.arange(1, count + 1)
+        else:
+            start = np.searchsorted(sorted_ids, target, side="left")
+        for first, second in _candidate_pairs(start, np.maximum(end - start, 0)):
+            # Squared distances, the square root is only taken for the overlaps
+            required = reach[first] + reach[second] - LAYOUT_TOLERANCE
+            squared = (x[first] - x[second]) ** 2 + (y[first] - y[second]) ** 2
+            close = np.flatnonzero(squared < np.maximum(required, 0) ** 2)
+            if len(close):
+                first, second = first[close], second[close]
+                yield order[first], order[second], np.sqrt(squared[close])
+
+
+def _candidate_pairs(start: np.ndarray, count: np.ndarray) -> Iterator[tuple[np.ndarray, ...]]:
+    """
+    Expand position ``i`` into the pairs (i, start[i]) ... (i, start[i] + count[i] - 1),
+    at most about LAYOUT_PAIR_CHUNK pairs at a time so a crowded layout can't exhaust
+    memory.
+    """
+    totals = np.cumsum(count)
+    i = 0
+    while i < len(count):
+        done = int(totals[i - 1]) if i else 0
+        stop = max(int(np.searchsorted(totals, done + LAYOUT_PAIR_CHUNK, side="right")), i + 1)
+        counts = count[i:stop]
+        first = np.repeat(np.arange(i, stop), counts)
+        offsets = np.arange(len(first)) - np.repeat(np.cumsum(counts) - counts, counts)
+        yield first, start[first] + offsets
+        i = stop
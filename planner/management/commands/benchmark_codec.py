@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+import random
+import statistics
+import time
+import uuid
+
+import msgpack
+from django.core.management.base import BaseCommand
+
+from planner import codec
+
+
+class Command(BaseCommand):
+    help = (
+        "Time encoding and decoding garden payloads of growing size with the stdlib json "
+        "module, orjson and, when installed, MessagePack."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000, 100_000])
+        parser.add_argument("--plants", type=int, default=40)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=7)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        codecs = {
+            # What JsonResponse and json.loads(request.body) did before planner.codec
+            "json": (lambda data: json.dumps(data, default=str).encode(), json.loads),
+            "orjson": (codec.dumps, codec.loads),
+            "msgpack": (lambda data: codec.encode(data, codec.MSGPACK), msgpack.unpackb),
+        }
+
+        self.stdout.write(
+            f"{'positions':>10} {'codec':>8} {'bytes':>10} {'encode ms':>10} {'decode ms':>10}"
+        )
+        for size in options["sizes"]:
+            data = self._payload(size, options["plants"], rng)
+            for name, (encode, decode) in codecs.items():
+                body = encode(data)
+                encode_ms = self._time(lambda: encode(data), options["repeat"])
+                decode_ms = self._time(lambda: decode(body), options["repeat"])
+                self.stdout.write(
+                    f"{size:>10} {name:>8} {len(body):>10} {encode_ms:>10.2f} {decode_ms:>10.2f}"
+                )
+
+    def _payload(self, positions: int, plant_count: int, rng: random.Random) -> dict:
+        """A save_garden body with ``positions`` spread over ``plant_count`` plants."""
+        per_plant = max(positions // plant_count, 1)
+        return {
+            "garden_id": uuid.uuid4(),
+            "name": "Benchmark",
+            "width": 100.0,
+            "length": 100.0,
+            "description": "",
+            "plants": [
+                {
+                    "plant_id": uuid.uuid4(),
+                    "color_id": uuid.uuid4(),
+                    "positions": [
+                        {"x": rng.uniform(0, 100), "y": rng.uniform(0, 100)}
+                        for _ in range(per_plant)
+                    ],
+                }
+                for _ in range(min(plant_count, positions))
+            ],
+        }
+
+    def _time(self, run, repeat: int) -> float:
+        """Median milliseconds over ``repeat`` runs."""
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+import random
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.http import HttpResponse, JsonResponse
+
+from account.models import User
+from planner.documents import garden_document, garden_document_json
+from planner.gardens import parse_plants, save_garden_plants
+from planner.models import Color, Garden, Plant
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare building the load_garden response with the ORM and in Postgres on a "
+        "synthetic garden. Runs inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--positions", type=int, default=10_000)
+        parser.add_argument("--plants", type=int, default=40)
+        parser.add_argument("--repeat", type=int, default=10)
+        parser.add_argument("--seed", type=int, default=7)
+
+    def handle(self, *args, **options):
+        if settings.IS_PROD:
+            raise CommandError("Cannot run benchmarks in production")
+
+        try:
+            with transaction.atomic():
+                self._run(options, random.Random(options["seed"]))
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _run(self, options: dict, rng: random.Random):
+        garden = self._create_garden(options["positions"], options["plants"], rng)
+        self.stdout.write(
+            f"Garden with {options['positions']} positions over {options['plants']} plants"
+        )
+
+        def orm():
+            fresh = Garden.objects.get(id=garden.id, user_id=garden.user_id)
+            return JsonResponse(garden_document(fresh)).content
+
+        def database():
+            *_, document = garden_document_json(garden.id, garden.user_id)
+            return HttpResponse(document, content_type="application/json").content
+
+        orm_body, database_body = orm(), database()
+        if json.loads(orm_body) != json.loads(database_body):
+            raise CommandError("The two paths built different documents")
+        self.stdout.write(
+            f"Response size: ORM {len(orm_body)} B, Postgres {len(database_body)} B"
+        )
+
+        for label, build in (("ORM + JsonResponse", orm), ("json_agg in Postgres", database)):
+            timings = [self._time(build) for _ in range(options["repeat"])]
+            self.stdout.write(
+                self.style.SUCCESS(f"  {label}: ")
+                + f"median {statistics.median(timings):.1f} ms, min {min(timings):.1f} ms "
+                f"over {options['repeat']} runs"
+            )
+
+    def _create_garden(self, positions: int, plant_count: int, rng: random.Random) -> Garden:
+        user = User.objects.create_user(email="benchmark@example.com", password=None)
+        color = Color.objects.create(name="Benchmark color", hex_code="#123456")
+        plants = Plant.objects.bulk_create(
+            Plant(
+                slug=f"benchmark-{n}",
+                common_name=f"Benchmark {n}",
+                scientific_name=f"Benchmarkia {n}",
+                sun=["full"],
+                bloom=["jun"],
+                height=rng.uniform(0.5, 8),
+                spread=rng.uniform(0.5, 6),
+            )
+            for n in range(plant_count)
+        )
+        garden = Garden.objects.create(user=user, name="Benchmark", width=100, length=100)
+        per_plant = positions // plant_count
+        layout = parse_plants(
+            [
+                {
+                    "plant_id": str(plant.id),
+                    "color_id": str(color.id),
+                    "positions": [
+                        {"x": rng.uniform(0, 100), "y": rng.uniform(0, 100)}
+                        for _ in range(per_plant)
+                    ],
+                }
+                for plant in plants
+            ]
+        )
+        save_garden_plants(garden, layout)
+        return garden
+
+    def _time(self, build) -> float:
+        start = time.perf_counter()
+        build()
+        return (time.perf_counter() - start) * 1000
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import random
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+
+from planner.constants import PLANT_LIST_PAGE_SIZE
+from planner.models import BloomOptions, Color, Plant, PlantFeature, SunOptions
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the JOIN/GROUP BY color and feature filters with the array predicates on a "
+        "synthetic catalog. Runs inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--plants", type=int, default=50_000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=7)
+
+    def handle(self, *args, **options):
+        if settings.IS_PROD:
+            raise CommandError("Cannot run benchmarks in production")
+
+        try:
+            with transaction.atomic():
+                self._run(options["plants"], options["repeat"], random.Random(options["seed"]))
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _run(self, size: int, repeat: int, rng: random.Random):
+        self.stdout.write(f"Creating {size} synthetic plants...")
+        colors, features = self._create_catalog(size, rng)
+
+        scenarios = {
+            "one color": {"colors": [colors[0]]},
+            "three colors": {"colors": colors[:3]},
+            "two features": {"features": features[:2]},
+            "colors and features": {"colors": colors[:3], "features": features[:2]},
+        }
+        for name, filters in scenarios.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n{name}: {filters}"))
+            for label, queryset in (
+                ("join + group by", self._legacy(filters)),
+                ("array predicates", Plant.objects.apply_filters(filters)),
+            ):
+                page = queryset.order_by("common_name", "id")[:PLANT_LIST_PAGE_SIZE]
+                timings = [self._time(page, queryset) for _ in range(repeat)]
+                self.stdout.write(self.style.SUCCESS(f"\n  {label}"))
+                self.stdout.write(f"  {page.query}")
+                self.stdout.write(
+                    f"  page + count: median {statistics.median(timings):.1f} ms, "
+                    f"min {min(timings):.1f} ms over {repeat} runs"
+                )
+                for line in page.explain(analyze=True).splitlines():
+                    self.stdout.write(f"    {line}")
+
+    def _create_catalog(self, size: int, rng: random.Random) -> tuple[list[str], list[str]]:
+        colors = Color.objects.bulk_create(
+            Color(name=f"Benchmark color {n}", hex_code=f"#{n:06X}") for n in range(12)
+        )
+        features = PlantFeature.objects.bulk_create(
+            PlantFeature(name=f"Benchmark feature {n}") for n in range(30)
+        )
+        plants = Plant.objects.bulk_create(
+            (
+                Plant(
+                    slug=f"benchmark-{n}",
+                    common_name=f"Benchmark {rng.randrange(size):06}",
+                    scientific_name=f"Benchmarkia {n}",
+                    sun=rng.sample(SunOptions.values, rng.randint(1, 2)),
+                    bloom=rng.sample(BloomOptions.values, rng.randint(1, 4)),
+                    height=rng.uniform(0.5, 8),
+                    spread=rng.uniform(0.5, 6),
+                )
+                for n in range(size)
+            ),
+            batch_size=5000,
+        )
+        Plant.colors.through.objects.bulk_create(
+            (
+                Plant.colors.through(plant_id=plant.id, color_id=color.id)
+                for plant in plants
+                for color in rng.sample(colors, rng.randint(1, 2))
+            ),
+            batch_size=10000,
+        )
+        Plant.features.through.objects.bulk_create(
+            (
+                Plant.features.through(plant_id=plant.id, plantfeature_id=feature.id)
+                for plant in plants
+                for feature in rng.sample(features, rng.randint(0, 4))
+            ),
+            batch_size=10000,
+        )
+        Plant.objects.update_relation_ids()
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Plant._meta.db_table}")
+        return [str(color.id) for color in colors], [str(feature.id) for feature in features]
+
+    def _legacy(self, filters: dict):
+        """The filters as plant_list built them before the denormalized id arrays."""
+        plants = Plant.objects.all()
+        if filters.get("colors"):
+            plants = plants.filter(colors__id__in=filters["colors"]).distinct()
+        if filters.get("features"):
+            plants = (
+                plants.filter(features__id__in=filters["features"])
+                .annotate(matching_features=Count("features", distinct=True))
+                .filter(matching_features=len(filters["features"]))
+            )
+        return plants
+
+    def _time(self, page, queryset) -> float:
+        start = time.perf_counter()
+        list(page)
+        queryset.count()
+        return (time.perf_counter() - start) * 1000
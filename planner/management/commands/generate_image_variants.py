@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django_q.tasks import async_task
+
+from planner.images import IMAGE_FIELDS, needs_variants
+from planner.tasks import generate_image_variants
+
+
+class Command(BaseCommand):
+    help = "Generate responsive variants for catalog images that don't have up-to-date ones"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--now",
+            action="store_true",
+            help="Encode in this process instead of queueing django-q tasks",
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        for label in IMAGE_FIELDS:
+            model = apps.get_model(label)
+            stale = [instance for instance in model.all_objects.all() if needs_variants(instance)]
+            for instance in stale:
+                if options["now"]:
+                    self.stdout.write(f"  {generate_image_variants(label, str(instance.pk))}")
+                else:
+                    async_task("planner.tasks.generate_image_variants", label, str(instance.pk))
+            if stale:
+                self.stdout.write(f"✓ {model.__name__}: {len(stale)}")
+            total += len(stale)
+
+        verb = "Generated" if options["now"] else "Queued"
+        self.stdout.write(self.style.SUCCESS(f"{verb} variants for {total} image(s)"))
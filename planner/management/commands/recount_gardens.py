@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from planner.gardens import recount_gardens
+from planner.models import Garden
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the denormalized plant and position counters of gardens and garden "
+        "plants, e.g. after editing positions outside of the planner."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("garden_ids", nargs="*", help="Only these gardens (default: all)")
+
+    def handle(self, *args, **options):
+        gardens = None
+        if options["garden_ids"]:
+            gardens = Garden.all_objects.filter(pk__in=options["garden_ids"])
+        plants_fixed, gardens_fixed = recount_gardens(gardens)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Corrected {plants_fixed} garden plant(s) and {gardens_fixed} garden(s)"
+            )
+        )
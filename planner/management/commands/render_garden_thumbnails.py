@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q
+from django_q.tasks import async_task
+
+from planner.models import Garden
+from planner.tasks import render_garden_thumbnail
+
+
+class Command(BaseCommand):
+    help = "Render previews of gardens that don't have one of their current revision"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--now",
+            action="store_true",
+            help="Render in this process instead of queueing django-q tasks",
+        )
+
+    def handle(self, *args, **options):
+        stale = Garden.objects.filter(
+            Q(thumbnail_revision__isnull=True) | ~Q(thumbnail_revision=F("revision"))
+        ).values_list("id", flat=True)
+        total = 0
+        for garden_id in stale.iterator():
+            if options["now"]:
+                self.stdout.write(f"  {render_garden_thumbnail(str(garden_id))}")
+            else:
+                async_task("planner.tasks.render_garden_thumbnail", str(garden_id))
+            total += 1
+
+        verb = "Rendered" if options["now"] else "Queued"
+        self.stdout.write(self.style.SUCCESS(f"{verb} thumbnails for {total} garden(s)"))
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import re
+from functools import reduce
+from typing import TYPE_CHECKING, Any
+
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.expressions import ArraySubquery
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
+from django.db.models import F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest, Upper
+
+from common.mixins.base import BaseManager, BaseQuerySet
+from planner.catalog import bump_catalog_version
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from django.db.models.expressions import CombinedExpression
+
+SEARCH_CONFIG = "english"
+
+
+def _search_vector() -> CombinedExpression:
+    """
+    Weighted document for a plant: names rank above feature names, which rank above notes.
+
+    Feature names live behind the M2M table, so they are folded in through a correlated
+    subquery rather than a join, which keeps this usable inside a single UPDATE.
+    """
+    from planner.models import PlantFeature
+
+    feature_names = (
+        PlantFeature.objects.filter(plants=OuterRef("pk"))
+        .order_by()
+        .values("plants")
+        .annotate(names=StringAgg("name", delimiter=" "))
+        .values("names")
+    )
+    return (
+        SearchVector("common_name", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("scientific_name", weight="A", config=SEARCH_CONFIG)
+        + SearchVector(Subquery(feature_names), weight="C", config=SEARCH_CONFIG)
+        + SearchVector("notes", weight="D", config=SEARCH_CONFIG)
+    )
+
+
+def _search_query(term: str) -> SearchQuery | None:
+    """Prefix-match every word so results update as the user types."""
+    words = re.findall(r"\w+", term)
+    if not words:
+        return None
+    return reduce(
+        lambda left, right: left & right,
+        (SearchQuery(f"{word}:*", search_type="raw", config=SEARCH_CONFIG) for word in words),
+    )
+
+
+class CatalogQuerySet(BaseQuerySet):
+    """
+    Queryset for catalog models. Bulk writes bypass model signals, so they bump the
+    catalog version themselves (see planner.catalog).
+    """
+
+    def update(self, **kwargs):
+        rows = super().update(**kwargs)
+        if rows:
+            bump_catalog_version()
+        return rows
+
+    def delete(self, now: datetime | None = None, hard: bool = False):
+        result = super().delete(now, hard)
+        bump_catalog_version()
+        return result
+
+    def bulk_create(self, *args, **kwargs):
+        objs = super().bulk_create(*args, **kwargs)
+        bump_catalog_version()
+        return objs
+
+
+class CatalogManager(BaseManager.from_queryset(CatalogQuerySet)):
+    pass
+
+
+class PlantQuerySet(CatalogQuerySet):
+    def search(self, term: str) -> PlantQuerySet:
+        """
+        Ranked, typo tolerant search over the plant catalog.
+
+        A plant matches when its full-text document matches every word of the term, when
+        either name is word-similar to the term (trigram, tolerates typos), or when either
+        name contains the term as a substring. Every branch is backed by a GIN index.
+        Results are annotated with ``search_rank`` and ordered by it.
+        """
+        term = term.strip()
+        if not term:
+            return self
+
+        similarity = Greatest(
+            TrigramWordSimilarity(term, Upper("common_name")),
+            TrigramWordSimilarity(term, Upper("scientific_name")),
+        )
+        matches = (
+            Q(search_common_name__trigram_word_similar=term)
+            | Q(search_scientific_name__trigram_word_similar=term)
+            | Q(common_name__icontains=term)
+            | Q(scientific_name__icontains=term)
+        )
+
+        query = _search_query(term)
+        if query is not None:
+            matches |= Q(search_vector=query)
+            # Rows written with bulk_create() have no document yet, rank them on names only
+            rank = Coalesce(SearchRank(F("search_vector"), query), 0.0) + similarity
+        else:
+            rank = similarity
+
+        return (
+            self.alias(
+                search_common_name=Upper("common_name"),
+                search_scientific_name=Upper("scientific_name"),
+            )
+            .filter(matches)
+            .annotate(search_rank=rank)
+            .order_by("-search_rank", "common_name")
+        )
+
+    def matching_choices(
+        self, field: str, values: list[str], match_all: bool = False
+    ) -> PlantQuerySet:
+        """
+        Plants whose choice array ``field`` holds any of ``values``, or every one of them.
+
+        Overlap (``&&``) and containment (``@>``) are both answered by the field's GIN
+        index, the same way the color and feature filters are.
+        """
+        if match_all:
+            return self.filter(**{f"{field}__contains": values})
+        return self.filter(**{f"{field}__overlap": values})
+
+    def apply_filters(self, filters: dict) -> PlantQuerySet:
+        """Apply a filter set produced by ``planner.views._validate_filters``."""
+        plants = self
+
+        if filters.get("search"):
+            plants = plants.search(filters["search"])
+
+        if filters.get("niche"):
+            plants = plants.filter(niche_id=filters["niche"])
+
+        if filters.get("sun"):
+            plants = plants.matching_choices("sun", filters["sun"])
+
+        if filters.get("bloom"):
+            plants = plants.matching_choices(
+                "bloom",
+                filters["bloom"],
+                match_all=filters.get("bloomMatch") == "all",
+            )
+
+        if filters.get("native"):
+            plants = plants.filter(native=True)
+
+        if filters.get("buyable"):
+            plants = plants.exclude(link="")
+
+        if filters.get("heightMin") is not None:
+            plants = plants.filter(height__gte=filters["heightMin"])
+
+        if filters.get("heightMax") is not None:
+            plants = plants.filter(height__lte=filters["heightMax"])
+
+        if filters.get("spreadMin") is not None:
+            plants = plants.filter(spread__gte=filters["spreadMin"])
+
+        if filters.get("spreadMax") is not None:
+            plants = plants.filter(spread__lte=filters["spreadMax"])
+
+        if filters.get("colors"):
+            # OR logic: plant has any of the selected colors
+            plants = plants.filter(color_ids__overlap=filters["colors"])
+
+        if filters.get("features"):
+            # AND logic: plant must have ALL selected features
+            plants = plants.filter(feature_ids__contains=filters["features"])
+
+        return plants
+
+    def update_relation_ids(self) -> int:
+        """Recompute the denormalized color and feature ids for every plant in the queryset."""
+        from planner.models import Plant
+
+        return self.update(
+            color_ids=ArraySubquery(
+                Plant.colors.through.objects.filter(plant_id=OuterRef("pk")).values("color_id")
+            ),
+            feature_ids=ArraySubquery(
+                Plant.features.through.objects.filter(plant_id=OuterRef("pk")).values(
+                    "plantfeature_id"
+                )
+            ),
+        )
+
+    def update_search_vector(self) -> int:
+        """Recompute the stored search document for every plant in the queryset."""
+        return self.update(search_vector=_search_vector())
+
+
+class PlantManager(BaseManager.from_queryset(PlantQuerySet)):
+    if TYPE_CHECKING:
+        # Copied from PlantQuerySet at runtime, out of the type checker's sight
+        def filter(self, *args: Any, **kwargs: Any) -> PlantQuerySet: ...
+        def matching_choices(
+            self, field: str, values: list[str], match_all: bool = False
+        ) -> PlantQuerySet: ...
+        def apply_filters(self, filters: dict) -> PlantQuerySet: ...
+        def update_relation_ids(self) -> int: ...
+        def update_search_vector(self) -> int: ...
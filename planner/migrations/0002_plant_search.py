@@ -0,0 +1,58 @@
+# Generated by Django 5.1.4 on 2026-10-18 02:55
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.functions.text
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def populate_search_vector(apps, schema_editor):
+    Plant = apps.get_model("planner", "Plant")
+    PlantFeature = apps.get_model("planner", "PlantFeature")
+
+    feature_names = (
+        PlantFeature.objects.filter(plants=OuterRef("pk"))
+        .order_by()
+        .values("plants")
+        .annotate(names=StringAgg("name", delimiter=" "))
+        .values("names")
+    )
+    Plant.objects.update(
+        search_vector=SearchVector("common_name", weight="A", config="english")
+        + SearchVector("scientific_name", weight="A", config="english")
+        + SearchVector(Subquery(feature_names), weight="C", config="english")
+        + SearchVector("notes", weight="D", config="english")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planner', '0001_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='plant',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='plant',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='plant_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='plant',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('common_name'), name='gin_trgm_ops'), name='plant_common_name_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='plant',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('scientific_name'), name='gin_trgm_ops'), name='plant_scientific_name_trgm_idx'),
+        ),
+        migrations.RunPython(populate_search_vector, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.4 on 2026-10-18 02:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planner', '0002_plant_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='plant',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['common_name', 'id'], name='plant_name_keyset_idx'),
+        ),
+    ]
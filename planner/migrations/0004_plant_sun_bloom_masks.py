@@ -0,0 +1,33 @@
+# Generated by Django 5.1.4 on 2026-10-18 03:05
+
+import django.contrib.postgres.indexes
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planner', '0003_plant_name_keyset_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='plant',
+            name='bloom_mask',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(bloom__contains=['jan'], then=models.Value(1)), default=0), '+', models.Case(models.When(bloom__contains=['feb'], then=models.Value(2)), default=0)), '+', models.Case(models.When(bloom__contains=['mar'], then=models.Value(4)), default=0)), '+', models.Case(models.When(bloom__contains=['apr'], then=models.Value(8)), default=0)), '+', models.Case(models.When(bloom__contains=['may'], then=models.Value(16)), default=0)), '+', models.Case(models.When(bloom__contains=['jun'], then=models.Value(32)), default=0)), '+', models.Case(models.When(bloom__contains=['jul'], then=models.Value(64)), default=0)), '+', models.Case(models.When(bloom__contains=['aug'], then=models.Value(128)), default=0)), '+', models.Case(models.When(bloom__contains=['sep'], then=models.Value(256)), default=0)), '+', models.Case(models.When(bloom__contains=['oct'], then=models.Value(512)), default=0)), '+', models.Case(models.When(bloom__contains=['nov'], then=models.Value(1024)), default=0)), '+', models.Case(models.When(bloom__contains=['dec'], then=models.Value(2048)), default=0)), output_field=models.SmallIntegerField()),
+        ),
+        migrations.AddField(
+            model_name='plant',
+            name='sun_mask',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(sun__contains=['full'], then=models.Value(1)), default=0), '+', models.Case(models.When(sun__contains=['partial'], then=models.Value(2)), default=0)), '+', models.Case(models.When(sun__contains=['shade'], then=models.Value(4)), default=0)), output_field=models.SmallIntegerField()),
+        ),
+        migrations.AddIndex(
+            model_name='plant',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['sun'], name='plant_sun_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='plant',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['bloom'], name='plant_bloom_idx'),
+        ),
+    ]
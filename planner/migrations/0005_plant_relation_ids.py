@@ -0,0 +1,51 @@
+# Generated by Django 5.1.4 on 2026-10-18 03:06
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db import migrations, models
+from django.db.models import OuterRef
+
+
+def populate_relation_ids(apps, schema_editor):
+    Plant = apps.get_model("planner", "Plant")
+
+    Plant.objects.update(
+        color_ids=ArraySubquery(
+            Plant.colors.through.objects.filter(plant_id=OuterRef("pk")).values("color_id")
+        ),
+        feature_ids=ArraySubquery(
+            Plant.features.through.objects.filter(plant_id=OuterRef("pk")).values(
+                "plantfeature_id"
+            )
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planner', '0004_plant_sun_bloom_masks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='plant',
+            name='color_ids',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.UUIDField(), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.AddField(
+            model_name='plant',
+            name='feature_ids',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.UUIDField(), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.AddIndex(
+            model_name='plant',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['color_ids'], name='plant_color_ids_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='plant',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['feature_ids'], name='plant_feature_ids_idx'),
+        ),
+        migrations.RunPython(populate_relation_ids, migrations.RunPython.noop),
+    ]
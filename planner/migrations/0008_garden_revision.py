@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-18 03:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planner', '0007_plant_image_placeholder'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='garden',
+            name='revision',
+            field=models.PositiveIntegerField(default=1, editable=False, help_text='Incremented on every save or sync'),
+        ),
+    ]
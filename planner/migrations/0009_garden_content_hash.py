@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-18 03:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planner', '0008_garden_revision'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='garden',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, help_text='Digest of the fields and layout, see planner.gardens.content_hash', max_length=64),
+        ),
+    ]
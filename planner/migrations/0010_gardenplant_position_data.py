@@ -0,0 +1,68 @@
+# Generated by Django 5.1.4 on 2026-10-18 03:27
+
+import struct
+from itertools import groupby
+from operator import itemgetter
+
+from django.db import migrations, models
+
+
+def pack_positions(apps, schema_editor):
+    Garden = apps.get_model("planner", "Garden")
+    GardenPlant = apps.get_model("planner", "GardenPlant")
+    PlantPosition = apps.get_model("planner", "PlantPosition")
+
+    rows = (
+        PlantPosition.objects.filter(deleted_at__isnull=True)
+        .order_by("garden_plant_id", "created_at", "id")
+        .values_list("garden_plant_id", "x", "y")
+        .iterator(chunk_size=10000)
+    )
+    batch = []
+    for garden_plant_id, group in groupby(rows, key=itemgetter(0)):
+        coordinates = [coordinate for _, x, y in group for coordinate in (x, y)]
+        position_data = struct.pack(f"<{len(coordinates)}f", *coordinates)
+        batch.append(GardenPlant(id=garden_plant_id, position_data=position_data))
+        if len(batch) == 1000:
+            GardenPlant.objects.bulk_update(batch, ["position_data"])
+            batch = []
+    GardenPlant.objects.bulk_update(batch, ["position_data"])
+    # Content hashes were computed from float64 coordinates, the next save recomputes them
+    Garden.objects.update(content_hash="")
+
+
+def unpack_positions(apps, schema_editor):
+    GardenPlant = apps.get_model("planner", "GardenPlant")
+    PlantPosition = apps.get_model("planner", "PlantPosition")
+
+    # The packed positions are the current ones, rows left from before 0010 are stale
+    PlantPosition.objects.all().delete()
+    rows = (
+        GardenPlant.objects.exclude(position_data=b"")
+        .values_list("id", "position_data")
+        .iterator(chunk_size=1000)
+    )
+    PlantPosition.objects.bulk_create(
+        (
+            PlantPosition(garden_plant_id=garden_plant_id, x=x, y=y)
+            for garden_plant_id, data in rows
+            for x, y in struct.iter_unpack("<2f", data)
+        ),
+        batch_size=5000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planner', '0009_garden_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gardenplant',
+            name='position_data',
+            field=models.BinaryField(default=bytes, help_text='Positions as packed float32 x, y pairs, see planner.positions'),
+        ),
+        migrations.RunPython(pack_positions, unpack_positions),
+    ]
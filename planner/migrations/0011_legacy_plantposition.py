@@ -0,0 +1,30 @@
+# Generated by Django 5.1.4 on 2026-10-18 03:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def delete_orphans(apps, schema_editor):
+    # Garden plants deleted since 0011 left their legacy rows behind, which would break
+    # the foreign key constraint restored below
+    GardenPlant = apps.get_model("planner", "GardenPlant")
+    PlantPosition = apps.get_model("planner", "PlantPosition")
+    PlantPosition.objects.exclude(
+        garden_plant_id__in=GardenPlant.objects.values("id")
+    ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planner', '0010_gardenplant_position_data'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='plantposition',
+            name='garden_plant',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='planner.gardenplant'),
+        ),
+        migrations.RunPython(migrations.RunPython.noop, delete_orphans),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.1.4 on 2026-10-18 03:34
+
+from django.db import migrations
+
+# Decodes one little-endian float32 from a bytea at a byte offset (see planner.positions),
+# so load_garden can build its JSON in the database. A single SQL expression, so the
+# planner inlines it into the calling query.
+CREATE_FLOAT4LE = """
+CREATE OR REPLACE FUNCTION planner_float4le(data bytea, byte_offset integer)
+RETURNS double precision
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$
+    SELECT (CASE WHEN get_byte(data, byte_offset + 3) >= 128 THEN -1 ELSE 1 END)
+        * (
+            (
+                ((get_byte(data, byte_offset + 2) & 127) << 16)
+                | (get_byte(data, byte_offset + 1) << 8)
+                | get_byte(data, byte_offset)
+            )
+            + CASE
+                WHEN (((get_byte(data, byte_offset + 3) & 127) << 1)
+                      | (get_byte(data, byte_offset + 2) >> 7)) = 0 THEN 0
+                ELSE 8388608
+            END
+        )::double precision
+        * 2::double precision ^ (
+            GREATEST(
+                ((get_byte(data, byte_offset + 3) & 127) << 1)
+                | (get_byte(data, byte_offset + 2) >> 7),
+                1
+            ) - 150
+        )
+$$;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planner', '0011_legacy_plantposition'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            CREATE_FLOAT4LE,
+            "DROP FUNCTION IF EXISTS planner_float4le(bytea, integer);",
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.1.4 on 2026-10-18 03:51
+
+from django.db import migrations, models
+
+# Same as planner.gardens.recount_gardens, which can't be used from a migration
+BACKFILL_COUNTERS = """
+UPDATE planner_gardenplant SET position_count = length(position_data) / 8;
+UPDATE planner_garden AS garden
+SET plant_count = counts.plants, position_count = counts.positions
+FROM (
+    SELECT garden_id, count(*) AS plants, sum(position_count) AS positions
+    FROM planner_gardenplant
+    WHERE deleted_at IS NULL
+    GROUP BY garden_id
+) AS counts
+WHERE counts.garden_id = garden.id;
+"""
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planner', '0012_float4le_function'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='garden',
+            name='plant_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Plant/color combinations in the garden'),
+        ),
+        migrations.AddField(
+            model_name='garden',
+            name='position_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Plants placed over all combinations'),
+        ),
+        migrations.AddField(
+            model_name='gardenplant',
+            name='position_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of positions in position_data'),
+        ),
+        migrations.RunSQL(BACKFILL_COUNTERS, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-18 04:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planner', '0013_position_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='garden',
+            name='thumbnail',
+            field=models.FileField(blank=True, editable=False, upload_to='gardens/thumbnails/'),
+        ),
+        migrations.AddField(
+            model_name='garden',
+            name='thumbnail_revision',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Revision the thumbnail shows', null=True),
+        ),
+    ]
@@ -1,13 +1,22 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from functools import reduce
+from operator import add
+from typing import TYPE_CHECKING, ClassVar
 
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import Case, Value, When
+from django.db.models.functions import Upper
 
 from common.mixins import base as base_mixins
+from planner import positions as packed_positions
+from planner.managers import CatalogManager, PlantManager
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
     from uuid import UUID
 
     from django.db.models import Manager
@@ -34,13 +43,35 @@ class BloomOptions(models.TextChoices):
     DECEMBER = "dec", "December"
 
 
+def bitmask(choices: type[models.TextChoices], values: Iterable[str]) -> int:
+    """Encode choice values as a bitmask, one bit per choice in declaration order."""
+    bits = {value: 1 << index for index, value in enumerate(choices.values)}
+    return reduce(lambda mask, value: mask | bits[value], values, 0)
+
+
+def _bitmask_expression(field: str, choices: type[models.TextChoices]):
+    # Immutable so it can back a generated column: one CASE per choice, summed
+    return reduce(
+        add,
+        (
+            Case(When(**{f"{field}__contains": [value]}, then=Value(1 << index)), default=0)
+            for index, value in enumerate(choices.values)
+        ),
+    )
+
+
 class Niche(base_mixins.BaseModel):
     slug = models.SlugField(max_length=100, unique=True)
     icon = models.ImageField(upload_to="icons/", blank=True, null=True)
+    # Responsive variants of icon, maintained by planner.images
+    icon_variants = models.JSONField(default=dict, blank=True, editable=False)
     title = models.CharField(max_length=100, unique=True)
     subtitle = models.CharField(max_length=150, blank=True)
     role = models.TextField(blank=True)
 
+    objects: ClassVar[CatalogManager] = CatalogManager()
+    all_objects: ClassVar[CatalogManager] = CatalogManager(include_deleted=True)
+
     def __str__(self):
         return self.title
 
@@ -50,6 +81,12 @@ class Plant(base_mixins.BaseModel):
     common_name = models.CharField(max_length=255)
     scientific_name = models.CharField(max_length=255, unique=True)
     image = models.ImageField(upload_to="plants/", blank=True, null=True)
+    # Responsive variants of image, its intrinsic size and an inline blurred placeholder,
+    # maintained by planner.images
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+    image_width = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    image_height = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    image_placeholder = models.TextField(blank=True, editable=False)
     sun = ArrayField(
         base_field=models.CharField(choices=SunOptions.choices, max_length=20),
         blank=True,
@@ -60,6 +97,18 @@ class Plant(base_mixins.BaseModel):
         blank=True,
         default=list,
     )
+    # Bitmask mirrors of sun and bloom (see bitmask()), for month arithmetic on a small
+    # integer (planner.coverage). Filters query the GIN-indexed arrays themselves.
+    sun_mask = models.GeneratedField(
+        expression=_bitmask_expression("sun", SunOptions),
+        output_field=models.SmallIntegerField(),
+        db_persist=True,
+    )
+    bloom_mask = models.GeneratedField(
+        expression=_bitmask_expression("bloom", BloomOptions),
+        output_field=models.SmallIntegerField(),
+        db_persist=True,
+    )
     native = models.BooleanField(default=True)
     features = models.ManyToManyField("PlantFeature", related_name="plants", blank=True)
     notes = models.TextField(blank=True)
@@ -67,6 +116,10 @@ class Plant(base_mixins.BaseModel):
     height = models.FloatField(help_text="Height in feet", blank=True, null=True)
     spread = models.FloatField(help_text="Plant spacing in feet", blank=True, null=True)
     colors = models.ManyToManyField("Color", related_name="plants", blank=True)
+    # Denormalized ids of the M2M relations above, maintained by planner.signals, so the
+    # color and feature filters are array predicates instead of joins
+    color_ids = ArrayField(models.UUIDField(), blank=True, default=list, editable=False)
+    feature_ids = ArrayField(models.UUIDField(), blank=True, default=list, editable=False)
     niche = models.ForeignKey(
         "Niche",
         on_delete=models.CASCADE,
@@ -74,6 +127,38 @@ class Plant(base_mixins.BaseModel):
         blank=True,
         null=True,
     )
+    # Weighted full-text document, maintained by planner.signals
+    search_vector = SearchVectorField(blank=True, null=True, editable=False)
+
+    objects: ClassVar[PlantManager] = PlantManager()
+    all_objects: ClassVar[PlantManager] = PlantManager(include_deleted=True)
+
+    if TYPE_CHECKING:
+        niche_id: UUID | None
+
+    class Meta:
+        indexes = [
+            # Keyset pagination order for plant_list
+            models.Index(
+                fields=["common_name", "id"],
+                name="plant_name_keyset_idx",
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            # Any-of (&&) and all-of (@>) season and exposure filters
+            GinIndex(fields=["sun"], name="plant_sun_idx"),
+            GinIndex(fields=["bloom"], name="plant_bloom_idx"),
+            GinIndex(fields=["color_ids"], name="plant_color_ids_idx"),
+            GinIndex(fields=["feature_ids"], name="plant_feature_ids_idx"),
+            GinIndex(fields=["search_vector"], name="plant_search_vector_idx"),
+            GinIndex(
+                OpClass(Upper("common_name"), name="gin_trgm_ops"),
+                name="plant_common_name_trgm_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("scientific_name"), name="gin_trgm_ops"),
+                name="plant_scientific_name_trgm_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.common_name
@@ -81,9 +166,14 @@ class Plant(base_mixins.BaseModel):
 
 class PlantFeature(base_mixins.BaseModel):
     icon = models.ImageField(upload_to="icons/", blank=True, null=True)
+    # Responsive variants of icon, maintained by planner.images
+    icon_variants = models.JSONField(default=dict, blank=True, editable=False)
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True)
 
+    objects: ClassVar[CatalogManager] = CatalogManager()
+    all_objects: ClassVar[CatalogManager] = CatalogManager(include_deleted=True)
+
     def __str__(self):
         return self.name
 
@@ -92,6 +182,9 @@ class Color(base_mixins.BaseModel):
     name = models.CharField(max_length=100, unique=True)
     hex_code = models.CharField(max_length=7, unique=True)
 
+    objects: ClassVar[CatalogManager] = CatalogManager()
+    all_objects: ClassVar[CatalogManager] = CatalogManager(include_deleted=True)
+
     def __str__(self):
         return self.name
 
@@ -108,8 +201,30 @@ class Garden(base_mixins.BaseModel):
         on_delete=models.CASCADE,
         related_name="gardens",
     )
+    revision = models.PositiveIntegerField(
+        default=1, editable=False, help_text="Incremented on every save or sync"
+    )
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        help_text="Digest of the fields and layout, see planner.gardens.content_hash",
+    )
+    # Maintained by planner.gardens.save_packed_plants, see recount_gardens
+    plant_count = models.PositiveIntegerField(
+        default=0, editable=False, help_text="Plant/color combinations in the garden"
+    )
+    position_count = models.PositiveIntegerField(
+        default=0, editable=False, help_text="Plants placed over all combinations"
+    )
+    # Maintained by planner.thumbnails after every save
+    thumbnail = models.FileField(upload_to="gardens/thumbnails/", blank=True, editable=False)
+    thumbnail_revision = models.PositiveIntegerField(
+        null=True, blank=True, editable=False, help_text="Revision the thumbnail shows"
+    )
 
     if TYPE_CHECKING:
+        user_id: UUID
         garden_plants: Manager[GardenPlant]
 
     def __str__(self):
@@ -122,39 +237,63 @@ class GardenPlant(base_mixins.BaseModel):
     garden = models.ForeignKey(Garden, on_delete=models.CASCADE, related_name="garden_plants")
     plant = models.ForeignKey(Plant, on_delete=models.CASCADE)
     color = models.ForeignKey(Color, on_delete=models.CASCADE)
+    position_data = models.BinaryField(
+        default=bytes,
+        editable=False,
+        help_text="Positions as packed float32 x, y pairs, see planner.positions",
+    )
+    position_count = models.PositiveIntegerField(
+        default=0, editable=False, help_text="Number of positions in position_data"
+    )
 
     if TYPE_CHECKING:
-        positions: Manager[PlantPosition]
+        garden_id: UUID
         plant_id: UUID
         color_id: UUID
 
     class Meta:
         unique_together = ("garden", "plant", "color")
 
+    @property
+    def positions(self) -> list[tuple[float, float]]:
+        """The (x, y) positions in feet from the origin, in the order they were placed."""
+        return packed_positions.unpack(self.position_data)
+
     @property
     def quantity(self):
-        """Computed quantity based on number of positions."""
-        return self.positions.count()
+        """Number of positions, kept in step with position_data."""
+        return self.position_count
 
     def __str__(self):
         return f"{self.plant.common_name} ({self.color.name}) in {self.garden.name}"
 
 
 class PlantPosition(base_mixins.BaseModel):
-    """Individual plant instance with specific position in a garden."""
+    """
+    Legacy: one row per plant on the canvas, before positions were packed into
+    GardenPlant.position_data (migration 0010).
+
+    Nothing reads or writes these rows any more. The table is kept, without a foreign key
+    constraint, until packed positions have shipped, so that 0010 can still be reversed onto
+    it; a later release drops it.
+    """
 
     garden_plant = models.ForeignKey(
         GardenPlant,
-        on_delete=models.CASCADE,
-        related_name="positions",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
     )
     x = models.FloatField(help_text="X coordinate in feet from origin")
     y = models.FloatField(help_text="Y coordinate in feet from origin")
 
+    if TYPE_CHECKING:
+        garden_plant_id: UUID
+
     class Meta:
         indexes = [
             models.Index(fields=["garden_plant", "x", "y"]),
         ]
 
     def __str__(self):
-        return f"{self.garden_plant.plant.common_name} at ({self.x}, {self.y})"
+        return f"Position ({self.x}, {self.y}) of {self.garden_plant_id}"
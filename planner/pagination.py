@@ -0,0 +1,174 @@
+"""
+Keyset (cursor) pagination.
+
+Instead of ``OFFSET n`` every page is fetched with ``WHERE (ordering) > (last row seen)``,
+so page 50 costs the same as page 1 when the ordering is backed by an index. Cursors are
+opaque url-safe tokens carrying the boundary row's ordering values, the page number and
+the total count (which is only computed once, on the first page).
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from uuid import UUID
+
+from django.db.models import Q, QuerySet
+
+
+def encode_cursor(values: list, direction: str, number: int, count: int | None) -> str:
+    payload = json.dumps({"v": values, "d": direction, "p": number, "n": count})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str | None) -> dict | None:
+    """Decode a cursor token, returning None for a missing or malformed token."""
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        cursor = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, binascii.Error):
+        return None
+    if (
+        not isinstance(cursor, dict)
+        or not isinstance(cursor.get("v"), list)
+        or cursor.get("d") not in ("next", "prev")
+        or not isinstance(cursor.get("p"), int)
+        or not (cursor.get("n") is None or isinstance(cursor.get("n"), int))
+    ):
+        return None
+    return cursor
+
+
+class KeysetPage:
+    def __init__(
+        self,
+        object_list: list,
+        number: int,
+        count: int | None,
+        per_page: int,
+        next_cursor: str | None,
+        previous_cursor: str | None,
+    ):
+        self.object_list = object_list
+        self.number = number
+        self.count = count
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.num_pages = max(1, -(-count // per_page)) if count is not None else None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by a unique ordering, e.g. ``("common_name", "id")``.
+
+    The last ordering field must be unique so that every row has a distinct position.
+    Descending fields are written with a leading ``-`` as in ``order_by()``.
+    """
+
+    def __init__(self, queryset: QuerySet, per_page: int, ordering: tuple[str, ...]):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = ordering
+
+    def get_page(self, token: str | None) -> KeysetPage:
+        cursor = decode_cursor(token)
+        if cursor is not None and len(cursor["v"]) != len(self.ordering):
+            cursor = None
+
+        if cursor is None:
+            rows = list(self.queryset.order_by(*self.ordering)[: self.per_page + 1])
+            has_next = len(rows) > self.per_page
+            rows = rows[: self.per_page]
+            # Only the first page pays for a count; later pages carry it in the cursor
+            count = self.queryset.count() if has_next else len(rows)
+            return self._page(rows, 1, count, has_previous=False, has_next=has_next)
+
+        values, number, count = cursor["v"], max(cursor["p"], 1), cursor["n"]
+        if cursor["d"] == "next":
+            queryset = self.queryset.filter(self._seek(values, forward=True))
+            rows = list(queryset.order_by(*self.ordering)[: self.per_page + 1])
+            has_next = len(rows) > self.per_page
+            rows = rows[: self.per_page]
+            return self._page(rows, number, count, has_previous=True, has_next=has_next)
+
+        queryset = self.queryset.filter(self._seek(values, forward=False))
+        reverse_ordering = tuple(_reverse(field) for field in self.ordering)
+        rows = list(queryset.order_by(*reverse_ordering)[: self.per_page + 1])
+        has_previous = len(rows) > self.per_page
+        rows = rows[: self.per_page][::-1]
+        return self._page(rows, number, count, has_previous=has_previous, has_next=True)
+
+    def _page(self, rows, number, count, has_previous, has_next) -> KeysetPage:
+        return keyset_page(
+            rows, self.ordering, self.per_page, number, count, has_previous, has_next
+        )
+
+    def _seek(self, values: list, forward: bool) -> Q:
+        """
+        Rows strictly after (or before) ``values`` in the paginator's ordering.
+
+        Expands the row comparison into ``a > x OR (a = x AND b > y) ...`` and adds a
+        ``a >= x`` bound that the database can use as an index range condition.
+        """
+        fields = [field.lstrip("-") for field in self.ordering]
+        ascending = [not field.startswith("-") for field in self.ordering]
+
+        def operator(index: int, inclusive: bool = False) -> str:
+            greater = ascending[index] == forward
+            return ("gte" if inclusive else "gt") if greater else ("lte" if inclusive else "lt")
+
+        seek = Q()
+        for index, (field, value) in enumerate(zip(fields, values, strict=True)):
+            equal = {fields[i]: values[i] for i in range(index)}
+            seek |= Q(**equal, **{f"{field}__{operator(index)}": value})
+        return Q(**{f"{fields[0]}__{operator(0, inclusive=True)}": values[0]}) & seek
+
+
+def keyset_page(
+    rows: list,
+    ordering: tuple[str, ...],
+    per_page: int,
+    number: int,
+    count: int | None,
+    has_previous: bool,
+    has_next: bool,
+) -> KeysetPage:
+    """Build a page with cursors pointing at its first and last rows."""
+    next_cursor = previous_cursor = None
+    if rows and has_next:
+        next_cursor = encode_cursor(_values(rows[-1], ordering), "next", number + 1, count)
+    if rows and has_previous:
+        previous_cursor = encode_cursor(
+            _values(rows[0], ordering), "prev", max(number - 1, 1), count
+        )
+    return KeysetPage(rows, number, count, per_page, next_cursor, previous_cursor)
+
+
+def _values(obj, ordering: tuple[str, ...]) -> list:
+    values = []
+    for field in ordering:
+        value = getattr(obj, field.lstrip("-"))
+        values.append(str(value) if isinstance(value, UUID) else value)
+    return values
+
+
+def _reverse(field: str) -> str:
+    return field[1:] if field.startswith("-") else f"-{field}"
@@ -0,0 +1,92 @@
+"""
+Plant details for the garden summary.
+
+A summary shows every plant/color combination in a garden. Details are read for all of them
+at once: one query for the plants with their niche, one for their features and one for the
+colors, however many plants are asked for. Each plant's details are cached under the catalog
+version (see planner.catalog), so once a plant has been summarized, only colors are read.
+"""
+
+from __future__ import annotations
+
+import uuid
+
+from django.core.cache import cache
+
+from planner.catalog import get_catalog_version
+from planner.constants import PLANT_DETAIL_CACHE_TIMEOUT
+from planner.models import Color, Plant
+
+Selection = tuple[str, str]
+
+
+def parse_selections(raw: list) -> list[Selection]:
+    """
+    (plant_id, color_id) pairs from ``[{"plant_id": ..., "color_id": ...}]``.
+
+    Entries that aren't a pair of UUIDs are skipped, like unknown plants and colors.
+    """
+    selections = []
+    for entry in raw:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            selections.append(
+                (str(uuid.UUID(str(entry["plant_id"]))), str(uuid.UUID(str(entry["color_id"]))))
+            )
+        except (KeyError, ValueError):
+            continue
+    return selections
+
+
+def plant_details(selections: list[Selection]) -> list[dict]:
+    """Details of each selected plant in its color, in order, skipping unknown ones."""
+    version = get_catalog_version()
+    keys = {plant_id: f"plant_detail:{version}:{plant_id}" for plant_id, _ in selections}
+    cached = cache.get_many(keys.values())
+    details = {plant_id: cached[key] for plant_id, key in keys.items() if key in cached}
+
+    missing = [plant_id for plant_id in keys if plant_id not in details]
+    if missing:
+        plants = (
+            Plant.objects.select_related("niche").prefetch_related("features").in_bulk(missing)
+        )
+        fresh = {str(plant_id): _plant_detail(plant) for plant_id, plant in plants.items()}
+        cache.set_many(
+            {keys[plant_id]: detail for plant_id, detail in fresh.items()},
+            PLANT_DETAIL_CACHE_TIMEOUT,
+        )
+        details.update(fresh)
+
+    colors = {
+        str(color_id): color
+        for color_id, color in Color.objects.in_bulk({c for _, c in selections}).items()
+    }
+    return [
+        {
+            "plant_id": plant_id,
+            "color_id": color_id,
+            **details[plant_id],
+            "color_hex": colors[color_id].hex_code,
+            "color_name": colors[color_id].name,
+        }
+        for plant_id, color_id in selections
+        if plant_id in details and color_id in colors
+    ]
+
+
+def _plant_detail(plant: Plant) -> dict:
+    return {
+        "common_name": plant.common_name,
+        "scientific_name": plant.scientific_name,
+        "height": plant.height,
+        "spread": plant.spread,
+        "bloom": plant.bloom,
+        "native": plant.native,
+        "niche_id": plant.niche_id,
+        "niche_name": plant.niche.title if plant.niche else None,
+        "features": [
+            {"id": f.id, "name": f.name, "icon": f.icon.url if f.icon else None}
+            for f in plant.features.all()
+        ],
+    }
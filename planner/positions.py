@@ -0,0 +1,59 @@
+"""
+Packed garden positions.
+
+A GardenPlant stores all of its positions in one ``bytea`` column as little-endian float32
+x, y pairs: 8 bytes per plant on the canvas, instead of a PlantPosition row with a UUID,
+timestamps and an index entry each. Loading a garden decodes one buffer per plant/color
+combination rather than hydrating a model instance per dot.
+
+float32 keeps about seven significant digits, far finer than anyone can place a plant.
+Incoming coordinates are quantized to float32 (see ``quantize``) before they are compared,
+hashed or stored, so a coordinate sent back by the planner always matches the stored one.
+"""
+
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from collections.abc import Iterable
+
+Point = tuple[float, float]
+
+# Bytes per packed (x, y) pair
+POSITION_SIZE = 8
+
+
+def quantize(value: float) -> float:
+    """The float32 nearest to ``value``, as stored. Raises ValueError when out of range."""
+    try:
+        return struct.unpack("<f", struct.pack("<f", value))[0]
+    except OverflowError as e:
+        raise ValueError(f"Coordinate out of range: {value!r}") from e
+
+
+def pack(points: Iterable[Point]) -> bytes:
+    return pack_coordinates(array("f", [coordinate for point in points for coordinate in point]))
+
+
+def pack_coordinates(values: array) -> bytes:
+    """Pack a flat ``array("f")`` of x, y, x, y... coordinates, as filled while parsing."""
+    if sys.byteorder == "big":
+        values = array("f", values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def unpack(data: bytes | memoryview | None) -> list[Point]:
+    if not data:
+        return []
+    values = array("f")
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    coordinates = iter(values.tolist())
+    return list(zip(coordinates, coordinates, strict=True))
+
+
+def count(data: bytes | memoryview | None) -> int:
+    return len(data) // POSITION_SIZE if data else 0
@@ -0,0 +1,97 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django_q.tasks import async_task
+
+from planner.catalog import bump_catalog_version
+from planner.garden_cache import invalidate_gardens
+from planner.images import delete_media, needs_variants
+from planner.models import Color, Garden, Niche, Plant, PlantFeature
+from planner.thumbnails import needs_thumbnail
+
+CATALOG_MODELS = (Plant, Color, PlantFeature, Niche)
+
+
+@receiver(post_save, sender=Plant)
+def refresh_plant_search_vector(sender, instance, **kwargs):
+    Plant.all_objects.filter(pk=instance.pk).update_search_vector()
+
+
+@receiver(m2m_changed, sender=Plant.features.through)
+def refresh_search_vector_on_features_change(sender, instance, action, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if isinstance(instance, Plant):
+        Plant.all_objects.filter(pk=instance.pk).update_search_vector()
+    elif pk_set:
+        # Reverse side: plant_feature.plants.add(...)
+        Plant.all_objects.filter(pk__in=pk_set).update_search_vector()
+
+
+@receiver(m2m_changed, sender=Plant.colors.through)
+@receiver(m2m_changed, sender=Plant.features.through)
+def refresh_relation_ids(sender, instance, action, pk_set, **kwargs):
+    if isinstance(instance, Plant):
+        if action in ("post_add", "post_remove", "post_clear"):
+            Plant.all_objects.filter(pk=instance.pk).update_relation_ids()
+        return
+
+    # Reverse side: color.plants.add(...). A clear doesn't name the plants it removes,
+    # so remember them before the rows are deleted.
+    if action == "pre_clear":
+        instance._cleared_plant_ids = list(instance.plants.values_list("pk", flat=True))
+    elif action == "post_clear":
+        plant_ids = getattr(instance, "_cleared_plant_ids", [])
+        Plant.all_objects.filter(pk__in=plant_ids).update_relation_ids()
+    elif action in ("post_add", "post_remove") and pk_set:
+        Plant.all_objects.filter(pk__in=pk_set).update_relation_ids()
+
+
+@receiver(post_save, sender=PlantFeature)
+def refresh_search_vector_on_feature_rename(sender, instance, **kwargs):
+    Plant.all_objects.filter(features=instance).update_search_vector()
+
+
+@receiver(post_save, sender=Plant)
+@receiver(post_save, sender=Niche)
+@receiver(post_save, sender=PlantFeature)
+def queue_image_variants(sender, instance, **kwargs):
+    if needs_variants(instance):
+        label, pk = instance._meta.label_lower, str(instance.pk)
+        transaction.on_commit(
+            lambda: async_task("planner.tasks.generate_image_variants", label, pk)
+        )
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_catalog_version_on_write(sender, **kwargs):
+    if sender in CATALOG_MODELS:
+        bump_catalog_version()
+
+
+@receiver(m2m_changed, sender=Plant.colors.through)
+@receiver(m2m_changed, sender=Plant.features.through)
+def bump_catalog_version_on_relation_change(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_catalog_version()
+
+
+@receiver(post_save, sender=Garden)
+@receiver(post_delete, sender=Garden)
+def invalidate_garden_cache(sender, instance, **kwargs):
+    invalidate_gardens(instance.user_id, instance.pk)
+
+
+@receiver(post_save, sender=Garden)
+def queue_garden_thumbnail(sender, instance, **kwargs):
+    if needs_thumbnail(instance):
+        pk = str(instance.pk)
+        transaction.on_commit(lambda: async_task("planner.tasks.render_garden_thumbnail", pk))
+
+
+@receiver(post_delete, sender=Garden)
+def delete_garden_thumbnail(sender, instance, **kwargs):
+    if instance.thumbnail.name:
+        name = instance.thumbnail.name
+        transaction.on_commit(lambda: delete_media(name))
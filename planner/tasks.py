@@ -0,0 +1,31 @@
+"""
+Planner app background tasks.
+
+Tasks here are queued on demand with django_q.tasks.async_task.
+"""
+
+import logging
+
+from planner.images import generate_variants
+from planner.thumbnails import render_thumbnail
+
+logger = logging.getLogger(__name__)
+
+
+def generate_image_variants(model_label: str, pk: str) -> str:
+    """Queued by planner.signals whenever a catalog image is uploaded or replaced."""
+    record = generate_variants(model_label, pk)
+    if record is None:
+        return f"Variants for {model_label} {pk} are up to date."
+    count = sum(len(entries) for entries in record.get("variants", {}).values())
+    logger.info(f"Generated {count} image variants for {model_label} {pk}.")
+    return f"Generated {count} image variants for {model_label} {pk}."
+
+
+def render_garden_thumbnail(garden_id: str) -> str:
+    """Queued by planner.signals whenever a garden is saved."""
+    name = render_thumbnail(garden_id)
+    if name is None:
+        return f"Thumbnail for garden {garden_id} is up to date."
+    logger.info(f"Rendered thumbnail {name} for garden {garden_id}.")
+    return f"Rendered thumbnail {name} for garden {garden_id}."
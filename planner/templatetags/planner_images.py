@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from django import template
+from django.core.files.storage import default_storage
+from django.forms.utils import flatatt
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_image(image, variants: dict, sizes: str = "100vw", placeholder: str = "", **attrs):
+    """
+    Render a catalog image with its responsive variants (see planner.images).
+
+    Emits a <picture> with an AVIF and a WebP source, each carrying a ``srcset`` of every
+    width and the given ``sizes``, around an <img> of the original with its intrinsic
+    width and height. Images whose variants aren't generated yet render as a plain <img>.
+    A ``placeholder`` data URI is painted as the <img> background until the image loads.
+    Remaining keyword arguments become attributes of the <img>, e.g.
+    ``{% responsive_image plant.image plant.image_variants sizes="50vw" class="w-full" %}``.
+    """
+    if not image:
+        return ""
+
+    attrs = {"src": image.url, **attrs}
+    if placeholder:
+        background = f"background:center/cover no-repeat url({placeholder})"
+        attrs["style"] = ";".join(filter(None, (attrs.get("style"), background)))
+    if not variants or variants.get("source") != image.name:
+        return format_html("<img{}>", flatatt(attrs))
+
+    for dimension in ("width", "height"):
+        if attrs.get(dimension) is None:
+            attrs[dimension] = variants[dimension]
+    attrs.setdefault("decoding", "async")
+
+    sources = [
+        format_html(
+            '<source type="image/{}" srcset="{}" sizes="{}">',
+            fmt,
+            ", ".join(
+                f"{default_storage.url(entry['name'])} {entry['width']}w" for entry in entries
+            ),
+            sizes,
+        )
+        for fmt, entries in variants["variants"].items()
+        if entries
+    ]
+    # Every source was built with format_html, so the joined markup is already escaped
+    return format_html(
+        "<picture>{}<img{}></picture>", mark_safe("".join(sources)), flatatt(attrs)
+    )
@@ -0,0 +1,114 @@
+import pytest
+from django.core.cache import cache
+
+from account.models import User
+from planner.models import Color, Niche, Plant, PlantFeature
+from planner.positions import pack
+from planner.tests.test_gardens import _payload, _save
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def sample_user():
+    return User.objects.create_user(email="gardener@example.com", password="testpass123")
+
+
+@pytest.fixture
+def authenticated_client(client, sample_user):
+    client.force_login(sample_user)
+    return client
+
+
+@pytest.fixture
+def niche():
+    return Niche.objects.create(slug="groundcover", title="Groundcover")
+
+
+@pytest.fixture
+def colors():
+    return {
+        "purple": Color.objects.create(name="Purple", hex_code="#800080"),
+        "yellow": Color.objects.create(name="Yellow", hex_code="#FFFF00"),
+    }
+
+
+@pytest.fixture
+def features():
+    return {
+        "pollinator": PlantFeature.objects.create(name="Pollinator Magnet"),
+        "deer": PlantFeature.objects.create(name="Deer Resistant"),
+    }
+
+
+@pytest.fixture
+def plants(niche, colors, features):
+    bergamot = Plant.objects.create(
+        slug="wild-bergamot",
+        common_name="Wild Bergamot",
+        scientific_name="Monarda fistulosa",
+        sun=["full", "partial"],
+        bloom=["jun", "jul", "aug"],
+        height=3,
+        spread=2,
+        niche=niche,
+        notes="Minty leaves loved by bumblebees.",
+        link="https://example.com/bergamot",
+    )
+    bergamot.colors.add(colors["purple"])
+    bergamot.features.add(features["pollinator"], features["deer"])
+
+    susan = Plant.objects.create(
+        slug="brown-eyed-susan",
+        common_name="Brown-eyed Susan",
+        scientific_name="Rudbeckia triloba",
+        sun=["full"],
+        bloom=["jul", "aug", "sep"],
+        height=4,
+        spread=1.5,
+        notes="Short lived but reseeds freely.",
+    )
+    susan.colors.add(colors["yellow"])
+    susan.features.add(features["pollinator"])
+
+    ironweed = Plant.objects.create(
+        slug="ironweed",
+        common_name="Ironweed",
+        scientific_name="Vernonia fasciculata",
+        sun=["full", "partial"],
+        bloom=["aug", "sep"],
+        height=5,
+        spread=3,
+        native=False,
+    )
+    ironweed.colors.add(colors["purple"])
+
+    return {"bergamot": bergamot, "susan": susan, "ironweed": ironweed}
+
+
+@pytest.fixture
+def make_layout(plants, colors):
+    """Packed positions per plant/color combination, from {"bergamot"|"susan": [(x, y)]}."""
+    bergamot, susan = plants["bergamot"], plants["susan"]
+
+    def make(positions):
+        return {
+            (str(bergamot.id), str(colors["purple"].id)): pack(positions.get("bergamot", [])),
+            (str(susan.id), str(colors["yellow"].id)): pack(positions.get("susan", [])),
+        }
+
+    return make
+
+
+@pytest.fixture
+def saved_garden(authenticated_client, plants, colors):
+    """A garden saved through the API: its payload, with garden_id set, and its revision."""
+    data = _payload(plants, colors, {"bergamot": [(1, 1), (2, 2)], "susan": [(5, 5)]})
+    body = _save(authenticated_client, data).json()
+    data["garden_id"] = body["garden_id"]
+    return data, body["revision"]
@@ -0,0 +1,133 @@
+import json
+
+import pytest
+from django.urls import reverse
+
+from planner import catalog_index
+from planner.catalog_index import get_catalog_index
+from planner.models import Plant
+
+
+@pytest.fixture(autouse=True)
+def index_settings(settings, tmp_path):
+    settings.CATALOG_INDEX_ENABLED = True
+    settings.CATALOG_INDEX_DIR = str(tmp_path)
+    catalog_index._current = None
+    yield
+    catalog_index._current = None
+
+
+def _matches(filters):
+    index = get_catalog_index()
+    return [
+        Plant.objects.get(id=index.ids[position].ljust(16, b"\0").hex()).common_name
+        for position in index.match(filters)
+    ]
+
+
+def _expected(filters):
+    return list(
+        Plant.objects.apply_filters(filters)
+        .order_by("common_name", "id")
+        .values_list("common_name", flat=True)
+    )
+
+
+@pytest.mark.django_db
+class TestCatalogIndex:
+    """Test the bitmap index behind plant_list filtering."""
+
+    def test_filters_match_the_database(self, plants, niche, colors, features):
+        purple, yellow = colors["purple"], colors["yellow"]
+        pollinator, deer = features["pollinator"], features["deer"]
+        filter_sets = [
+            {},
+            {"niche": str(niche.id)},
+            {"niche": str(niche.id).upper()},
+            {"sun": ["partial"]},
+            {"sun": ["full", "shade"]},
+            {"bloom": ["sep"]},
+            {"bloom": ["may", "jun", "jul"]},
+            {"bloom": ["jul", "sep"], "bloomMatch": "all"},
+            {"native": True},
+            {"buyable": True},
+            {"heightMin": 2.0},
+            {"heightMax": 3.0, "spreadMin": 1.0},
+            {"colors": [str(purple.id)]},
+            {"colors": [str(purple.id), str(yellow.id)]},
+            {"features": [str(pollinator.id)]},
+            {"features": [str(pollinator.id), str(deer.id)]},
+            {"colors": [str(yellow.id)], "sun": ["partial"]},
+        ]
+
+        for filters in filter_sets:
+            assert _matches(filters) == _expected(filters), filters
+
+    def test_pages_forward_and_back(self, client):
+        Plant.objects.bulk_create(
+            Plant(
+                slug=f"aster-{n:02}",
+                common_name=f"Aster {n:02}",
+                scientific_name=f"Symphyotrichum {n:02}",
+            )
+            for n in range(60)
+        )
+        index = get_catalog_index()
+
+        first = index.page({}, None, 24)
+        assert first is not None
+        second = index.page({}, first.next_cursor, 24)
+        assert second is not None
+        third = index.page({}, second.next_cursor, 24)
+        assert third is not None
+        back = index.page({}, third.previous_cursor, 24)
+        assert back is not None
+
+        assert first.count == 60
+        assert [p.common_name for p in first][:2] == ["Aster 00", "Aster 01"]
+        assert second.object_list[0].common_name == "Aster 24"
+        assert len(third) == 12
+        assert not third.has_next()
+        assert [p.id for p in back] == [p.id for p in second]
+
+    def test_snapshot_follows_catalog_version(self, plants, django_capture_on_commit_callbacks):
+        first = get_catalog_index()
+        assert get_catalog_index() is first
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Plant.objects.create(slug="aster", common_name="Aster", scientific_name="Aster")
+
+        second = get_catalog_index()
+        assert second.version != first.version
+        assert second.size == first.size + 1
+
+    def test_build_keeps_newer_snapshots(self, plants, tmp_path):
+        # A slower builder of an older version finishes after a newer snapshot was written
+        catalog_index.CatalogIndex.build(5, tmp_path / "catalog-5.idx")
+        catalog_index.CatalogIndex.build(7, tmp_path / "catalog-7.idx")
+        catalog_index.CatalogIndex.build(6, tmp_path / "catalog-6.idx")
+
+        assert sorted(path.name for path in tmp_path.glob("catalog-*.idx")) == [
+            "catalog-6.idx",
+            "catalog-7.idx",
+        ]
+
+    def test_plant_list_uses_index(self, client, plants, colors, django_assert_num_queries):
+        purple = colors["purple"]
+        get_catalog_index()
+        params = {"filters": json.dumps({"colors": [str(purple.id)], "sun": "partial"})}
+
+        # Hydrating the page and its colors and features, no filtering or COUNT
+        with django_assert_num_queries(3):
+            response = client.get(reverse("plant_list"), params)
+
+        page = response.context["page_obj"]
+        assert [p.common_name for p in page] == ["Ironweed", "Wild Bergamot"]
+        assert page.count == 2
+
+    def test_search_uses_the_database(self, client, plants):
+        response = client.get(
+            reverse("plant_list"), {"filters": json.dumps({"search": "bergam"})}
+        )
+
+        assert [p.common_name for p in response.context["plants"]] == ["Wild Bergamot"]
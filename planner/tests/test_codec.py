@@ -0,0 +1,81 @@
+import json
+
+import msgpack
+import pytest
+from django.urls import reverse
+
+from planner import codec
+from planner.models import Garden
+
+
+@pytest.mark.django_db
+class TestCodec:
+    """Test request parsing and content negotiation of the planner API."""
+
+    def test_model_values_are_serialized_natively(self, authenticated_client, sample_user):
+        garden = Garden.objects.create(user=sample_user, name="Mine", width=5, length=5)
+
+        response = authenticated_client.get(reverse("garden_list"))
+
+        assert response["Content-Type"] == codec.JSON
+        assert response.json()["gardens"] == [
+            {
+                "id": str(garden.id),
+                "name": "Mine",
+                "created_at": garden.created_at.isoformat(),
+                "plant_count": 0,
+                "position_count": 0,
+                "thumbnail_url": None,
+            }
+        ]
+
+    def test_invalid_json_is_rejected(self, authenticated_client):
+        response = authenticated_client.post(
+            reverse("garden_save"), b"{nope", content_type="application/json"
+        )
+
+        assert response.status_code == 400
+        assert response.json()["error"].startswith("Invalid JSON")
+
+    def test_browsers_get_json(self, authenticated_client):
+        response = authenticated_client.get(reverse("garden_list"), headers={"Accept": "*/*"})
+
+        assert response["Content-Type"] == codec.JSON
+        assert "Accept" in response["Vary"]
+
+
+@pytest.mark.django_db
+class TestMessagePack:
+    """Test MessagePack bodies."""
+
+    def test_save_and_load(self, authenticated_client, plants, colors):
+        body = {
+            "name": "Packed",
+            "width": 10,
+            "length": 5,
+            "plants": [
+                {
+                    "plant_id": str(plants["susan"].id),
+                    "color_id": str(colors["yellow"].id),
+                    "positions": [{"x": 1.5, "y": 2}],
+                }
+            ],
+        }
+        saved = authenticated_client.post(
+            reverse("garden_save"),
+            msgpack.packb(body),
+            content_type=codec.MSGPACK,
+            headers={"Accept": codec.MSGPACK},
+        )
+        garden_id = msgpack.unpackb(saved.content)["garden_id"]
+
+        loaded = authenticated_client.get(
+            reverse("garden_load", args=[garden_id]), headers={"Accept": codec.MSGPACK}
+        )
+
+        assert loaded["Content-Type"] == codec.MSGPACK
+        document = msgpack.unpackb(loaded.content)
+        assert document["plants"][0]["positions"] == [{"x": 1.5, "y": 2.0}]
+        as_json = authenticated_client.get(reverse("garden_load", args=[garden_id]))
+        assert as_json["ETag"] != loaded["ETag"]
+        assert json.loads(as_json.content) == document
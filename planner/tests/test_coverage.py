@@ -0,0 +1,135 @@
+import base64
+import json
+import random
+
+import numpy as np
+import pytest
+from django.urls import reverse
+
+from planner.coverage import rasterize
+from planner.positions import pack, unpack
+from planner.tests.test_gardens import _payload, _save
+
+
+def _brute_force(width, length, resolution, circles):
+    rows, columns = int(np.ceil(length / resolution)), int(np.ceil(width / resolution))
+    counts = np.zeros((rows, columns), dtype=int)
+    for row in range(rows):
+        for column in range(columns):
+            cx, cy = (column + 0.5) * resolution, (row + 0.5) * resolution
+            counts[row, column] = sum(
+                (cx - x) ** 2 + (cy - y) ** 2 <= radius**2 for x, y, radius in circles
+            )
+    return counts
+
+
+@pytest.mark.django_db
+class TestRasterize:
+    """Test rasterizing spread circles into a coverage grid."""
+
+    def test_single_plant(self, make_layout):
+        # Bergamot is 2 ft wide
+        coverage = rasterize(10, 10, make_layout({"bergamot": [(5, 5)]}), 0.25)
+
+        covered = np.count_nonzero(coverage.counts)
+        assert covered == np.count_nonzero(_brute_force(10, 10, 0.25, [(5, 5, 1)]))
+        assert covered == pytest.approx(np.pi / 0.25**2, rel=0.05)
+        data = coverage.as_dict()
+        assert data["bare_ratio"] == 1 - covered / 1600
+        assert data["overlap_ratio"] == 0
+        assert data["hotspots"] == []
+
+    # numpy warns when a float doesn't fit the integer it is cast to
+    @pytest.mark.filterwarnings("error::RuntimeWarning")
+    def test_far_out_of_bounds_positions(self, make_layout):
+        far = float(np.float32(1e30))
+        layout = make_layout({"bergamot": [(5, 5), (far, 5), (-far, -far)], "susan": [(5, far)]})
+
+        coverage = rasterize(10, 10, layout, 0.25)
+
+        np.testing.assert_array_equal(coverage.counts, _brute_force(10, 10, 0.25, [(5, 5, 1)]))
+
+    def test_matches_brute_force(self, make_layout):
+        rng = random.Random(5)
+        positions = {
+            name: [(rng.uniform(-1, 9), rng.uniform(-1, 6)) for _ in range(15)]
+            for name in ("bergamot", "susan")
+        }
+        radius = {"bergamot": 1, "susan": 0.75}
+        circles = [
+            (x, y, radius[name])
+            for name, points in positions.items()
+            for x, y in unpack(pack(points))
+        ]
+
+        coverage = rasterize(8, 5, make_layout(positions), 0.2)
+
+        np.testing.assert_array_equal(coverage.counts, _brute_force(8, 5, 0.2, circles))
+
+    def test_overlap_and_bloom(self, make_layout):
+        layout = make_layout({"bergamot": [(2, 2)], "susan": [(2.5, 2)]})
+
+        data = rasterize(10, 4, layout, 0.25).as_dict()
+
+        assert data["max_overlap"] == 2
+        assert 0 < data["overlap_ratio"] < 1 - data["bare_ratio"]
+        (hotspot, *_) = data["hotspots"]
+        assert hotspot["max_overlap"] == 2
+        assert hotspot["x"] <= 2.5 <= hotspot["x"] + hotspot["width"]
+        bloom = {month["month"]: month["ratio"] for month in data["bloom"]}
+        # Bergamot blooms June to August, susan July to September
+        assert bloom["jan"] == 0
+        assert 0 < bloom["jun"] < bloom["jul"]
+        assert bloom["jul"] == pytest.approx(1 - data["bare_ratio"])
+        assert 0 < bloom["sep"] < bloom["aug"]
+
+    def test_too_many_cells(self, plants, colors, settings):
+        with pytest.raises(ValueError):
+            rasterize(1000, 1000, {}, 0.1)
+        with pytest.raises(ValueError):
+            rasterize(10, 10, {}, 0)
+
+
+@pytest.mark.django_db
+class TestCoverageViews:
+    """Test the coverage endpoints for saved and unsaved gardens."""
+
+    def test_unsaved_garden(self, client, plants, colors):
+        data = _payload(plants, colors, {"bergamot": [(5, 5)], "susan": [(10, 5)]})
+
+        response = client.post(
+            reverse("garden_coverage") + "?resolution=0.5&raster=1",
+            json.dumps(data),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert (body["columns"], body["rows"]) == (40, 20)
+        raster = np.frombuffer(base64.b64decode(body["raster"]), dtype=np.uint8)
+        assert raster.size == 800
+        assert np.count_nonzero(raster) == round((1 - body["bare_ratio"]) * 800)
+
+    def test_saved_garden(self, authenticated_client, plants, colors):
+        data = _payload(plants, colors, {"bergamot": [(5, 5)], "susan": [(10, 5)]})
+        garden_id = _save(authenticated_client, data).json()["garden_id"]
+        unsaved = authenticated_client.post(
+            reverse("garden_coverage"), json.dumps(data), content_type="application/json"
+        )
+
+        response = authenticated_client.get(reverse("garden_coverage_load", args=[garden_id]))
+
+        assert response.status_code == 200
+        assert response.json() == unsaved.json()
+
+    @pytest.mark.parametrize("resolution", ["0", "nan", "abc", "0.001"])
+    def test_invalid_resolution(self, client, plants, colors, resolution):
+        data = _payload(plants, colors, {"bergamot": [(5, 5)]})
+
+        response = client.post(
+            reverse("garden_coverage") + f"?resolution={resolution}",
+            json.dumps(data),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 400
@@ -0,0 +1,119 @@
+import json
+
+import pytest
+from django.urls import reverse
+
+from planner.fill import FillSelection, fill_layout
+from planner.layout import validate_layout
+from planner.models import Plant
+from planner.positions import pack
+
+
+def _selections(colors, bergamot=None, susan=None):
+    """Bergamot is 2 ft wide and susan 1.5 ft, quantities or ratios as dicts."""
+    return [
+        FillSelection(str(Plant.objects.get(slug=slug).id), str(colors[color].id), **args)
+        for slug, color, args in (
+            ("wild-bergamot", "purple", bergamot),
+            ("brown-eyed-susan", "yellow", susan),
+        )
+        if args is not None
+    ]
+
+
+def _validate(width, length, drifts):
+    layout = {
+        (drift.selection.plant_id, drift.selection.color_id): pack(drift.positions.tolist())
+        for drift in drifts
+    }
+    return validate_layout(width, length, layout)
+
+
+@pytest.mark.django_db
+class TestFillLayout:
+    """Test hex packing chosen plants into a garden."""
+
+    @pytest.mark.parametrize("width, length", [(40, 20), (20, 40), (14.3, 9.1)])
+    def test_quantities_fit_without_overlap(self, plants, colors, width, length):
+        selections = _selections(colors, {"quantity": 12}, {"quantity": 20})
+
+        drifts = fill_layout(width, length, selections)
+
+        assert [len(drift.positions) for drift in drifts] == [12, 20]
+        assert all(drift.capacity >= 12 for drift in drifts)
+        assert _validate(width, length, drifts).valid
+
+    def test_ratios_fill_the_rest(self, plants, colors):
+        selections = _selections(colors, {"quantity": 10}, {"ratio": 1})
+
+        bergamot, susan = fill_layout(40, 20, selections)
+
+        assert len(bergamot.positions) == 10
+        # Susans fill the remaining 40 x 20 ft at 1.5 ft spacing, ~1.95 ft^2 each
+        assert len(susan.positions) == susan.capacity > 300
+        assert _validate(40, 20, [bergamot, susan]).valid
+
+    def test_overbooked_garden_falls_short(self, plants, colors):
+        selections = _selections(colors, {"quantity": 100}, {"quantity": 100})
+
+        drifts = fill_layout(10, 10, selections)
+
+        placed = [len(drift.positions) for drift in drifts]
+        assert all(0 < count < 100 for count in placed)
+        assert placed == [drift.capacity for drift in drifts]
+        assert _validate(10, 10, drifts).valid
+
+    def test_too_small_for_a_plant(self, plants, colors):
+        (drift,) = fill_layout(1, 10, _selections(colors, {"quantity": 3}))
+
+        assert drift.capacity == 0
+        assert len(drift.positions) == 0
+
+
+@pytest.mark.django_db
+class TestFillGardenView:
+    """Test the garden fill endpoint."""
+
+    def _post(self, client, data):
+        return client.post(
+            reverse("garden_fill"), json.dumps(data), content_type="application/json"
+        )
+
+    def test_fills(self, client, plants, colors):
+        selection = {
+            "plant_id": str(Plant.objects.get(slug="wild-bergamot").id),
+            "color_id": str(colors["purple"].id),
+        }
+
+        response = self._post(
+            client, {"width": 40, "length": 20, "plants": [{**selection, "quantity": 5}]}
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["placed"] == 5
+        (plant,) = body["plants"]
+        assert plant["requested"] == plant["placed"] == 5
+        assert plant["positions"][0] == {"x": 1.0, "y": 1.0}
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {"width": 40, "length": 20, "plants": []},
+            {"width": 0, "length": 20, "plants": [{"plant_id": "x", "color_id": "y"}]},
+            {"width": 40, "plants": []},
+        ],
+    )
+    def test_invalid_data(self, client, data):
+        assert self._post(client, data).status_code == 400
+
+    def test_too_many_positions(self, client, plants, colors, settings):
+        settings.GARDEN_MAX_POSITIONS = 100
+        selection = {
+            "plant_id": str(Plant.objects.get(slug="wild-bergamot").id),
+            "color_id": str(colors["purple"].id),
+        }
+
+        response = self._post(client, {"width": 400, "length": 200, "plants": [selection]})
+
+        assert response.status_code == 400
@@ -0,0 +1,826 @@
+import json
+import math
+
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from account.models import User
+from planner.catalog import get_catalog_version
+from planner.documents import garden_document
+from planner.gardens import parse_plants, recount_gardens, save_garden_plants
+from planner.models import Garden, GardenPlant, Niche, Plant
+from planner.positions import POSITION_SIZE, pack, quantize
+
+
+def _payload(plants, colors, positions, garden_id=None):
+    bergamot = Plant.objects.get(slug="wild-bergamot")
+    susan = Plant.objects.get(slug="brown-eyed-susan")
+    data = {
+        "name": "Front Yard",
+        "width": 20,
+        "length": 10,
+        "plants": [
+            {
+                "plant_id": str(bergamot.id),
+                "color_id": str(colors["purple"].id),
+                "positions": [{"x": x, "y": y} for x, y in positions.get("bergamot", [])],
+            },
+            {
+                "plant_id": str(susan.id),
+                "color_id": str(colors["yellow"].id),
+                "positions": [{"x": x, "y": y} for x, y in positions.get("susan", [])],
+            },
+        ],
+    }
+    if garden_id:
+        data["garden_id"] = garden_id
+    data["plants"] = [entry for entry in data["plants"] if entry["positions"]]
+    return data
+
+
+def _save(client, data):
+    return client.post(reverse("garden_save"), json.dumps(data), content_type="application/json")
+
+
+def _stored(garden_id):
+    return sorted(
+        (garden_plant.plant.slug, x, y)
+        for garden_plant in GardenPlant.objects.filter(garden_id=garden_id).select_related(
+            "plant"
+        )
+        for x, y in garden_plant.positions
+    )
+
+
+@pytest.mark.django_db
+class TestSaveGarden:
+    """Test the bulk, diff-based garden save."""
+
+    def test_creates_garden(self, authenticated_client, plants, colors):
+        data = _payload(plants, colors, {"bergamot": [(1, 1), (2.5, 1)], "susan": [(4, 4)]})
+
+        response = _save(authenticated_client, data)
+
+        assert response.status_code == 200
+        garden_id = response.json()["garden_id"]
+        assert _stored(garden_id) == [
+            ("brown-eyed-susan", 4.0, 4.0),
+            ("wild-bergamot", 1.0, 1.0),
+            ("wild-bergamot", 2.5, 1.0),
+        ]
+
+    def test_only_changed_plants_are_rewritten(self, authenticated_client, plants, colors):
+        positions = {"bergamot": [(x, 1) for x in range(50)], "susan": [(1, 5), (1, 5)]}
+        garden_id = _save(authenticated_client, _payload(plants, colors, positions)).json()[
+            "garden_id"
+        ]
+        susan = GardenPlant.objects.get(plant__slug="brown-eyed-susan")
+
+        positions["bergamot"][0] = (0, 9)
+        with CaptureQueriesContext(connection) as queries:
+            response = _save(
+                authenticated_client, _payload(plants, colors, positions, garden_id=garden_id)
+            )
+
+        assert response.status_code == 200
+        stored = _stored(garden_id)
+        assert ("wild-bergamot", 0.0, 9.0) in stored
+        assert len(stored) == 52
+        position_writes = [
+            q for q in queries if q["sql"].startswith('UPDATE "planner_gardenplant"')
+        ]
+        assert len(position_writes) == 1
+        assert GardenPlant.objects.get(id=susan.id).updated_at == susan.updated_at
+
+    def test_positions_keep_their_order(self, authenticated_client, plants, colors):
+        points = [(3, 1), (1, 2), (2, 0.5)]
+        garden_id = _save(authenticated_client, _payload(plants, colors, {"bergamot": points}))
+
+        garden_plant = GardenPlant.objects.get(garden_id=garden_id.json()["garden_id"])
+        assert garden_plant.positions == points
+        assert garden_plant.quantity == 3
+        assert len(bytes(garden_plant.position_data)) == 3 * POSITION_SIZE
+
+    def test_query_count_does_not_grow_with_positions(self, authenticated_client, plants, colors):
+        def save_queries(count):
+            data = _payload(plants, colors, {"bergamot": [(x, 0) for x in range(count)]})
+            with CaptureQueriesContext(connection) as queries:
+                assert _save(authenticated_client, data).status_code == 200
+            return len(queries)
+
+        assert save_queries(5) == save_queries(500)
+
+    def test_removed_plants_are_hard_deleted(self, authenticated_client, plants, colors):
+        positions = {"bergamot": [(1, 1)], "susan": [(2, 2)]}
+        garden_id = _save(authenticated_client, _payload(plants, colors, positions)).json()[
+            "garden_id"
+        ]
+
+        del positions["susan"]
+        _save(authenticated_client, _payload(plants, colors, positions, garden_id=garden_id))
+
+        assert GardenPlant.all_objects.filter(garden_id=garden_id).count() == 1
+
+    def test_readding_soft_deleted_plant(self, sample_user, plants, colors):
+        garden = Garden.objects.create(user=sample_user, name="Old", width=5, length=5)
+        bergamot = Plant.objects.get(slug="wild-bergamot")
+        legacy = GardenPlant.objects.create(
+            garden=garden,
+            plant=bergamot,
+            color=colors["purple"],
+            position_data=pack([(1, 1)]),
+        )
+        legacy.delete()
+
+        plants_data = parse_plants(
+            [
+                {
+                    "plant_id": str(bergamot.id),
+                    "color_id": str(colors["purple"].id),
+                    "positions": [{"x": 1, "y": 1}],
+                }
+            ]
+        )
+        result = save_garden_plants(garden, plants_data)
+
+        assert (result.plants_deleted, result.plants_created) == (1, 1)
+        assert GardenPlant.all_objects.filter(garden=garden).count() == 1
+        assert _stored(garden.id) == [("wild-bergamot", 1.0, 1.0)]
+
+    def test_coordinates_are_stored_as_float32(self, authenticated_client, plants, colors):
+        data = _payload(plants, colors, {"bergamot": [(0.1, 1 / 3)]})
+        garden_id = _save(authenticated_client, data).json()["garden_id"]
+
+        # The planner's float64 coordinates address the stored float32 ones
+        ((_, x, y),) = _stored(garden_id)
+        assert (x, y) == (quantize(0.1), quantize(1 / 3))
+        assert _save(authenticated_client, {**data, "garden_id": garden_id}).json()["unchanged"]
+
+    def test_unknown_plant_is_rejected(self, authenticated_client, plants, colors):
+        data = _payload(plants, colors, {"bergamot": [(1, 1)]})
+        data["plants"][0]["plant_id"] = "00000000-0000-0000-0000-000000000000"
+
+        response = _save(authenticated_client, data)
+
+        assert response.status_code == 400
+        assert not Garden.objects.exists()
+
+    @pytest.mark.parametrize("bad", ["not-a-uuid", None])
+    def test_malformed_ids_are_rejected(self, authenticated_client, plants, colors, bad):
+        data = _payload(plants, colors, {"bergamot": [(1, 1)]})
+        data["plants"][0]["color_id"] = bad
+
+        assert _save(authenticated_client, data).status_code == 400
+
+    def test_non_finite_coordinates_are_rejected(self, authenticated_client, plants, colors):
+        data = _payload(plants, colors, {"bergamot": [(1, 1)]})
+        data["plants"][0]["positions"][0]["x"] = "nan"
+
+        assert _save(authenticated_client, data).status_code == 400
+
+
+def _sync(client, garden_id, revision, ops):
+    return client.post(
+        reverse("garden_sync"),
+        json.dumps({"garden_id": garden_id, "revision": revision, "ops": ops}),
+        content_type="application/json",
+    )
+
+
+@pytest.mark.django_db
+class TestSyncGarden:
+    """Test incremental garden sync operations."""
+
+    @pytest.fixture
+    def saved(self, saved_garden):
+        data, revision = saved_garden
+        bergamot = data["plants"][0]
+        return {
+            "garden_id": data["garden_id"],
+            "revision": revision,
+            "bergamot": {"plant_id": bergamot["plant_id"], "color_id": bergamot["color_id"]},
+        }
+
+    def test_applies_operations_in_order(self, authenticated_client, saved, colors):
+        ironweed = Plant.objects.get(slug="ironweed")
+        new_plant = {"plant_id": str(ironweed.id), "color_id": str(colors["purple"].id)}
+        ops = [
+            {"op": "move", **saved["bergamot"], "from": {"x": 1, "y": 1}, "to": {"x": 3, "y": 1}},
+            {"op": "remove", **saved["bergamot"], "from": {"x": 2, "y": 2}},
+            {"op": "add_plant", **new_plant},
+            {"op": "add", **new_plant, "to": {"x": 7, "y": 2}},
+            {"op": "move", **new_plant, "from": {"x": 7, "y": 2}, "to": {"x": 8, "y": 2}},
+            {"op": "set", "name": "Back Yard", "width": 30},
+        ]
+
+        response = _sync(authenticated_client, saved["garden_id"], saved["revision"], ops)
+
+        assert response.status_code == 200
+        assert response.json()["revision"] == saved["revision"] + 1
+        assert _stored(saved["garden_id"]) == [
+            ("brown-eyed-susan", 5.0, 5.0),
+            ("ironweed", 8.0, 2.0),
+            ("wild-bergamot", 3.0, 1.0),
+        ]
+        garden = Garden.objects.get(id=saved["garden_id"])
+        assert (garden.name, garden.width, garden.length) == ("Back Yard", 30.0, 10.0)
+
+    def test_position_limit(self, authenticated_client, saved, settings):
+        settings.GARDEN_MAX_POSITIONS = 4
+        ops = [
+            {"op": "add", **saved["bergamot"], "to": {"x": 4, "y": 4}},
+            {"op": "add", **saved["bergamot"], "to": {"x": 6, "y": 6}},
+        ]
+
+        response = _sync(authenticated_client, saved["garden_id"], saved["revision"], ops)
+
+        assert response.status_code == 400
+        assert "4 positions" in response.json()["error"]
+        assert len(_stored(saved["garden_id"])) == 3
+        # Up to the limit is fine
+        response = _sync(authenticated_client, saved["garden_id"], saved["revision"], ops[:1])
+        assert response.status_code == 200
+
+    def test_plant_limit(self, authenticated_client, saved, colors, settings):
+        settings.GARDEN_MAX_PLANTS = 2
+        ironweed = Plant.objects.get(slug="ironweed")
+        new_plant = {"plant_id": str(ironweed.id), "color_id": str(colors["purple"].id)}
+
+        response = _sync(
+            authenticated_client,
+            saved["garden_id"],
+            saved["revision"],
+            [
+                {"op": "add_plant", **new_plant},
+                {"op": "add", **new_plant, "to": {"x": 1, "y": 9}},
+            ],
+        )
+
+        assert response.status_code == 400
+        assert Garden.objects.get(id=saved["garden_id"]).plant_count == 2
+
+    def test_only_touched_plants_are_read(self, authenticated_client, saved):
+        ops = [{"op": "add", **saved["bergamot"], "to": {"x": 4, "y": 4}}]
+
+        with CaptureQueriesContext(connection) as queries:
+            _sync(authenticated_client, saved["garden_id"], saved["revision"], ops)
+
+        position_reads = [
+            q["sql"] for q in queries if q["sql"].startswith("SELECT") and "position" in q["sql"]
+        ]
+        assert position_reads
+        susan = Plant.objects.get(slug="brown-eyed-susan")
+        assert all(susan.id.hex not in sql.replace("-", "") for sql in position_reads)
+
+    def test_remove_plant(self, authenticated_client, saved):
+        ops = [{"op": "remove_plant", **saved["bergamot"]}]
+
+        _sync(authenticated_client, saved["garden_id"], saved["revision"], ops)
+
+        assert _stored(saved["garden_id"]) == [("brown-eyed-susan", 5.0, 5.0)]
+        assert GardenPlant.all_objects.filter(garden_id=saved["garden_id"]).count() == 1
+
+    def test_stale_revision_conflicts(self, authenticated_client, saved):
+        ops = [{"op": "remove", **saved["bergamot"], "from": {"x": 1, "y": 1}}]
+
+        response = _sync(authenticated_client, saved["garden_id"], saved["revision"] - 1, ops)
+
+        assert response.status_code == 409
+        assert response.json()["revision"] == saved["revision"]
+        assert len(_stored(saved["garden_id"])) == 3
+
+    def test_full_save_bumps_revision(self, authenticated_client, saved, plants, colors):
+        data = _payload(plants, colors, {"bergamot": [(1, 1)]}, garden_id=saved["garden_id"])
+
+        response = _save(authenticated_client, data)
+
+        assert response.json()["revision"] == saved["revision"] + 1
+
+    @pytest.mark.parametrize(
+        "op",
+        [
+            {"op": "remove", "from": {"x": 9, "y": 9}},
+            {"op": "move", "from": {"x": 1, "y": 1}},
+            {"op": "add_plant"},
+            {"op": "teleport"},
+        ],
+    )
+    def test_invalid_operation_applies_nothing(self, authenticated_client, saved, op):
+        ops = [
+            {"op": "remove", **saved["bergamot"], "from": {"x": 1, "y": 1}},
+            {**saved["bergamot"], **op},
+        ]
+
+        response = _sync(authenticated_client, saved["garden_id"], saved["revision"], ops)
+
+        assert response.status_code == 400
+        assert response.json()["error"].startswith("Invalid data: Operation 1:")
+        assert len(_stored(saved["garden_id"])) == 3
+        assert Garden.objects.get(id=saved["garden_id"]).revision == saved["revision"]
+
+    def test_other_users_garden_is_not_found(self, client, saved):
+        other = User.objects.create_user(email="other@example.com", password="testpass123")
+        client.force_login(other)
+
+        response = _sync(client, saved["garden_id"], saved["revision"], [])
+
+        assert response.status_code == 404
+
+
+def _writes(queries):
+    return [
+        q["sql"] for q in queries if q["sql"].split(" ", 1)[0] in ("INSERT", "UPDATE", "DELETE")
+    ]
+
+
+@pytest.mark.django_db
+class TestGardenConcurrency:
+    """Test no-op detection and If-Match revision checks."""
+
+    def test_identical_save_writes_nothing(self, authenticated_client, saved_garden):
+        data, revision = saved_garden
+        # Same layout, different order
+        data["plants"][0]["positions"].reverse()
+        data["plants"].reverse()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = _save(authenticated_client, data)
+
+        assert response.json() == {
+            "success": True,
+            "garden_id": data["garden_id"],
+            "revision": revision,
+            "unchanged": True,
+        }
+        assert response["ETag"] == f'"{revision}"'
+        assert not _writes(queries)
+
+    def test_changed_save_bumps_revision(self, authenticated_client, saved_garden):
+        data, revision = saved_garden
+        data["description"] = "Now with a path"
+
+        response = _save(authenticated_client, data)
+
+        assert response.json()["unchanged"] is False
+        assert response.json()["revision"] == revision + 1
+
+    def test_stale_if_match_conflicts(self, authenticated_client, saved_garden):
+        data, revision = saved_garden
+        data["plants"][0]["positions"] = [{"x": 9, "y": 9}]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.post(
+                reverse("garden_save"),
+                json.dumps(data),
+                content_type="application/json",
+                headers={"If-Match": f'"{revision - 1}"'},
+            )
+
+        assert response.status_code == 409
+        assert response.json()["revision"] == revision
+        assert not _writes(queries)
+        assert ("wild-bergamot", 9.0, 9.0) not in _stored(data["garden_id"])
+
+    def test_current_if_match_saves(self, authenticated_client, saved_garden):
+        data, revision = saved_garden
+        data["plants"][0]["positions"] = [{"x": 9, "y": 9}]
+
+        response = authenticated_client.post(
+            reverse("garden_save"),
+            json.dumps(data),
+            content_type="application/json",
+            headers={"If-Match": f'"{revision}"'},
+        )
+
+        assert response.status_code == 200
+        assert ("wild-bergamot", 9.0, 9.0) in _stored(data["garden_id"])
+
+    def test_sync_keeps_hash_in_step(self, authenticated_client, saved_garden):
+        data, revision = saved_garden
+        bergamot = {k: data["plants"][0][k] for k in ("plant_id", "color_id")}
+        ops = [
+            {"op": "move", **bergamot, "from": {"x": 1, "y": 1}, "to": {"x": 4, "y": 1}},
+            {"op": "set", "name": "Renamed"},
+        ]
+        revision = _sync(authenticated_client, data["garden_id"], revision, ops).json()[
+            "revision"
+        ]
+
+        data["name"] = "Renamed"
+        data["plants"][0]["positions"][0] = {"x": 4, "y": 1}
+        response = _save(authenticated_client, data)
+
+        assert response.json()["unchanged"] is True
+        assert response.json()["revision"] == revision
+
+    def test_sync_that_cancels_out_is_a_no_op(self, authenticated_client, saved_garden):
+        data, revision = saved_garden
+        bergamot = {k: data["plants"][0][k] for k in ("plant_id", "color_id")}
+        ops = [
+            {"op": "move", **bergamot, "from": {"x": 1, "y": 1}, "to": {"x": 4, "y": 1}},
+            {"op": "move", **bergamot, "from": {"x": 4, "y": 1}, "to": {"x": 1, "y": 1}},
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = _sync(authenticated_client, data["garden_id"], revision, ops)
+
+        assert response.json()["unchanged"] is True
+        assert response.json()["revision"] == revision
+        assert not _writes(queries)
+
+    def test_sync_accepts_if_match(self, authenticated_client, saved_garden):
+        data, revision = saved_garden
+        response = authenticated_client.post(
+            reverse("garden_sync"),
+            json.dumps({"garden_id": data["garden_id"], "ops": [{"op": "set", "name": "X"}]}),
+            content_type="application/json",
+            headers={"If-Match": f'"{revision - 1}"'},
+        )
+
+        assert response.status_code == 409
+
+
+@pytest.mark.django_db
+class TestLoadGarden:
+    """Test the garden document assembled by Postgres."""
+
+    def test_matches_orm_document(self, authenticated_client, plants, colors):
+        # Subnormal, negative zero and large float32 values all decode exactly
+        positions = {"bergamot": [(1, 1), (0.1, -0.0), (1e-40, 3e38)], "susan": [(5, -2.75)]}
+        garden_id = _save(authenticated_client, _payload(plants, colors, positions)).json()[
+            "garden_id"
+        ]
+
+        response = authenticated_client.get(reverse("garden_load", args=[garden_id]))
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/json"
+        garden = Garden.objects.get(id=garden_id)
+        assert response.json() == garden_document(garden)
+        assert response["ETag"] == f'"{garden.revision}-{get_catalog_version()}"'
+
+    def test_empty_garden(self, authenticated_client, sample_user):
+        garden = Garden.objects.create(user=sample_user, name="Empty", width=5, length=5)
+
+        response = authenticated_client.get(reverse("garden_load", args=[garden.id]))
+
+        assert response.json()["plants"] == []
+
+    def test_other_users_garden_is_not_found(self, client, sample_user):
+        garden = Garden.objects.create(user=sample_user, name="Mine", width=5, length=5)
+        client.force_login(User.objects.create_user(email="other@example.com", password="x"))
+
+        response = client.get(reverse("garden_load", args=[garden.id]))
+
+        assert response.status_code == 404
+
+
+def _garden_queries(queries):
+    return [q["sql"] for q in queries.captured_queries if "planner_garden" in q["sql"]]
+
+
+@pytest.mark.django_db
+class TestGardenCache:
+    """Test conditional requests and the per-user cache of load_garden and list_gardens."""
+
+    @pytest.fixture
+    def garden_id(self, authenticated_client, plants, colors):
+        data = _payload(plants, colors, {"bergamot": [(1, 1)]})
+        return _save(authenticated_client, data).json()["garden_id"]
+
+    @pytest.mark.parametrize("url_name", ["garden_load", "garden_list"])
+    def test_repeat_request_served_from_cache(self, authenticated_client, garden_id, url_name):
+        url = reverse(url_name, args=[garden_id] if url_name == "garden_load" else [])
+        first = authenticated_client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            second = authenticated_client.get(url)
+
+        assert not _garden_queries(queries)
+        assert second.content == first.content
+        assert second["ETag"] == first["ETag"]
+        assert second["Last-Modified"] == first["Last-Modified"]
+
+    @pytest.mark.parametrize("url_name", ["garden_load", "garden_list"])
+    def test_matching_etag_is_not_modified(self, authenticated_client, garden_id, url_name):
+        url = reverse(url_name, args=[garden_id] if url_name == "garden_load" else [])
+        etag = authenticated_client.get(url)["ETag"]
+
+        response = authenticated_client.get(url, headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+
+    def test_save_invalidates(
+        self, authenticated_client, garden_id, plants, colors, django_capture_on_commit_callbacks
+    ):
+        load_url = reverse("garden_load", args=[garden_id])
+        etag = authenticated_client.get(load_url)["ETag"]
+        authenticated_client.get(reverse("garden_list"))
+        data = _payload(plants, colors, {"bergamot": [(1, 1)]}, garden_id=garden_id)
+        data["name"] = "Back Yard"
+
+        with django_capture_on_commit_callbacks(execute=True):
+            _save(authenticated_client, data)
+
+        response = authenticated_client.get(load_url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["name"] == "Back Yard"
+        gardens = authenticated_client.get(reverse("garden_list")).json()["gardens"]
+        assert [garden["name"] for garden in gardens] == ["Back Yard"]
+
+    def test_catalog_change_invalidates(
+        self, authenticated_client, garden_id, django_capture_on_commit_callbacks
+    ):
+        load_url = reverse("garden_load", args=[garden_id])
+        etag = authenticated_client.get(load_url)["ETag"]
+        niche = Niche.objects.create(slug="border", title="Border")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            bergamot = Plant.objects.get(slug="wild-bergamot")
+            bergamot.niche = niche
+            bergamot.save()
+
+        response = authenticated_client.get(load_url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["plants"][0]["niche_id"] == str(niche.id)
+
+    def test_load_etag_is_accepted_as_if_match(
+        self, authenticated_client, garden_id, plants, colors
+    ):
+        etag = authenticated_client.get(reverse("garden_load", args=[garden_id]))["ETag"]
+        data = _payload(plants, colors, {"bergamot": [(2, 2)]}, garden_id=garden_id)
+
+        response = authenticated_client.post(
+            reverse("garden_save"),
+            json.dumps(data),
+            content_type="application/json",
+            headers={"If-Match": etag},
+        )
+
+        assert response.status_code == 200
+
+    def test_invalidated_entry_is_not_refilled_right_away(
+        self, authenticated_client, garden_id, django_capture_on_commit_callbacks
+    ):
+        load_url = reverse("garden_load", args=[garden_id])
+        authenticated_client.get(load_url)
+        with django_capture_on_commit_callbacks(execute=True):
+            Garden.objects.get(id=garden_id).save()
+
+        authenticated_client.get(load_url)
+        with CaptureQueriesContext(connection) as queries:
+            authenticated_client.get(load_url)
+
+        assert _garden_queries(queries)
+
+
+@pytest.mark.django_db
+class TestSaveGardenLimits:
+    """Test the limits enforced while a posted garden is streamed in."""
+
+    def test_too_many_positions(self, authenticated_client, plants, colors, settings):
+        settings.GARDEN_MAX_POSITIONS = 3
+        data = _payload(plants, colors, {"bergamot": [(1, 1), (2, 2)], "susan": [(3, 3)] * 2})
+
+        response = _save(authenticated_client, data)
+
+        assert response.status_code == 413
+        assert not Garden.objects.exists()
+
+    def test_too_many_plants(self, authenticated_client, plants, colors, settings):
+        settings.GARDEN_MAX_PLANTS = 1
+        data = _payload(plants, colors, {"bergamot": [(1, 1)], "susan": [(3, 3)]})
+
+        assert _save(authenticated_client, data).status_code == 413
+
+    def test_too_many_bytes(self, authenticated_client, plants, colors, settings):
+        settings.GARDEN_MAX_BYTES = 100
+        data = _payload(plants, colors, {"bergamot": [(1, 1)] * 10})
+
+        assert _save(authenticated_client, data).status_code == 413
+
+    def test_rejected_before_the_rest_is_parsed(
+        self, authenticated_client, plants, colors, settings
+    ):
+        settings.GARDEN_MAX_POSITIONS = 1
+        body = json.dumps(_payload(plants, colors, {"bergamot": [(1, 1), (2, 2)]}))
+        # Truncated JSON, which would be a 400 if it were all parsed first
+        truncated = body[: body.index('{"x": 2, "y": 2}') + 20]
+
+        response = authenticated_client.post(
+            reverse("garden_save"), truncated, content_type="application/json"
+        )
+
+        assert response.status_code == 413
+
+    def test_malformed_positions_are_skipped(self, authenticated_client, plants, colors):
+        data = _payload(plants, colors, {"bergamot": [(1, 1)]})
+        data["plants"][0]["positions"] += [{"x": 1}, 5, [1, 2], {"x": 2, "y": 3, "z": 4}]
+
+        garden_id = _save(authenticated_client, data).json()["garden_id"]
+
+        assert _stored(garden_id) == [("wild-bergamot", 1.0, 1.0), ("wild-bergamot", 2.0, 3.0)]
+
+
+def _counters(garden_id):
+    garden = Garden.objects.get(id=garden_id)
+    return garden.plant_count, garden.position_count
+
+
+@pytest.mark.django_db
+class TestPositionCounters:
+    """Test the denormalized plant and position counters."""
+
+    def test_full_saves(self, authenticated_client, saved_garden, plants, colors):
+        data, _ = saved_garden
+        assert _counters(data["garden_id"]) == (2, 3)
+
+        positions = {"bergamot": [(1, 1), (2, 2), (3, 3), (4, 4)]}
+        _save(authenticated_client, _payload(plants, colors, positions, data["garden_id"]))
+
+        assert _counters(data["garden_id"]) == (1, 4)
+        assert GardenPlant.objects.get(garden_id=data["garden_id"]).quantity == 4
+
+    def test_sync(self, authenticated_client, saved_garden, plants, colors):
+        data, revision = saved_garden
+        susan = {"plant_id": data["plants"][1]["plant_id"], "color_id": str(colors["yellow"].id)}
+        ops = [
+            {"op": "add", **susan, "to": {"x": 6, "y": 6}},
+            {"op": "add", **susan, "to": {"x": 7, "y": 7}},
+            {"op": "move", **susan, "from": {"x": 5, "y": 5}, "to": {"x": 8, "y": 8}},
+        ]
+
+        _sync(authenticated_client, data["garden_id"], revision, ops)
+
+        assert _counters(data["garden_id"]) == (2, 5)
+        _sync(
+            authenticated_client,
+            data["garden_id"],
+            revision + 1,
+            [{"op": "remove_plant", **susan}],
+        )
+        assert _counters(data["garden_id"]) == (1, 2)
+
+    def test_recount_repairs_counters(self, saved_garden):
+        data, _ = saved_garden
+        Garden.objects.filter(id=data["garden_id"]).update(plant_count=9, position_count=0)
+        GardenPlant.objects.filter(garden_id=data["garden_id"]).update(position_count=0)
+
+        assert recount_gardens() == (2, 1)
+        assert _counters(data["garden_id"]) == (2, 3)
+        assert recount_gardens() == (0, 0)
+
+    def test_list_reads_counters(self, authenticated_client, saved_garden):
+        with CaptureQueriesContext(connection) as queries:
+            gardens = authenticated_client.get(reverse("garden_list")).json()["gardens"]
+
+        assert [(g["plant_count"], g["position_count"]) for g in gardens] == [(2, 3)]
+        assert not [q for q in _garden_queries(queries) if "COUNT(" in q.upper()]
+
+
+@pytest.mark.django_db
+class TestGardenAdmin:
+    """Test that admin edits are new revisions, like saves."""
+
+    @pytest.fixture
+    def admin(self):
+        admin = Client()
+        admin.force_login(
+            User.objects.create_superuser(email="admin@example.com", password="adminpass123")
+        )
+        return admin
+
+    def _resave(self, client, data):
+        response = _save(client, data).json()
+        return response["unchanged"], Garden.objects.get(id=data["garden_id"])
+
+    def test_garden_edit(
+        self,
+        admin,
+        authenticated_client,
+        saved_garden,
+        sample_user,
+        django_capture_on_commit_callbacks,
+    ):
+        data, _ = saved_garden
+        load_url = reverse("garden_load", args=[data["garden_id"]])
+        etag = authenticated_client.get(load_url)["ETag"]
+        garden_plants = GardenPlant.objects.filter(garden_id=data["garden_id"])
+        form = {
+            "name": data["name"],
+            "user": sample_user.id,
+            "width": 30,
+            "length": data["length"],
+            "description": "",
+            "garden_plants-TOTAL_FORMS": len(garden_plants),
+            "garden_plants-INITIAL_FORMS": len(garden_plants),
+        }
+        for index, garden_plant in enumerate(garden_plants):
+            prefix = f"garden_plants-{index}"
+            form[f"{prefix}-id"] = garden_plant.id
+            form[f"{prefix}-garden"] = garden_plant.garden_id
+            form[f"{prefix}-plant"] = garden_plant.plant_id
+            form[f"{prefix}-color"] = garden_plant.color_id
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = admin.post(
+                reverse("admin:planner_garden_change", args=[data["garden_id"]]), form
+            )
+
+        assert response.status_code == 302
+        response = authenticated_client.get(load_url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["width"] == 30
+        # Saving the layout from before the edit puts it back
+        unchanged, garden = self._resave(authenticated_client, data)
+        assert not unchanged
+        assert garden.width == data["width"]
+
+    def test_plant_delete(self, admin, authenticated_client, saved_garden):
+        data, _ = saved_garden
+        revision = Garden.objects.get(id=data["garden_id"]).revision
+        susan = GardenPlant.objects.get(
+            garden_id=data["garden_id"], plant__slug="brown-eyed-susan"
+        )
+
+        admin.post(reverse("admin:planner_gardenplant_delete", args=[susan.id]), {"post": "yes"})
+
+        garden = Garden.objects.get(id=data["garden_id"])
+        assert garden.revision == revision + 1
+        assert _counters(garden.id) == (1, 2)
+        unchanged, garden = self._resave(authenticated_client, data)
+        assert not unchanged
+        assert ("brown-eyed-susan", 5.0, 5.0) in _stored(garden.id)
+
+
+@pytest.mark.django_db
+class TestGardenAnalytics:
+    """Test the server-side garden summary, cached by revision."""
+
+    def _get(self, client, garden_id, **kwargs):
+        return client.get(reverse("garden_analytics", args=[garden_id]), **kwargs)
+
+    def test_analytics(self, authenticated_client, saved_garden, colors):
+        data, _ = saved_garden
+        Plant.objects.filter(slug="brown-eyed-susan").update(native=False)
+
+        analytics = self._get(authenticated_client, data["garden_id"]).json()
+
+        assert analytics["plant_count"] == 2
+        assert analytics["position_count"] == 3
+        assert analytics["native"] == {"plants": 1, "positions": 2, "ratio": 2 / 3}
+        assert analytics["niches"] == {"covered": 1, "total": 1, "names": ["Groundcover"]}
+        assert analytics["features"][0] == {
+            "id": analytics["features"][0]["id"],
+            "name": "Pollinator Magnet",
+            "icon": None,
+            "count": 2,
+        }
+        bloom = {month["month"]: month for month in analytics["bloom"]}
+        purple, yellow = str(colors["purple"].id), str(colors["yellow"].id)
+        assert bloom["jun"]["colors"] == {purple: 2}
+        assert bloom["aug"]["plants"] == 2
+        assert bloom["aug"]["colors"] == {purple: 2, yellow: 1}
+        assert bloom["jan"]["positions"] == 0
+        # Two 2 ft and one 1.5 ft wide plants in a 20 x 10 ft garden
+        canopy = 2 * math.pi + math.pi * 0.75**2
+        assert analytics["canopy_area"] == pytest.approx(canopy)
+        assert analytics["canopy_ratio"] == pytest.approx(canopy / 200)
+
+    def test_cached_by_revision(self, authenticated_client, saved_garden):
+        data, _ = saved_garden
+        first = self._get(authenticated_client, data["garden_id"])
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self._get(authenticated_client, data["garden_id"])
+        assert second.content == first.content
+        # Only the revision is read
+        assert len(_garden_queries(queries)) == 1
+        assert "planner_gardenplant" not in _garden_queries(queries)[0]
+
+        not_modified = self._get(
+            authenticated_client, data["garden_id"], headers={"If-None-Match": first["ETag"]}
+        )
+        assert not_modified.status_code == 304
+
+        data["plants"][0]["positions"].append({"x": 5, "y": 8})
+        _save(authenticated_client, data)
+        updated = self._get(authenticated_client, data["garden_id"])
+        assert updated["ETag"] != first["ETag"]
+        assert updated.json()["position_count"] == 4
+
+    def test_other_users_garden_is_not_found(self, client, saved_garden):
+        data, _ = saved_garden
+        other = User.objects.create_user(email="other@example.com", password="pw")
+        client.force_login(other)
+
+        assert self._get(client, data["garden_id"]).status_code == 404
+
+    def test_summary_page_shows_niche_count(self, client, niche):
+        response = client.get(reverse("garden_summary"))
+
+        assert b'data-niche-count="1"' in response.content
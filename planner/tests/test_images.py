@@ -0,0 +1,172 @@
+import io
+import re
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.template import Context, Template
+from django.urls import reverse
+from PIL import Image
+
+from planner.models import Plant, PlantFeature
+
+
+def _jpeg(width=1600, height=1200, color=(90, 140, 60)):
+    image = Image.new("RGB", (width, height), color)
+    exif = Image.Exif()
+    exif[0x010F] = "Camera Maker"  # Make
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", exif=exif)
+    return ContentFile(buffer.getvalue(), name="bergamot.jpg")
+
+
+def _upload(plant, content, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        plant.image.save("bergamot.jpg", content)
+    plant.refresh_from_db()
+    return plant.image_variants
+
+
+@pytest.mark.django_db
+class TestImageVariants:
+    """Test responsive variant generation for catalog images."""
+
+    def test_generates_formats_and_widths(self, plants, django_capture_on_commit_callbacks):
+        plant = Plant.objects.get(slug="wild-bergamot")
+
+        record = _upload(plant, _jpeg(), django_capture_on_commit_callbacks)
+
+        assert record["source"] == plant.image.name
+        assert (record["width"], record["height"]) == (1600, 1200)
+        assert set(record["variants"]) == {"avif", "webp"}
+        webp = record["variants"]["webp"]
+        assert [(v["width"], v["height"]) for v in webp] == [
+            (320, 240),
+            (640, 480),
+            (960, 720),
+            (1280, 960),
+        ]
+        with default_storage.open(webp[0]["name"]) as f, Image.open(f) as variant:
+            assert variant.format == "WEBP"
+            assert variant.size == (320, 240)
+            assert not variant.getexif()
+
+    def test_records_size_and_placeholder(self, plants, django_capture_on_commit_callbacks):
+        plant = Plant.objects.get(slug="wild-bergamot")
+
+        _upload(plant, _jpeg(1600, 900), django_capture_on_commit_callbacks)
+
+        assert (plant.image_width, plant.image_height) == (1600, 900)
+        assert plant.image_placeholder.startswith("data:image/webp;base64,")
+        assert len(plant.image_placeholder) < 1000
+
+    def test_backfills_missing_placeholder(self, plants, django_capture_on_commit_callbacks):
+        plant = Plant.objects.get(slug="wild-bergamot")
+        _upload(plant, _jpeg(), django_capture_on_commit_callbacks)
+        Plant.objects.filter(pk=plant.pk).update(image_placeholder="", image_width=None)
+
+        call_command("generate_image_variants", "--now", stdout=io.StringIO())
+
+        plant.refresh_from_db()
+        assert plant.image_placeholder
+        assert plant.image_width == 1600
+
+    def test_never_upscales(self, plants, django_capture_on_commit_callbacks):
+        plant = Plant.objects.get(slug="wild-bergamot")
+
+        record = _upload(plant, _jpeg(500, 250), django_capture_on_commit_callbacks)
+
+        assert [v["width"] for v in record["variants"]["avif"]] == [320, 500]
+
+    def test_replacing_image_removes_old_variants(
+        self, plants, django_capture_on_commit_callbacks
+    ):
+        plant = Plant.objects.get(slug="wild-bergamot")
+        old = _upload(plant, _jpeg(), django_capture_on_commit_callbacks)
+
+        new = _upload(plant, _jpeg(color=(200, 40, 90)), django_capture_on_commit_callbacks)
+
+        assert new["source"] != old["source"]
+        for variant in old["variants"]["webp"]:
+            assert not default_storage.exists(variant["name"])
+        for variant in new["variants"]["webp"]:
+            assert default_storage.exists(variant["name"])
+
+    def test_shared_variants_are_kept(self, plants, django_capture_on_commit_callbacks):
+        bergamot = Plant.objects.get(slug="wild-bergamot")
+        susan = Plant.objects.get(slug="brown-eyed-susan")
+        old = _upload(bergamot, _jpeg(), django_capture_on_commit_callbacks)
+        # The same upload is stored once, so both plants refer to the same variants
+        assert _upload(susan, _jpeg(), django_capture_on_commit_callbacks) == old
+
+        _upload(bergamot, _jpeg(color=(200, 40, 90)), django_capture_on_commit_callbacks)
+
+        for variant in old["variants"]["webp"]:
+            assert default_storage.exists(variant["name"])
+
+    def test_unrelated_save_does_not_requeue(self, plants, django_capture_on_commit_callbacks):
+        plant = Plant.objects.get(slug="wild-bergamot")
+        _upload(plant, _jpeg(), django_capture_on_commit_callbacks)
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            plant.notes = "Edited"
+            plant.save()
+
+        # Only catalog version bumps, no variant task
+        assert {callback.__name__ for callback in callbacks} == {"_bump_catalog_version"}
+
+    def test_icons_get_small_variants(self, django_capture_on_commit_callbacks):
+        feature = PlantFeature.objects.create(name="Pollinator Magnet")
+        buffer = io.BytesIO()
+        Image.new("RGBA", (128, 128), (0, 0, 0, 0)).save(buffer, format="PNG")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            feature.icon.save("pollinator.png", ContentFile(buffer.getvalue()))
+
+        feature.refresh_from_db()
+        assert [v["width"] for v in feature.icon_variants["variants"]["webp"]] == [32, 64, 96]
+
+
+@pytest.mark.django_db
+class TestResponsiveImageTag:
+    """Test the responsive_image template tag."""
+
+    template = Template(
+        "{% load planner_images %}"
+        '{% responsive_image plant.image plant.image_variants sizes="50vw" alt="Bee balm" %}'
+    )
+
+    def test_renders_picture_with_srcset(self, plants, django_capture_on_commit_callbacks):
+        plant = Plant.objects.get(slug="wild-bergamot")
+        _upload(plant, _jpeg(), django_capture_on_commit_callbacks)
+
+        html = self.template.render(Context({"plant": plant}))
+
+        assert html.startswith('<picture><source type="image/avif" srcset="/media/plants/')
+        assert '<source type="image/webp"' in html
+        assert re.search(r"/bergamot-320\.[0-9a-f]{12}\.webp 320w, ", html)
+        assert 'sizes="50vw"' in html
+        assert 'height="1200"' in html
+        assert 'width="1600"' in html
+        assert 'alt="Bee balm"' in html
+
+    def test_card_reserves_box_and_paints_placeholder(
+        self, client, plants, django_capture_on_commit_callbacks
+    ):
+        plant = Plant.objects.get(slug="wild-bergamot")
+        _upload(plant, _jpeg(1600, 900), django_capture_on_commit_callbacks)
+
+        html = client.get(reverse("plant_list")).content.decode()
+
+        assert 'width="1600"' in html
+        assert 'height="900"' in html
+        assert f"url({plant.image_placeholder})" in html
+
+    def test_falls_back_to_plain_img(self, plants):
+        plant = Plant.objects.get(slug="wild-bergamot")
+        plant.image.name = "plants/bergamot.jpg"
+
+        html = self.template.render(Context({"plant": plant}))
+
+        assert html == '<img alt="Bee balm" src="/media/plants/bergamot.jpg">'
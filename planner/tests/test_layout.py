@@ -0,0 +1,141 @@
+import json
+import math
+import random
+
+import numpy as np
+import pytest
+from django.urls import reverse
+
+from planner.layout import validate_layout
+from planner.models import Garden, Plant
+from planner.positions import pack, quantize, unpack
+from planner.tests.test_gardens import _payload, _save
+
+
+def _pairs(report):
+    return sorted(
+        tuple(sorted(((pair["a"]["x"], pair["a"]["y"]), (pair["b"]["x"], pair["b"]["y"]))))
+        for pair in report.overcrowded
+    )
+
+
+@pytest.mark.django_db
+class TestValidateLayout:
+    """Test the spatial hash layout validator."""
+
+    def test_valid_layout(self, make_layout):
+        # Bergamot is 2 ft wide and susan 1.5 ft: touching circles are fine
+        layout = make_layout({"bergamot": [(1, 1), (3, 1)], "susan": [(4.75, 1)]})
+
+        report = validate_layout(20, 10, layout)
+
+        assert report.valid
+        assert report.as_dict()["overcrowded"] == {"count": 0, "pairs": []}
+
+    def test_overcrowded_pairs(self, make_layout):
+        layout = make_layout({"bergamot": [(1, 1), (2.5, 1)], "susan": [(3.5, 1.5)]})
+
+        report = validate_layout(20, 10, layout)
+
+        assert not report.valid
+        assert _pairs(report) == [((1, 1), (2.5, 1)), ((2.5, 1), (3.5, 1.5))]
+        pair = next(p for p in report.overcrowded if {p["a"]["x"], p["b"]["x"]} == {2.5, 3.5})
+        assert pair["required"] == 1.75
+        assert pair["distance"] == pytest.approx(math.hypot(1, 0.5))
+
+    def test_out_of_bounds(self, make_layout):
+        layout = make_layout({"bergamot": [(-1, 1), (20, 10)], "susan": [(5, 10.5)]})
+
+        report = validate_layout(20, 10, layout)
+
+        assert report.out_of_bounds_count == 2
+        assert sorted((p["x"], p["y"]) for p in report.out_of_bounds) == [(-1, 1), (5, 10.5)]
+
+    # numpy warns when a float doesn't fit the integer it is cast to
+    @pytest.mark.filterwarnings("error::RuntimeWarning")
+    def test_far_out_of_bounds_positions(self, make_layout):
+        far = float(np.float32(1e30))
+        positions = [(1, 1), (2.5, 1), (far, 5), (far, 5.5), (-far, -far), (far, far)]
+        layout = make_layout({"bergamot": positions})
+
+        report = validate_layout(20, 10, layout)
+
+        assert report.out_of_bounds_count == 4
+        assert _pairs(report) == [((1, 1), (2.5, 1)), ((far, 5), (far, 5.5))]
+
+    def test_missing_spread_uses_default(self, make_layout):
+        Plant.objects.filter(slug="wild-bergamot").update(spread=None)
+        layout = make_layout({"bergamot": [(1, 1), (1.9, 1), (5, 5), (6, 5)]})
+
+        assert _pairs(validate_layout(20, 10, layout)) == [((1, 1), (quantize(1.9), 1))]
+
+    @pytest.mark.parametrize("chunk", [1 << 20, 7])
+    def test_matches_pairwise_comparison(self, make_layout, monkeypatch, chunk):
+        monkeypatch.setattr("planner.layout.LAYOUT_PAIR_CHUNK", chunk)
+        rng = random.Random(3)
+        positions = {
+            name: [(rng.uniform(-2, 30), rng.uniform(-2, 30)) for _ in range(300)]
+            for name in ("bergamot", "susan")
+        }
+        radius = {"bergamot": 1, "susan": 0.75}
+        points = [
+            (x, y, radius[name])
+            for name, entries in positions.items()
+            for x, y in unpack(pack(entries))
+        ]
+        expected = sum(
+            math.hypot(a[0] - b[0], a[1] - b[1]) < a[2] + b[2] - 1e-3
+            for i, a in enumerate(points)
+            for b in points[i + 1 :]
+        )
+
+        report = validate_layout(25, 25, make_layout(positions))
+
+        assert expected > 0
+        assert report.overcrowded_count == expected
+        assert len(report.overcrowded) == min(expected, 100)
+
+
+@pytest.mark.django_db
+class TestValidateGardenView:
+    """Test the layout validation endpoint and strict saves."""
+
+    def test_reports_problems(self, client, plants, colors):
+        data = _payload(plants, colors, {"bergamot": [(1, 1), (2, 1)], "susan": [(25, 5)]})
+
+        response = client.post(
+            reverse("garden_validate"), json.dumps(data), content_type="application/json"
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert not body["valid"]
+        assert body["out_of_bounds"]["count"] == 1
+        assert body["overcrowded"]["count"] == 1
+
+    def test_strict_save_refuses_invalid_layout(self, authenticated_client, plants, colors):
+        data = _payload(plants, colors, {"bergamot": [(1, 1), (2, 1)]})
+
+        response = authenticated_client.post(
+            reverse("garden_save") + "?strict=1",
+            json.dumps(data),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 422
+        assert response.json()["overcrowded"]["count"] == 1
+        assert not Garden.objects.exists()
+        # Without strict the same layout is saved as before
+        assert _save(authenticated_client, data).status_code == 200
+
+    def test_strict_save_accepts_valid_layout(self, authenticated_client, plants, colors):
+        data = _payload(plants, colors, {"bergamot": [(1, 1), (3, 1)]})
+
+        response = authenticated_client.post(
+            reverse("garden_save") + "?strict=1",
+            json.dumps(data),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 200
+        assert Garden.objects.count() == 1
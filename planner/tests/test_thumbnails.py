@@ -0,0 +1,93 @@
+import io
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.urls import reverse
+from PIL import Image
+
+from planner import thumbnails
+from planner.models import Garden
+from planner.tests.test_gardens import _payload, _save
+
+
+def _save_committed(client, data, capture):
+    with capture(execute=True):
+        return _save(client, data).json()
+
+
+@pytest.mark.django_db
+class TestGardenThumbnails:
+    """Test the previews rendered after each save and linked from list_gardens."""
+
+    def test_rendered_after_save(
+        self, authenticated_client, plants, colors, django_capture_on_commit_callbacks
+    ):
+        data = _payload(plants, colors, {"bergamot": [(5, 5)], "susan": [(15, 5)]})
+
+        body = _save_committed(authenticated_client, data, django_capture_on_commit_callbacks)
+
+        garden = Garden.objects.get(id=body["garden_id"])
+        assert garden.thumbnail_revision == garden.revision
+        with default_storage.open(garden.thumbnail.name) as f, Image.open(f) as image:
+            # 20 x 10 ft, 240 px along the longer side
+            assert image.size == (240, 120)
+            pixels = image.convert("RGB")
+        # Plant centers in their colors, soil in between
+        assert pixels.getpixel((60, 60)) == (128, 0, 128)
+        assert pixels.getpixel((180, 60)) == (255, 255, 0)
+        assert pixels.getpixel((120, 60)) == (239, 231, 218)
+
+    def test_listed_and_replaced(
+        self, authenticated_client, plants, colors, django_capture_on_commit_callbacks
+    ):
+        data = _payload(plants, colors, {"bergamot": [(5, 5)]})
+        data["garden_id"] = _save_committed(
+            authenticated_client, data, django_capture_on_commit_callbacks
+        )["garden_id"]
+        first = Garden.objects.get(id=data["garden_id"]).thumbnail
+        (listed,) = authenticated_client.get(reverse("garden_list")).json()["gardens"]
+        assert listed["thumbnail_url"] == first.url
+
+        data["plants"][0]["positions"].append({"x": 10, "y": 5})
+        _save_committed(authenticated_client, data, django_capture_on_commit_callbacks)
+
+        second = Garden.objects.get(id=data["garden_id"]).thumbnail
+        assert second.name != first.name
+        assert not default_storage.exists(first.name)
+        (listed,) = authenticated_client.get(reverse("garden_list")).json()["gardens"]
+        assert listed["thumbnail_url"] == second.url
+
+    def test_up_to_date_is_left_alone(
+        self, authenticated_client, plants, colors, django_capture_on_commit_callbacks
+    ):
+        data = _payload(plants, colors, {"bergamot": [(5, 5)]})
+        body = _save_committed(authenticated_client, data, django_capture_on_commit_callbacks)
+
+        assert thumbnails.render_thumbnail(body["garden_id"]) is None
+
+    def test_garden_saved_while_drawing(self, authenticated_client, plants, colors, monkeypatch):
+        garden_id = _save(authenticated_client, _payload(plants, colors, {"bergamot": [(5, 5)]}))
+        garden_id = garden_id.json()["garden_id"]
+        draw = thumbnails.draw_thumbnail
+
+        def draw_and_save(garden, layout):
+            Garden.objects.filter(id=garden.id).update(revision=garden.revision + 1)
+            return draw(garden, layout)
+
+        monkeypatch.setattr(thumbnails, "draw_thumbnail", draw_and_save)
+
+        assert thumbnails.render_thumbnail(garden_id) is None
+        garden = Garden.objects.get(id=garden_id)
+        assert not garden.thumbnail
+        assert not default_storage.listdir("gardens/thumbnails")[1]
+
+    def test_command_renders_stale(self, authenticated_client, plants, colors):
+        garden_id = _save(
+            authenticated_client, _payload(plants, colors, {"bergamot": [(5, 5)]})
+        ).json()["garden_id"]
+
+        call_command("render_garden_thumbnails", "--now", stdout=io.StringIO())
+
+        garden = Garden.objects.get(id=garden_id)
+        assert garden.thumbnail_revision == garden.revision
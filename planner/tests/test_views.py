@@ -0,0 +1,465 @@
+import json
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+
+from planner.models import BloomOptions, Plant, SunOptions, bitmask
+
+
+def _plant_list(client, **filters):
+    return client.get(reverse("plant_list"), {"filters": json.dumps(filters)})
+
+
+def _names(response):
+    return [plant.common_name for plant in response.context["plants"]]
+
+
+@pytest.mark.django_db
+class TestPlantListSearch:
+    """Test the plant_list search backend."""
+
+    def test_no_search_lists_alphabetically(self, client, plants):
+        response = _plant_list(client)
+
+        assert response.status_code == 200
+        assert _names(response) == ["Brown-eyed Susan", "Ironweed", "Wild Bergamot"]
+
+    def test_search_by_common_name_substring(self, client, plants):
+        response = _plant_list(client, search="bergam")
+
+        assert _names(response) == ["Wild Bergamot"]
+
+    def test_search_by_scientific_name(self, client, plants):
+        response = _plant_list(client, search="rudbeckia")
+
+        assert _names(response) == ["Brown-eyed Susan"]
+
+    def test_search_tolerates_typos(self, client, plants):
+        response = _plant_list(client, search="bergamott")
+
+        assert _names(response) == ["Wild Bergamot"]
+
+    def test_search_matches_notes_and_feature_names(self, client, plants):
+        assert _names(_plant_list(client, search="bumblebees")) == ["Wild Bergamot"]
+        assert _names(_plant_list(client, search="deer resistant")) == ["Wild Bergamot"]
+
+    def test_search_ranks_name_matches_above_feature_matches(self, client, plants, features):
+        plants["ironweed"].features.add(features["pollinator"])
+
+        response = _plant_list(client, search="ironweed pollinator")
+
+        assert _names(response)[0] == "Ironweed"
+
+    def test_search_vector_follows_feature_rename(self, client, plants, features):
+        features["deer"].name = "Rabbit Proof"
+        features["deer"].save()
+
+        assert _names(_plant_list(client, search="rabbit")) == ["Wild Bergamot"]
+
+    def test_search_combines_with_other_filters(self, client, plants, colors, features):
+        response = _plant_list(
+            client,
+            search="pollinator",
+            native=True,
+            colors=[str(colors["purple"].id)],
+            features=[str(features["pollinator"].id)],
+        )
+
+        assert _names(response) == ["Wild Bergamot"]
+
+
+@pytest.mark.django_db
+class TestPlantFacets:
+    """Test facet counts for the filter sidebar."""
+
+    def _facets(self, client, **filters):
+        response = client.get(reverse("plant_facets"), {"filters": json.dumps(filters)})
+        assert response.status_code == 200
+        return response.json()
+
+    def test_counts_without_filters(self, client, plants, colors, features, niche):
+        data = self._facets(client)
+
+        assert data["total"] == 3
+        assert data["facets"]["sun"] == {"full": 3, "partial": 2, "shade": 0}
+        assert data["facets"]["bloom"]["aug"] == 3
+        assert data["facets"]["bloom"]["jun"] == 1
+        assert data["facets"]["niche"] == {str(niche.id): 1}
+        assert data["facets"]["colors"] == {
+            str(colors["purple"].id): 2,
+            str(colors["yellow"].id): 1,
+        }
+        assert data["facets"]["features"][str(features["pollinator"].id)] == 2
+        assert data["facets"]["native"] == 2
+        assert data["facets"]["buyable"] == 1
+
+    def test_facet_ignores_its_own_selection(self, client, plants, colors):
+        data = self._facets(client, sun="partial", colors=[str(colors["yellow"].id)])
+
+        # Only Brown-eyed Susan is yellow, and it is full sun only
+        assert data["total"] == 0
+        assert data["facets"]["sun"] == {"full": 1, "partial": 0, "shade": 0}
+        # Both partial sun plants are purple
+        assert data["facets"]["colors"] == {str(colors["purple"].id): 2}
+
+    def test_features_narrow_with_and_logic(self, client, plants, features):
+        data = self._facets(client, features=[str(features["pollinator"].id)])
+
+        assert data["total"] == 2
+        assert data["facets"]["features"] == {
+            str(features["pollinator"].id): 2,
+            str(features["deer"].id): 1,
+        }
+
+    def test_counts_match_plant_list(self, client, plants):
+        filters = {"search": "pollinator", "bloom": "jul", "native": True}
+
+        data = self._facets(client, **filters)
+        response = _plant_list(client, **filters)
+
+        assert data["total"] == response.context["total_count"] == 2
+
+    def test_single_query_then_cached(self, client, plants, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            self._facets(client, bloom="aug")
+        with django_assert_num_queries(0):
+            self._facets(client, bloom="aug")
+
+
+@pytest.mark.django_db
+class TestPlantListSeasonFilters:
+    """Test the multi-value sun and bloom filters."""
+
+    def test_masks_follow_arrays(self, plants):
+        bergamot = Plant.objects.get(slug="wild-bergamot")
+
+        assert bergamot.sun_mask == bitmask(SunOptions, ["full", "partial"]) == 0b11
+        assert bergamot.bloom_mask == bitmask(BloomOptions, ["jun", "jul", "aug"])
+
+    def test_single_value_still_supported(self, client, plants):
+        response = _plant_list(client, sun="partial")
+
+        assert _names(response) == ["Ironweed", "Wild Bergamot"]
+
+    def test_any_sun_of_several(self, client, plants):
+        Plant.objects.create(
+            slug="wild-ginger", common_name="Wild Ginger", scientific_name="Asarum", sun=["shade"]
+        )
+
+        response = _plant_list(client, sun=["partial", "shade"])
+
+        assert _names(response) == ["Ironweed", "Wild Bergamot", "Wild Ginger"]
+
+    def test_blooms_any_time_in_season(self, client, plants):
+        response = _plant_list(client, bloom=["may", "jun", "jul"])
+
+        assert _names(response) == ["Brown-eyed Susan", "Wild Bergamot"]
+
+    def test_blooms_in_all_months(self, client, plants):
+        response = _plant_list(client, bloom=["aug", "sep"], bloomMatch="all")
+
+        assert _names(response) == ["Brown-eyed Susan", "Ironweed"]
+
+    def test_unknown_values_are_dropped(self, client, plants):
+        response = _plant_list(client, bloom=["jul", "smarch"], sun="moonlight")
+
+        assert _names(response) == ["Brown-eyed Susan", "Wild Bergamot"]
+
+    @pytest.mark.parametrize("match_all", [False, True])
+    def test_filters_can_use_gin_index(self, plants, match_all):
+        # all_objects, or the partial name index answers the deleted_at condition instead
+        plants = Plant.all_objects.matching_choices("bloom", ["may", "jun"], match_all)
+
+        with connection.cursor() as cursor:
+            # Three rows are cheaper to scan in name order, take those options away
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_indexscan = off")
+            plan = plants.explain()
+
+        assert "plant_bloom_idx" in plan
+
+    def test_facets_use_any_semantics(self, client, plants):
+        response = client.get(
+            reverse("plant_facets"), {"filters": json.dumps({"bloom": ["jun", "sep"]})}
+        )
+
+        assert response.json()["total"] == 3
+
+
+@pytest.mark.django_db
+class TestPlantRelationFilters:
+    """Test the denormalized color and feature ids behind the relation filters."""
+
+    def test_ids_follow_forward_changes(self, plants, colors, features):
+        bergamot = Plant.objects.get(slug="wild-bergamot")
+        bergamot.colors.add(colors["yellow"])
+        bergamot.features.remove(features["deer"])
+
+        bergamot.refresh_from_db()
+        assert set(bergamot.color_ids) == {colors["purple"].id, colors["yellow"].id}
+        assert bergamot.feature_ids == [features["pollinator"].id]
+
+        bergamot.colors.clear()
+        bergamot.refresh_from_db()
+        assert bergamot.color_ids == []
+
+    def test_ids_follow_reverse_changes(self, plants, colors):
+        ironweed = Plant.objects.get(slug="ironweed")
+        colors["yellow"].plants.add(ironweed)
+
+        ironweed.refresh_from_db()
+        assert set(ironweed.color_ids) == {colors["purple"].id, colors["yellow"].id}
+
+        colors["purple"].plants.clear()
+        ironweed.refresh_from_db()
+        assert ironweed.color_ids == [colors["yellow"].id]
+
+    def test_filters_avoid_joins(self, plants, colors, features):
+        filters = {
+            "colors": [str(colors["purple"].id), str(colors["yellow"].id)],
+            "features": [str(features["pollinator"].id)],
+        }
+        sql = str(Plant.objects.apply_filters(filters).query)
+
+        assert "JOIN" not in sql
+        assert "GROUP BY" not in sql
+        assert "DISTINCT" not in sql
+
+    def test_colors_match_any_features_match_all(self, client, plants, colors, features):
+        response = _plant_list(
+            client,
+            colors=[str(colors["purple"].id), str(colors["yellow"].id)],
+            features=[str(features["pollinator"].id), str(features["deer"].id)],
+        )
+
+        assert _names(response) == ["Wild Bergamot"]
+
+
+@pytest.mark.django_db
+class TestPlantListPagination:
+    """Test keyset pagination of plant_list."""
+
+    @pytest.fixture
+    def many_plants(self):
+        return Plant.objects.bulk_create(
+            Plant(
+                slug=f"aster-{n:02}",
+                common_name=f"Aster {n:02}",
+                scientific_name=f"Symphyotrichum {n:02}",
+            )
+            for n in range(60)
+        )
+
+    def _page(self, client, cursor=None, **filters):
+        params = {"filters": json.dumps(filters)}
+        if cursor:
+            params["cursor"] = cursor
+        return client.get(reverse("plant_list"), params).context["page_obj"]
+
+    def test_walks_forward_and_back(self, client, many_plants):
+        first = self._page(client)
+        assert [p.common_name for p in first][:2] == ["Aster 00", "Aster 01"]
+        assert len(first) == 24
+        assert first.count == 60
+        assert first.num_pages == 3
+        assert not first.has_previous()
+
+        second = self._page(client, first.next_cursor)
+        assert second.number == 2
+        assert second.object_list[0].common_name == "Aster 24"
+
+        third = self._page(client, second.next_cursor)
+        assert third.number == 3
+        assert len(third) == 12
+        assert not third.has_next()
+
+        back = self._page(client, third.previous_cursor)
+        assert back.number == 2
+        assert [p.id for p in back] == [p.id for p in second]
+
+        start = self._page(client, back.previous_cursor)
+        assert [p.id for p in start] == [p.id for p in first]
+        assert not start.has_previous()
+
+    def test_later_pages_skip_count(self, client, many_plants, django_assert_num_queries):
+        first = self._page(client)
+
+        # Page query plus the colors and features prefetches, no COUNT
+        with django_assert_num_queries(3):
+            self._page(client, first.next_cursor)
+
+    def test_ties_on_name_are_broken_by_id(self, client):
+        Plant.objects.bulk_create(
+            Plant(slug=f"twin-{n}", common_name="Twin", scientific_name=f"Twin {n}")
+            for n in range(30)
+        )
+
+        first = self._page(client)
+        second = self._page(client, first.next_cursor)
+
+        seen = [p.id for p in first] + [p.id for p in second]
+        assert len(seen) == len(set(seen)) == 30
+
+    def test_ranked_search_pages(self, client, many_plants):
+        first = self._page(client, search="aster")
+        second = self._page(client, first.next_cursor, search="aster")
+        third = self._page(client, second.next_cursor, search="aster")
+
+        seen = [p.id for page in (first, second, third) for p in page]
+        assert len(set(seen)) == 60
+
+    def test_malformed_cursor_returns_first_page(self, client, many_plants):
+        page = self._page(client, "not-a-cursor")
+
+        assert page.number == 1
+        assert page.object_list[0].common_name == "Aster 00"
+
+
+@pytest.mark.django_db
+class TestPlantListCache:
+    """Test the versioned fragment cache of plant_list."""
+
+    def test_repeat_request_served_from_cache(self, client, plants, django_assert_num_queries):
+        first = _plant_list(client, bloom="aug")
+
+        with django_assert_num_queries(0):
+            second = _plant_list(client, bloom="aug")
+
+        assert second.content == first.content
+
+    def test_equivalent_filters_share_an_entry(self, client, plants, colors):
+        purple, yellow = str(colors["purple"].id), str(colors["yellow"].id)
+        _plant_list(client, colors=[purple, yellow], native=False)
+
+        response = _plant_list(client, colors=[yellow, purple])
+
+        assert response.context is None
+
+    def test_plant_edit_invalidates(self, client, plants, django_capture_on_commit_callbacks):
+        _plant_list(client)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            plants["ironweed"].common_name = "Tall Ironweed"
+            plants["ironweed"].save()
+
+        assert b"Tall Ironweed" in _plant_list(client).content
+
+    def test_color_change_invalidates(
+        self, client, plants, colors, django_capture_on_commit_callbacks
+    ):
+        filters = {"colors": [str(colors["yellow"].id)]}
+        assert _names(_plant_list(client, **filters)) == ["Brown-eyed Susan"]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            plants["ironweed"].colors.add(colors["yellow"])
+
+        assert _names(_plant_list(client, **filters)) == ["Brown-eyed Susan", "Ironweed"]
+
+    def test_bulk_delete_invalidates(self, client, plants, django_capture_on_commit_callbacks):
+        _plant_list(client)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Plant.objects.filter(slug="ironweed").delete()
+
+        assert _names(_plant_list(client)) == ["Brown-eyed Susan", "Wild Bergamot"]
+
+
+def _selections(plants, colors, *names):
+    return [
+        {"plant_id": str(plants[name].id), "color_id": str(colors[color].id)}
+        for name, color in names
+    ]
+
+
+def _garden_plants(client, selections):
+    return client.post(
+        reverse("get_garden_plants"), json.dumps({"plants": selections}), "application/json"
+    )
+
+
+@pytest.mark.django_db
+class TestGetGardenPlants:
+    """Test the batched plant details of the garden summary."""
+
+    def test_returns_details_in_order(self, client, plants, colors):
+        selections = _selections(
+            plants, colors, ("susan", "yellow"), ("bergamot", "purple"), ("susan", "purple")
+        )
+
+        response = _garden_plants(client, selections)
+
+        details = response.json()["plants"]
+        assert [(d["common_name"], d["color_name"]) for d in details] == [
+            ("Brown-eyed Susan", "Yellow"),
+            ("Wild Bergamot", "Purple"),
+            ("Brown-eyed Susan", "Purple"),
+        ]
+        assert details[1]["niche_name"] == "Groundcover"
+        assert sorted(f["name"] for f in details[1]["features"]) == [
+            "Deer Resistant",
+            "Pollinator Magnet",
+        ]
+
+    def test_unknown_and_malformed_selections_are_skipped(self, client, plants, colors):
+        selections = _selections(plants, colors, ("susan", "yellow")) + [
+            {"plant_id": str(colors["yellow"].id), "color_id": str(colors["yellow"].id)},
+            {"plant_id": "not-a-uuid", "color_id": str(colors["yellow"].id)},
+            "bergamot",
+        ]
+
+        response = _garden_plants(client, selections)
+
+        assert [d["common_name"] for d in response.json()["plants"]] == ["Brown-eyed Susan"]
+
+    def test_query_count_is_constant(self, client, plants, colors, django_assert_num_queries):
+        # Plants with niche, their features, colors
+        with django_assert_num_queries(3):
+            _garden_plants(client, _selections(plants, colors, ("susan", "yellow")))
+        everything = [
+            {"plant_id": str(plant.id), "color_id": str(color.id)}
+            for plant in plants.values()
+            for color in colors.values()
+        ]
+        # Susan's details are cached
+        with django_assert_num_queries(3):
+            _garden_plants(client, everything)
+        with django_assert_num_queries(1):
+            _garden_plants(client, everything)
+
+    def test_request_size_is_capped(self, client, plants, colors):
+        selections = _selections(plants, colors, ("susan", "yellow")) * 501
+
+        response = _garden_plants(client, selections)
+
+        assert response.status_code == 400
+
+    def test_get_variant(self, client, plants, colors, django_assert_num_queries):
+        pairs = sorted(
+            f"{plants[name].id}:{colors[color].id}"
+            for name, color in (("susan", "yellow"), ("bergamot", "purple"))
+        )
+        url = reverse("get_garden_plants") + "?plants=" + ",".join(pairs)
+
+        response = client.get(url)
+
+        assert response.status_code == 200
+        assert len(response.json()["plants"]) == 2
+        assert "public" in response["Cache-Control"]
+        with django_assert_num_queries(0):
+            revalidated = client.get(url, headers={"If-None-Match": response["ETag"]})
+        assert revalidated.status_code == 304
+
+    def test_catalog_change_changes_get_etag(
+        self, client, plants, colors, django_capture_on_commit_callbacks
+    ):
+        url = reverse("get_garden_plants") + f"?plants={plants['susan'].id}:{colors['yellow'].id}"
+        etag = client.get(url)["ETag"]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            plants["susan"].height = 5
+            plants["susan"].save()
+
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["plants"][0]["height"] == 5
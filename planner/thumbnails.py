@@ -0,0 +1,106 @@
+"""
+Preview images of saved gardens.
+
+After a garden is saved, a django-q task (planner.tasks) draws its positions as circles as
+wide as each plant's spread, in the color it was planted in, onto a small PNG. The
+storage name and the revision it shows are stored on the garden, so list_gardens can link
+every garden's preview without loading any layout. Media names carry a digest of their
+content (see floret.storage), so each rendering has its own URL that browsers can cache
+for good; the previous one is deleted once it's replaced.
+"""
+
+from __future__ import annotations
+
+import io
+
+import numpy as np
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageColor, ImageDraw
+
+from planner.constants import (
+    DEFAULT_PLANT_SPREAD,
+    GARDEN_THUMBNAIL_BACKGROUND,
+    GARDEN_THUMBNAIL_COLORS,
+    GARDEN_THUMBNAIL_SIZE,
+)
+from planner.garden_cache import invalidate_gardens
+from planner.images import delete_media
+from planner.models import Garden, GardenPlant
+
+# Circles are drawn at this multiple of the final size and scaled down, to smooth them
+SUPERSAMPLING = 2
+
+
+def needs_thumbnail(garden: Garden) -> bool:
+    return garden.thumbnail_revision != garden.revision
+
+
+def render_thumbnail(garden_id) -> str | None:
+    """
+    Render the preview of a garden's current revision and store it.
+
+    Idempotent: a garden whose preview is current is left alone. Returns the new storage
+    name, or None when there was nothing to do.
+    """
+    garden = Garden.objects.filter(id=garden_id).first()
+    if garden is None or not needs_thumbnail(garden):
+        return None
+
+    layout = GardenPlant.objects.filter(garden=garden).values_list(
+        "color__hex_code", "plant__spread", "position_data"
+    )
+    name = default_storage.save(
+        f"gardens/thumbnails/{garden.id}.png", ContentFile(draw_thumbnail(garden, layout))
+    )
+
+    # Only store the preview if the garden wasn't saved again while we were drawing
+    previous = garden.thumbnail.name
+    updated = Garden.objects.filter(id=garden.id, revision=garden.revision).update(
+        thumbnail=name, thumbnail_revision=garden.revision
+    )
+    if not updated:
+        # Identical content is stored once, the current preview may be this very file
+        delete_media(name)
+        return None
+    # Queryset updates send no signals, and the cached garden list links the preview
+    invalidate_gardens(garden.user_id, garden.id)
+    if previous and previous != name:
+        delete_media(previous)
+    return name
+
+
+def draw_thumbnail(garden: Garden, layout) -> bytes:
+    """
+    PNG of ``layout``, (hex color, spread, packed positions) per plant/color combination,
+    GARDEN_THUMBNAIL_SIZE px along the garden's longer side.
+    """
+    scale = GARDEN_THUMBNAIL_SIZE / max(garden.width, garden.length, 1e-6)
+    width, height = max(1, round(garden.width * scale)), max(1, round(garden.length * scale))
+    image = Image.new(
+        "RGB", (width * SUPERSAMPLING, height * SUPERSAMPLING), GARDEN_THUMBNAIL_BACKGROUND
+    )
+    draw = ImageDraw.Draw(image)
+
+    # Widest plants first, so smaller ones stay visible on top of them
+    by_spread = sorted(layout, key=lambda row: -(row[1] or DEFAULT_PLANT_SPREAD))
+    for hex_code, spread, position_data in by_spread:
+        if not position_data:
+            continue
+        fill = ImageColor.getrgb(hex_code)
+        outline = tuple(channel * 3 // 4 for channel in fill)
+        radius = max((spread or DEFAULT_PLANT_SPREAD) / 2 * scale * SUPERSAMPLING, 1)
+        centers = np.frombuffer(position_data, dtype="<f4").reshape(-1, 2) * (
+            scale * SUPERSAMPLING
+        )
+        for x, y in centers.tolist():
+            draw.ellipse(
+                (x - radius, y - radius, x + radius, y + radius), fill=fill, outline=outline
+            )
+
+    # A palette keeps the smoothed edges and makes the PNG a fraction of the size
+    image = image.resize((width, height), Image.Resampling.LANCZOS)
+    image = image.quantize(GARDEN_THUMBNAIL_COLORS)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
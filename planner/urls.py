@@ -5,11 +5,26 @@ from planner import views
 urlpatterns = [
     path("", views.index, name="index"),
     path("plants/", views.plant_list, name="plant_list"),
+    path("plants/facets/", views.plant_facets, name="plant_facets"),
     path("summary/", views.garden_summary, name="garden_summary"),
     path("planner/", views.garden_planner, name="garden_planner"),
     # Garden API endpoints
     path("api/garden-plants/", views.get_garden_plants, name="get_garden_plants"),
     path("garden/save/", views.save_garden, name="garden_save"),
+    path("garden/validate/", views.validate_garden, name="garden_validate"),
+    path("garden/fill/", views.fill_garden, name="garden_fill"),
+    path("garden/coverage/", views.garden_coverage, name="garden_coverage"),
+    path("garden/sync/", views.sync_garden, name="garden_sync"),
     path("garden/load/<uuid:garden_id>/", views.load_garden, name="garden_load"),
+    path(
+        "garden/analytics/<uuid:garden_id>/",
+        views.load_garden_analytics,
+        name="garden_analytics",
+    ),
+    path(
+        "garden/coverage/<uuid:garden_id>/",
+        views.load_garden_coverage,
+        name="garden_coverage_load",
+    ),
     path("garden/list/", views.list_gardens, name="garden_list"),
 ]
@@ -1,13 +1,54 @@
+import hashlib
 import json
+import uuid
 
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
+from django.core.cache import cache
 from django.db import transaction
-from django.db.models import Count, Q
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404, render
-from django.views.decorators.http import require_GET, require_POST
-
+from django.template.loader import render_to_string
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date, parse_etags, quote_etag
+from django.views.decorators.http import require_GET, require_http_methods, require_POST
+
+from planner import codec
+from planner.analytics import analytics_cache_key, garden_analytics
+from planner.catalog import catalog_cache_key, get_catalog_version
+from planner.catalog_index import get_catalog_index
+from planner.codec import ApiResponse, negotiate, transcode, variant_etag
+from planner.constants import (
+    COVERAGE_RESOLUTION,
+    GARDEN_PLANTS_MAX_AGE,
+    GARDEN_PLANTS_MAX_SELECTIONS,
+    GARDEN_SYNC_MAX_OPERATIONS,
+    PLANT_LIST_CACHE_TIMEOUT,
+    PLANT_LIST_PAGE_SIZE,
+)
+from planner.coverage import rasterize
+from planner.documents import garden_document_json
+from planner.facets import get_facet_counts
+from planner.fill import fill_layout, parse_fill_selections
+from planner.garden_cache import (
+    GARDEN_CACHE_CONTROL,
+    fill_cache,
+    garden_cache_key,
+    garden_list_cache_key,
+    get_cached,
+)
+from planner.gardens import (
+    GARDEN_FIELDS,
+    apply_operations,
+    packed_content_hash,
+    save_packed_plants,
+)
+from planner.ingest import GardenTooLarge, read_garden
+from planner.layout import validate_layout
 from planner.models import (
     BloomOptions,
     Color,
@@ -16,9 +57,10 @@ from planner.models import (
     Niche,
     Plant,
     PlantFeature,
-    PlantPosition,
     SunOptions,
 )
+from planner.pagination import KeysetPaginator
+from planner.plant_details import parse_selections, plant_details
 
 
 def index(request):
@@ -32,7 +74,12 @@ def index(request):
 
 def garden_summary(request):
     """Garden Summary View - Displays analytics for selected plants."""
-    return render(request, "garden_summary.html")
+    context = {
+        "niche_count": Niche.objects.count(),
+        # Replaced by the saved garden's ID in garden-summary.js
+        "analytics_placeholder": uuid.UUID(int=0),
+    }
+    return render(request, "garden_summary.html", context)
 
 
 def garden_planner(request):
@@ -69,14 +116,20 @@ def _validate_filters(raw_filters):
         except (ValueError, AttributeError):
             pass
 
-    # Choice fields - validate against allowed values
-    sun_values = dict(SunOptions.choices).keys()
-    if "sun" in raw_filters and raw_filters["sun"] in sun_values:
-        validated["sun"] = raw_filters["sun"]
-
-    bloom_values = dict(BloomOptions.choices).keys()
-    if "bloom" in raw_filters and raw_filters["bloom"] in bloom_values:
-        validated["bloom"] = raw_filters["bloom"]
+    # Choice fields - a single value or a list, matching any of them (e.g. full or
+    # partial sun, blooms some time in May-July). Kept in declaration order.
+    for field, choices in (("sun", SunOptions), ("bloom", BloomOptions)):
+        selected = raw_filters.get(field)
+        if isinstance(selected, str):
+            selected = [selected]
+        if isinstance(selected, list):
+            values = [value for value in choices.values if value in selected]
+            if values:
+                validated[field] = values
+
+    # Blooms in every selected month rather than any of them
+    if validated.get("bloom") and raw_filters.get("bloomMatch") == "all":
+        validated["bloomMatch"] = "all"
 
     # Boolean fields
     if "native" in raw_filters:
@@ -113,89 +166,86 @@ def _validate_filters(raw_filters):
     return validated
 
 
-def plant_list(request):
-    """Partial View - Returns filtered and paginated list of plants."""
-    # Start with base queryset
-    plants = (
-        Plant.objects.filter(deleted_at__isnull=True)
-        .select_related("niche")
-        .prefetch_related("colors", "features")
-    )
-
-    # Decode and validate filters from JSON parameter
+def _get_filters(request):
+    """Decode and validate filters from the JSON ``filters`` query parameter."""
     filters_json = request.GET.get("filters", "{}")
     try:
         raw_filters = json.loads(filters_json)
-        filters = _validate_filters(raw_filters)
+        return _validate_filters(raw_filters)
     except (json.JSONDecodeError, ValueError):
-        filters = {}
-
-    # Apply filters
-    if filters.get("search"):
-        search = filters["search"]
-        plants = plants.filter(
-            Q(common_name__icontains=search) | Q(scientific_name__icontains=search)
-        )
-
-    if filters.get("niche"):
-        plants = plants.filter(niche_id=filters["niche"])
-
-    if filters.get("sun"):
-        plants = plants.filter(sun__contains=[filters["sun"]])
-
-    if filters.get("bloom"):
-        plants = plants.filter(bloom__contains=[filters["bloom"]])
-
-    if filters.get("native"):
-        plants = plants.filter(native=True)
-
-    if filters.get("buyable"):
-        plants = plants.exclude(link="")
-
-    if filters.get("heightMin") is not None:
-        plants = plants.filter(height__gte=filters["heightMin"])
+        return {}
 
-    if filters.get("heightMax") is not None:
-        plants = plants.filter(height__lte=filters["heightMax"])
 
-    if filters.get("spreadMin") is not None:
-        plants = plants.filter(spread__gte=filters["spreadMin"])
+def plant_list(request):
+    """
+    Partial View - Returns filtered and paginated list of plants.
 
-    if filters.get("spreadMax") is not None:
-        plants = plants.filter(spread__lte=filters["spreadMax"])
+    The rendered partial is cached per filter set and cursor under the catalog version,
+    so repeat requests for popular filters never reach the database or template engine.
+    """
+    filters = _get_filters(request)
+    cursor = request.GET.get("cursor", "")
 
-    if filters.get("colors"):
-        plants = plants.filter(colors__id__in=filters["colors"]).distinct()
+    cache_key = catalog_cache_key("plant_list", {**filters, "cursor": cursor})
+    html = cache.get(cache_key)
+    if html is not None:
+        return HttpResponse(html)
 
-    if filters.get("features"):
-        # AND logic: plant must have ALL selected features
-        # Use annotation to count matching features and filter efficiently
-        from django.db.models import Count
+    page_obj = None
+    if settings.CATALOG_INDEX_ENABLED and not filters.get("search"):
+        page_obj = get_catalog_index().page(filters, cursor, PLANT_LIST_PAGE_SIZE)
 
-        feature_ids = filters["features"]
+    if page_obj is None:
         plants = (
-            plants.filter(features__id__in=feature_ids)
-            .annotate(matching_features=Count("features", distinct=True))
-            .filter(matching_features=len(feature_ids))
+            Plant.objects.filter(deleted_at__isnull=True)
+            .select_related("niche")
+            .prefetch_related("colors", "features")
+            .apply_filters(filters)
         )
 
-    # Apply ordering to all results
-    plants = plants.order_by("common_name")
+        # Search results are ranked by relevance, everything else is alphabetical
+        if filters.get("search"):
+            ordering = ("-search_rank", "common_name", "id")
+        else:
+            ordering = ("common_name", "id")
 
-    # Pagination
-    page_number = request.GET.get("page", 1)
-    paginator = Paginator(plants, 24)  # 24 plants per page
-    page_obj = paginator.get_page(page_number)
+        # Keyset pagination: deep pages cost the same as the first one
+        paginator = KeysetPaginator(plants, PLANT_LIST_PAGE_SIZE, ordering)
+        page_obj = paginator.get_page(cursor)
 
-    return render(
-        request,
+    html = render_to_string(
         "partials/plant_list.html",
         context={
             "plants": page_obj,
             "page_obj": page_obj,
-            "total_count": paginator.count,
+            "total_count": page_obj.count,
         },
+        request=request,
     )
+    cache.set(cache_key, html, PLANT_LIST_CACHE_TIMEOUT)
+    return HttpResponse(html)
+
+
+@require_GET
+def plant_facets(request):
+    """
+    Per-value counts for every filter option, given the currently active filters.
+
+    Returns:
+    {
+        "total": 42,
+        "facets": {
+            "sun": {"full": 30, "partial": 12, "shade": 4},
+            "bloom": {"jan": 0, ..., "dec": 0},
+            "niche": {"uuid": 7},
+            "colors": {"uuid": 11},
+            "features": {"uuid": 5},
+            "native": 38,
+            "buyable": 20
+        }
+    }
+    """
+    return ApiResponse(request, get_facet_counts(_get_filters(request)))
 
 
 # Garden Management API Endpoints
@@ -227,88 +277,319 @@ def save_garden(request):
         ]
     }
 
-    Returns: {"success": true, "garden_id": "uuid"}
+    Send If-Match with the revision's ETag (e.g. "4") to refuse overwriting changes saved
+    elsewhere since: the response is then a 409 carrying the current revision. Saving the
+    stored content again changes nothing and returns "unchanged": true.
+
+    The body is parsed as it streams in (see planner.ingest); a garden over the configured
+    size limits is refused with a 413.
+
+    With ?strict=1 a layout that validate_garden would report is refused with a 422 carrying
+    the report, and nothing is saved.
+
+    Returns: {"success": true, "garden_id": "uuid", "revision": 1, "unchanged": false}
     """
+    payload = _read_garden_payload(request)
+    if isinstance(payload, HttpResponse):
+        return payload
+
     try:
-        data = json.loads(request.body)
-    except json.JSONDecodeError:
-        return JsonResponse({"success": False, "error": "Invalid JSON"}, status=400)
+        fields, plants, garden_id = payload.fields, payload.plants, payload.garden_id
+        if request.GET.get("strict") in ("1", "true"):
+            report = validate_layout(fields["width"], fields["length"], plants)
+            if not report.valid:
+                return ApiResponse(
+                    request,
+                    {"success": False, "error": "Invalid layout", **report.as_dict()},
+                    status=422,
+                )
+        digest = packed_content_hash(fields, plants)
 
-    # Validate required fields
-    required = ["name", "width", "length", "plants"]
-    if not all(field in data for field in required):
-        return JsonResponse({"success": False, "error": "Missing required fields"}, status=400)
+        if garden_id:
+            # Conflicts and repeated saves are answered from a plain read, without a lock
+            garden = get_object_or_404(Garden, id=garden_id, user=request.user)
+            if not _if_match(request, garden):
+                return _garden_conflict(request, garden)
+            if garden.content_hash == digest:
+                return _garden_response(request, garden, unchanged=True)
 
-    try:
         with transaction.atomic():
-            garden_id = data.get("garden_id")
-
             if garden_id:
-                # Update existing garden
-                garden = get_object_or_404(Garden, id=garden_id, user=request.user)
-                garden.name = data["name"]
-                garden.width = float(data["width"])
-                garden.length = float(data["length"])
-                garden.description = data.get("description", "")
+                # Update existing garden, locked so concurrent saves are applied in turn
+                garden = get_object_or_404(
+                    Garden.objects.select_for_update(), id=garden_id, user=request.user
+                )
+                if not _if_match(request, garden):
+                    return _garden_conflict(request, garden)
+                for field, value in fields.items():
+                    setattr(garden, field, value)
+                garden.content_hash = digest
+                garden.revision += 1
                 garden.save()
             else:
                 # Create new garden
-                garden = Garden.objects.create(
-                    user=request.user,
-                    name=data["name"],
-                    width=float(data["width"]),
-                    length=float(data["length"]),
-                    description=data.get("description", ""),
-                )
+                garden = Garden.objects.create(user=request.user, content_hash=digest, **fields)
 
-            # Get current plant/color combinations from localStorage
-            incoming_plants = {
-                (plant_data["plant_id"], plant_data["color_id"]) for plant_data in data["plants"]
-            }
+            # Only the plants and positions that changed since the last save are written
+            save_packed_plants(garden, plants)
 
-            # Get existing GardenPlants
-            existing_garden_plants = {
-                (str(gp.plant_id), str(gp.color_id)): gp for gp in garden.garden_plants.all()
-            }
+            return _garden_response(request, garden)
+    except (ValueError, KeyError, TypeError, Plant.DoesNotExist, Color.DoesNotExist) as e:
+        return _error(request, f"Invalid data: {str(e)}")
 
-            # Hard delete GardenPlants that are no longer in localStorage
-            for key, gp in existing_garden_plants.items():
-                if key not in incoming_plants:
-                    # Hard delete positions first
-                    gp.positions.all().delete()
-                    # Hard delete the garden plant
-                    gp.delete()
-
-            # Process plants from localStorage
-            for plant_data in data["plants"]:
-                plant_key = (plant_data["plant_id"], plant_data["color_id"])
-
-                # Get or create GardenPlant
-                if plant_key in existing_garden_plants:
-                    garden_plant = existing_garden_plants[plant_key]
-                else:
-                    garden_plant = GardenPlant.objects.create(
-                        garden=garden,
-                        plant_id=plant_data["plant_id"],
-                        color_id=plant_data["color_id"],
-                    )
-
-                # Hard delete all existing positions
-                garden_plant.positions.all().delete()
-
-                # Create new positions from localStorage
-                positions = plant_data.get("positions", [])
-                for pos in positions:
-                    if isinstance(pos, dict) and "x" in pos and "y" in pos:
-                        PlantPosition.objects.create(
-                            garden_plant=garden_plant,
-                            x=float(pos["x"]),
-                            y=float(pos["y"]),
-                        )
-
-            return JsonResponse({"success": True, "garden_id": str(garden.id)}, status=200)
-    except (ValueError, KeyError, Plant.DoesNotExist, Color.DoesNotExist) as e:
-        return JsonResponse({"success": False, "error": f"Invalid data: {str(e)}"}, status=400)
+
+@require_POST
+def validate_garden(request):
+    """
+    Check a garden's layout without saving it: positions outside of the garden, and plants
+    closer to each other than their spread allows (see planner.layout).
+
+    Expects the same body as save_garden.
+
+    Returns:
+    {
+        "valid": false,
+        "out_of_bounds": {"count": 1, "positions": [{"plant_id", "color_id", "x", "y"}]},
+        "overcrowded": {
+            "count": 1,
+            "pairs": [{"a": {...}, "b": {...}, "distance": 0.5, "required": 1.25}]
+        }
+    }
+    Only the first LAYOUT_REPORT_LIMIT positions and pairs are listed, all are counted.
+    """
+    payload = _read_garden_payload(request)
+    if isinstance(payload, HttpResponse):
+        return payload
+    fields = payload.fields
+    return ApiResponse(
+        request, validate_layout(fields["width"], fields["length"], payload.plants).as_dict()
+    )
+
+
+@require_POST
+def fill_garden(request):
+    """
+    Lay out chosen plants in a garden of the given size, hex packed by their spread so that
+    none overlap (see planner.fill). Nothing is saved.
+
+    Expects JSON body:
+    {
+        "width": 40,
+        "length": 20,
+        "plants": [
+            {"plant_id": "uuid", "color_id": "uuid", "quantity": 30},
+            {"plant_id": "uuid", "color_id": "uuid", "ratio": 2}
+        ]
+    }
+    A quantity places up to that many plants; ratios share the rest of the garden out and
+    fill it. Plants with neither fill a share of 1.
+
+    Returns, per plant in order, how many fit in its drift and were placed:
+    {
+        "plants": [{"plant_id", "color_id", "requested": 30, "capacity": 33, "placed": 30,
+                    "positions": [{"x": 0.5, "y": 0.5}, ...]}],
+        "placed": 30
+    }
+    """
+    try:
+        data = codec.read(request)
+        width, length = (GARDEN_FIELDS[name](data[name]) for name in ("width", "length"))
+        if width <= 0 or length <= 0:
+            raise ValueError("Width and length must be positive")
+        drifts = fill_layout(width, length, parse_fill_selections(data["plants"]))
+    except codec.DecodeError as e:
+        return _error(request, str(e))
+    except (ValueError, KeyError, TypeError) as e:
+        return _error(request, f"Invalid data: {str(e)}")
+    return ApiResponse(
+        request,
+        {
+            "plants": [drift.as_dict() for drift in drifts],
+            "placed": sum(len(drift.positions) for drift in drifts),
+        },
+    )
+
+
+@require_POST
+def garden_coverage(request):
+    """
+    Canopy coverage of an unsaved garden, in the save_garden format. See
+    load_garden_coverage for the parameters and response.
+    """
+    payload = _read_garden_payload(request)
+    if isinstance(payload, HttpResponse):
+        return payload
+    fields = payload.fields
+    return _coverage_response(request, fields["width"], fields["length"], payload.plants)
+
+
+@login_required
+@require_GET
+def load_garden_coverage(request, garden_id):
+    """
+    Canopy coverage of a saved garden: every plant's spread rasterized over the garden
+    (see planner.coverage).
+
+    Query parameters: resolution, the cell size in ft (default 0.25), and raster=1 to
+    include the plant count of every cell.
+
+    Returns:
+    {
+        "resolution": 0.25, "columns": 80, "rows": 40,
+        "bare_ratio": 0.35, "overlap_ratio": 0.1, "max_overlap": 3,
+        "hotspots": [{"x": 4.0, "y": 2.0, "width": 2.0, "length": 2.0,
+                      "overlap_ratio": 0.6, "max_overlap": 3}],
+        "bloom": [{"month": "jan", "label": "January", "ratio": 0.0}, ...],
+        "raster": "base64 of rows x columns bytes, row by row from y = 0"
+    }
+    """
+    garden = get_object_or_404(Garden, id=garden_id, user=request.user)
+    plants = {
+        (str(plant_id), str(color_id)): bytes(position_data)
+        for plant_id, color_id, position_data in GardenPlant.objects.filter(
+            garden=garden
+        ).values_list("plant_id", "color_id", "position_data")
+    }
+    return _coverage_response(request, garden.width, garden.length, plants)
+
+
+def _coverage_response(request, width: float, length: float, plants: dict) -> ApiResponse:
+    try:
+        resolution = float(request.GET.get("resolution", COVERAGE_RESOLUTION))
+        coverage = rasterize(width, length, plants, resolution)
+    except ValueError as e:
+        return _error(request, f"Invalid data: {str(e)}")
+    return ApiResponse(
+        request, coverage.as_dict(raster=request.GET.get("raster") in ("1", "true"))
+    )
+
+
+def _read_garden_payload(request):
+    """The posted garden (see planner.ingest), or the error response for it."""
+    try:
+        # Streamed and packed as it is read, within the configured limits
+        return read_garden(request)
+    except GardenTooLarge as e:
+        return _error(request, str(e), status=413)
+    except codec.DecodeError as e:
+        return _error(request, str(e))
+    except (ValueError, KeyError, TypeError) as e:
+        return _error(request, f"Invalid data: {str(e)}")
+
+
+@login_required
+@require_POST
+def sync_garden(request):
+    """
+    Apply incremental edits to a saved garden.
+
+    The planner sends the operations made since the revision it last saved or synced,
+    instead of the whole garden. save_garden is still used for the first save and to
+    recover from conflicts. The revision can be sent in the body or as If-Match.
+
+    Expects JSON body:
+    {
+        "garden_id": "uuid",
+        "revision": 4,
+        "ops": [
+            {"op": "add_plant", "plant_id": "uuid", "color_id": "uuid"},
+            {"op": "add", "plant_id": "uuid", "color_id": "uuid", "to": {"x": 1, "y": 2}},
+            {"op": "move", "plant_id": "uuid", "color_id": "uuid",
+             "from": {"x": 1, "y": 2}, "to": {"x": 1.5, "y": 2}},
+            {"op": "remove", "plant_id": "uuid", "color_id": "uuid", "from": {"x": 1.5, "y": 2}},
+            {"op": "remove_plant", "plant_id": "uuid", "color_id": "uuid"},
+            {"op": "set", "name": "Garden Name", "width": 12, "length": 8}
+        ]
+    }
+
+    Returns: {"success": true, "garden_id": "uuid", "revision": 5}
+    When the garden changed since "revision", nothing is applied and the response is a 409
+    carrying the current revision.
+    """
+    try:
+        data = codec.read(request)
+        garden_id = uuid.UUID(str(data["garden_id"]))
+        revision = data.get("revision")
+        operations = data["ops"]
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return _error(request, "Invalid sync request")
+    if revision is None and "If-Match" not in request.headers:
+        return _error(request, "Missing revision")
+    if not isinstance(revision, int | None) or not isinstance(operations, list):
+        return _error(request, "Invalid sync request")
+    if len(operations) > GARDEN_SYNC_MAX_OPERATIONS:
+        return _error(request, "Too many operations")
+
+    try:
+        with transaction.atomic():
+            garden = get_object_or_404(
+                Garden.objects.select_for_update(), id=garden_id, user=request.user
+            )
+            if not _if_match(request, garden) or revision not in (None, garden.revision):
+                return _garden_conflict(request, garden)
+            if not operations or apply_operations(garden, operations) is None:
+                return _garden_response(request, garden, unchanged=True)
+            garden.revision += 1
+            garden.save()
+            return _garden_response(request, garden)
+    except (ValueError, Plant.DoesNotExist, Color.DoesNotExist) as e:
+        return _error(request, f"Invalid data: {str(e)}")
+
+
+def _error(request, message: str, status: int = 400) -> ApiResponse:
+    return ApiResponse(request, {"success": False, "error": message}, status=status)
+
+
+def _garden_etag(revision: int, catalog_version: int | None = None) -> str:
+    """
+    ETag of a garden revision, as in save responses. The document load_garden returns also
+    embeds catalog data, so its ETag adds the catalog version: "4-1730000000000000".
+    """
+    if catalog_version is None:
+        return quote_etag(str(revision))
+    return quote_etag(f"{revision}-{catalog_version}")
+
+
+def _etag_revision(etag: str) -> str:
+    """The revision a strong garden ETag names, whichever variant (see _garden_etag)."""
+    if not etag.startswith('"'):
+        return ""
+    return etag.strip('"').partition("+")[0].partition("-")[0]
+
+
+def _if_match(request, garden: Garden) -> bool:
+    """Whether the request has no If-Match header or it names the current revision."""
+    header = request.headers.get("If-Match")
+    if header is None:
+        return True
+    etags = parse_etags(header)
+    # Load responses name the revision with the catalog version, and with a suffix as
+    # MessagePack, so any ETag of the current revision matches
+    return "*" in etags or str(garden.revision) in map(_etag_revision, etags)
+
+
+def _garden_response(request, garden: Garden, unchanged: bool = False) -> ApiResponse:
+    response = ApiResponse(
+        request,
+        {
+            "success": True,
+            "garden_id": garden.id,
+            "revision": garden.revision,
+            "unchanged": unchanged,
+        },
+    )
+    response["ETag"] = _garden_etag(garden.revision)
+    return response
+
+
+def _garden_conflict(request, garden: Garden) -> ApiResponse:
+    response = ApiResponse(
+        request,
+        {"success": False, "error": "Revision conflict", "revision": garden.revision},
+        status=409,
+    )
+    response["ETag"] = _garden_etag(garden.revision)
+    return response
 
 
 @login_required
@@ -317,6 +598,9 @@ def load_garden(request, garden_id):
     """
     Load a garden from the database and return as JSON for localStorage.
 
+    Served from the user's garden cache when possible (see planner.garden_cache), with the
+    revision and catalog version as ETag: a request with a matching If-None-Match gets a 304.
+
     Returns:
     {
         "garden_id": "uuid",
@@ -334,30 +618,23 @@ def load_garden(request, garden_id):
         ]
     }
     """
-    garden = get_object_or_404(Garden, id=garden_id, user=request.user)
-
-    plants_data = [
-        {
-            "plant_id": str(gp.plant.id),
-            "color_id": str(gp.color.id),
-            "niche_id": str(gp.plant.niche_id) if gp.plant.niche_id else None,
-            "positions": [{"x": pos.x, "y": pos.y} for pos in gp.positions.all()],
-        }
-        for gp in garden.garden_plants.select_related(
-            "plant", "color", "plant__niche"
-        ).prefetch_related("positions")
-    ]
-
-    return JsonResponse(
-        {
-            "garden_id": str(garden.id),
-            "name": garden.name,
-            "width": garden.width,
-            "length": garden.length,
-            "description": garden.description,
-            "plants": plants_data,
+    catalog_version = get_catalog_version()
+    key = garden_cache_key(request.user.id, garden_id, catalog_version)
+    entry = get_cached(key)
+    if entry is None:
+        # Assembled and serialized by Postgres, see planner.documents
+        row = garden_document_json(garden_id, request.user.id)
+        if row is None:
+            raise Http404("No Garden matches the given query.")
+        revision, updated_at, document = row
+        entry = {
+            "body": document,
+            # Also sent back as If-Match when saving, see save_garden
+            "etag": _garden_etag(revision, catalog_version),
+            "last_modified": int(updated_at.timestamp()),
         }
-    )
+        fill_cache(key, entry)
+    return _cached_response(request, entry)
 
 
 @login_required
@@ -366,6 +643,8 @@ def list_gardens(request):
     """
     List all gardens for the authenticated user.
 
+    Cached per user like load_garden, and answered 304 when If-None-Match is current.
+
     Returns:
     {
         "gardens": [
@@ -373,32 +652,107 @@ def list_gardens(request):
                 "id": "uuid",
                 "name": "Garden Name",
                 "created_at": "2026-01-05T12:00:00Z",
-                "plant_count": 5
+                "plant_count": 5,
+                "position_count": 42,
+                "thumbnail_url": "/media/gardens/thumbnails/uuid.0123456789ab.png"
             }
         ]
     }
     """
-    gardens = (
-        Garden.objects.filter(user=request.user)
-        .annotate(plant_count=Count("garden_plants"))
-        .order_by("-created_at")
-    )
+    key = garden_list_cache_key(request.user.id)
+    entry = get_cached(key)
+    if entry is None:
+        # Counts are maintained on the garden, see planner.gardens.save_packed_plants
+        gardens = list(Garden.objects.filter(user=request.user).order_by("-created_at"))
 
-    gardens_data = [
-        {
-            "id": str(garden.id),
-            "name": garden.name,
-            "created_at": garden.created_at.isoformat(),
-            # added via annotation
-            "plant_count": garden.plant_count,  # type: ignore[attr-defined]
+        gardens_data = [
+            {
+                "id": garden.id,
+                "name": garden.name,
+                "created_at": garden.created_at,
+                "plant_count": garden.plant_count,
+                "position_count": garden.position_count,
+                # Rendered after each save, see planner.thumbnails; may show a past revision
+                "thumbnail_url": garden.thumbnail.url if garden.thumbnail else None,
+            }
+            for garden in gardens
+        ]
+
+        body = codec.dumps({"gardens": gardens_data})
+        entry = {
+            "body": body,
+            "etag": quote_etag(hashlib.sha256(body).hexdigest()[:32]),
+            "last_modified": max(
+                (int(garden.updated_at.timestamp()) for garden in gardens), default=None
+            ),
+        }
+        fill_cache(key, entry)
+    return _cached_response(request, entry)
+
+
+@login_required
+@require_GET
+def load_garden_analytics(request, garden_id):
+    """
+    Analytics of a saved garden for the garden summary (see planner.analytics), cached by
+    revision and catalog version, which make up the ETag.
+
+    Returns:
+    {
+        "plant_count": 12, "species_count": 10, "position_count": 48, "color_count": 5,
+        "colors": [{"id": "uuid", "hex": "#aa44cc", "name": "Purple", "positions": 9}],
+        "native": {"plants": 9, "positions": 40, "ratio": 0.83},
+        "niches": {"covered": 4, "total": 6, "names": ["Groundcover", ...]},
+        "features": [{"id": 1, "name": "Pollinator", "icon": "/media/...", "count": 7}],
+        "bloom": [{"month": "jan", "label": "January", "plants": 0, "positions": 0,
+                   "colors": {"uuid": 9}}, ...],
+        "canopy_area": 120.5, "canopy_ratio": 0.6,
+        "plants": [{"plant_id", "color_id", "common_name", "scientific_name", "height",
+                    "quantity"}]
+    }
+    """
+    catalog_version = get_catalog_version()
+    revision = (
+        Garden.objects.filter(id=garden_id, user=request.user)
+        .values_list("revision", flat=True)
+        .first()
+    )
+    if revision is None:
+        raise Http404("No Garden matches the given query.")
+    entry = get_cached(analytics_cache_key(garden_id, revision, catalog_version))
+    if entry is None:
+        try:
+            # Computed from one snapshot of the garden, which may be newer than revision
+            revision, analytics = garden_analytics(garden_id, request.user.id)
+        except Garden.DoesNotExist as e:
+            raise Http404("No Garden matches the given query.") from e
+        entry = {
+            "body": codec.dumps(analytics),
+            "etag": quote_etag(f"{revision}-{catalog_version}"),
+            "last_modified": None,
         }
-        for garden in gardens
-    ]
+        fill_cache(analytics_cache_key(garden_id, revision, catalog_version), entry)
+    return _cached_response(request, entry)
+
 
-    return JsonResponse({"gardens": gardens_data})
+def _cached_response(request, entry: dict) -> HttpResponse:
+    """A cached garden response (see planner.garden_cache), or 304 if the client's is current."""
+    content_type = negotiate(request)
+    etag = variant_etag(entry["etag"], content_type)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=entry["last_modified"], response=None
+    )
+    if response is None:
+        response = HttpResponse(transcode(entry["body"], content_type), content_type=content_type)
+    patch_vary_headers(response, ["Accept"])
+    response["ETag"] = etag
+    if entry["last_modified"] is not None:
+        response["Last-Modified"] = http_date(entry["last_modified"])
+    response["Cache-Control"] = GARDEN_CACHE_CONTROL
+    return response
 
 
-@require_POST
+@require_http_methods(["GET", "POST"])
 def get_garden_plants(request):
     """
     Fetch plant details for garden summary.
@@ -411,49 +765,39 @@ def get_garden_plants(request):
         ]
     }
 
+    Or, cacheable by browsers and proxies, a GET with the same selections as sorted
+    "plant_id:color_id" pairs: ?plants=uuid:uuid,uuid:uuid. Its ETag changes with the
+    catalog, and a matching If-None-Match gets a 304 without reading anything.
+
     Returns plant details with color, height, bloom, features, niche, native status.
+    The query count doesn't depend on the number of plants, see planner.plant_details.
     """
-    try:
-        data = json.loads(request.body)
-    except json.JSONDecodeError:
-        return JsonResponse({"success": False, "error": "Invalid JSON"}, status=400)
-
-    plant_selections = data.get("plants", [])
-    results = []
-
-    for selection in plant_selections:
-        plant_id = selection.get("plant_id")
-        color_id = selection.get("color_id")
-
+    if request.method == "GET":
+        pairs = [pair.partition(":") for pair in request.GET.get("plants", "").split(",") if pair]
+        raw = [{"plant_id": plant_id, "color_id": color_id} for plant_id, _, color_id in pairs]
+    else:
         try:
-            plant = (
-                Plant.objects.select_related("niche")
-                .prefetch_related("features", "colors")
-                .get(id=plant_id)
-            )
-            color = Color.objects.get(id=color_id)
-
-            results.append(
-                {
-                    "plant_id": str(plant.id),
-                    "color_id": str(color.id),
-                    "common_name": plant.common_name,
-                    "scientific_name": plant.scientific_name,
-                    "height": plant.height,
-                    "spread": plant.spread,
-                    "bloom": plant.bloom,
-                    "native": plant.native,
-                    "niche_id": str(plant.niche.id) if plant.niche else None,
-                    "niche_name": plant.niche.title if plant.niche else None,
-                    "color_hex": color.hex_code,
-                    "color_name": color.name,
-                    "features": [
-                        {"id": str(f.id), "name": f.name, "icon": f.icon.url if f.icon else None}
-                        for f in plant.features.all()
-                    ],
-                }
-            )
-        except (Plant.DoesNotExist, Color.DoesNotExist):
-            continue
-
-    return JsonResponse({"success": True, "plants": results})
+            raw = codec.read(request).get("plants", [])
+        except (codec.DecodeError, AttributeError):
+            return _error(request, "Invalid body")
+        if not isinstance(raw, list):
+            return _error(request, "Invalid data")
+
+    if len(raw) > GARDEN_PLANTS_MAX_SELECTIONS:
+        return _error(request, "Too many plants")
+    selections = parse_selections(raw)
+
+    if request.method == "POST":
+        return ApiResponse(request, {"success": True, "plants": plant_details(selections)})
+
+    # Versioned like the catalog caches: any catalog change makes a new representation
+    canonical = [f"{plant_id}:{color_id}" for plant_id, color_id in selections]
+    etag = variant_etag(
+        quote_etag(catalog_cache_key("garden_plants", {"plants": canonical})), negotiate(request)
+    )
+    response = get_conditional_response(request, etag=etag, response=None)
+    if response is None:
+        response = ApiResponse(request, {"success": True, "plants": plant_details(selections)})
+    response["ETag"] = etag
+    patch_cache_control(response, public=True, max_age=GARDEN_PLANTS_MAX_AGE)
+    return response
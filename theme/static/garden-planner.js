@@ -3,6 +3,9 @@
  * Interactive canvas for placing plants in a garden layout
  */
 
+// Longer summaries are POSTed, URLs past a few KB get rejected by proxies
+const MAX_GET_URL_LENGTH = 4000;
+
 class GardenPlanner {
     constructor() {
         this.canvas = document.getElementById('garden-canvas');
@@ -106,19 +109,24 @@ class GardenPlanner {
 
         try {
             const apiUrl = document.querySelector('[data-plants-url]').dataset.plantsUrl;
-            const response = await fetch(apiUrl, {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                    'X-CSRFToken': this.getCookie('csrftoken')
-                },
-                body: JSON.stringify({
-                    plants: state.plants.map(p => ({
-                        plant_id: p.plant_id,
-                        color_id: p.color_id
-                    }))
-                })
-            });
+            // Sorted, so the same garden always maps to the same cacheable URL
+            const pairs = state.plants.map(p => `${p.plant_id}:${p.color_id}`).sort();
+            const getUrl = `${apiUrl}?plants=${pairs.join(',')}`;
+            const response = getUrl.length <= MAX_GET_URL_LENGTH
+                ? await fetch(getUrl)
+                : await fetch(apiUrl, {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                        'X-CSRFToken': this.getCookie('csrftoken')
+                    },
+                    body: JSON.stringify({
+                        plants: state.plants.map(p => ({
+                            plant_id: p.plant_id,
+                            color_id: p.color_id
+                        }))
+                    })
+                });
 
             const data = await response.json();
             if (data.success && data.plants) {
@@ -373,6 +381,8 @@ class GardenPlanner {
         
         if (plant) {
             this.draggedPlant = plant;
+            // Dragging mutates the stored position, keep where it started for the sync op
+            this.dragStart = { x: plant.position.x, y: plant.position.y };
             const gardenCoords = this.canvasToGarden(canvasX, canvasY);
             this.dragOffset.x = gardenCoords.x - plant.position.x;
             this.dragOffset.y = gardenCoords.y - plant.position.y;
@@ -406,7 +416,8 @@ class GardenPlanner {
             this.draggedPlant.colorId,
             this.draggedPlant.posIndex,
             this.draggedPlant.position.x,
-            this.draggedPlant.position.y
+            this.draggedPlant.position.y,
+            this.dragStart
         );
 
         this.draggedPlant = null;
@@ -476,15 +487,28 @@ class GardenPlanner {
         saveBtn.textContent = 'Saving...';
 
         try {
-            const saveUrl = document.querySelector('[data-save-url]').dataset.saveUrl;
-            const response = await fetch(saveUrl, {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                    'X-CSRFToken': this.getCookie('csrftoken')
-                },
-                body: JSON.stringify(this.gardenState.state)
-            });
+            // Send only the edits since the last save when the server has this garden,
+            // fall back to the whole garden when it changed elsewhere (409)
+            let response = null;
+            if (this.gardenState.canSync()) {
+                response = await this.postJson(
+                    document.querySelector('[data-sync-url]').dataset.syncUrl,
+                    {
+                        garden_id: this.gardenState.state.garden_id,
+                        revision: this.gardenState.state.revision,
+                        ops: this.gardenState.ops
+                    }
+                );
+            }
+            if (!response || response.status === 409 || response.status === 400) {
+                response = await this.saveWholeGarden(this.gardenState.state.revision);
+            }
+            if (response.status === 409) {
+                if (!confirm('This garden was changed in another window. Overwrite those changes?')) {
+                    return;
+                }
+                response = await this.saveWholeGarden(null);
+            }
 
             // Check if response is OK before parsing JSON
             if (!response.ok) {
@@ -499,11 +523,8 @@ class GardenPlanner {
 
             if (data.success) {
                 alert('Garden saved successfully!');
-                // Update garden ID in localStorage if this was a new garden
-                if (data.garden_id && !this.gardenState.state.garden_id) {
-                    this.gardenState.state.garden_id = data.garden_id;
-                    this.gardenState.save();
-                }
+                // Remember the garden ID and the revision the next edits apply to
+                this.gardenState.markSynced(data.garden_id, data.revision);
             } else {
                 alert('Failed to save garden: ' + (data.error || 'Unknown error'));
             }
@@ -516,6 +537,28 @@ class GardenPlanner {
         }
     }
 
+    saveWholeGarden(revision) {
+        // If-Match makes the server refuse to overwrite a newer revision (409)
+        const headers = Number.isInteger(revision) ? { 'If-Match': `"${revision}"` } : {};
+        return this.postJson(
+            document.querySelector('[data-save-url]').dataset.saveUrl,
+            this.gardenState.state,
+            headers
+        );
+    }
+
+    postJson(url, body, headers = {}) {
+        return fetch(url, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': this.getCookie('csrftoken'),
+                ...headers
+            },
+            body: JSON.stringify(body)
+        });
+    }
+
     getCookie(name) {
         let cookieValue = null;
         if (document.cookie && document.cookie !== '') {
@@ -7,7 +7,9 @@
 class GardenState {
     constructor() {
         this.storageKey = 'floret_garden_state';
+        this.opsKey = 'floret_garden_ops';
         this.state = this.load();
+        this.ops = this.loadOps();
     }
 
     /**
@@ -38,18 +40,64 @@ class GardenState {
         }
     }
 
+    /**
+     * Load the edits made since the last sync with the server
+     * @returns {Array|null} Pending operations, or null when they are unknown
+     */
+    loadOps() {
+        try {
+            const stored = localStorage.getItem(this.opsKey);
+            return stored ? JSON.parse(stored) : [];
+        } catch (e) {
+            return null;
+        }
+    }
+
     /**
      * Save garden state to localStorage
      */
     save() {
         try {
             localStorage.setItem(this.storageKey, JSON.stringify(this.state));
+            localStorage.setItem(this.opsKey, JSON.stringify(this.ops));
             this.updateSummary();
         } catch (e) {
             console.error('Failed to save garden state:', e);
         }
     }
 
+    /**
+     * Record an edit for the next incremental sync.
+     * Only needed once the garden exists on the server; before that it is saved whole.
+     * @param {Object} op - Sync operation (see planner.gardens)
+     */
+    recordOp(op) {
+        if (this.state.garden_id && this.ops !== null) {
+            this.ops.push(op);
+        }
+    }
+
+    /**
+     * Mark the local garden as in sync with a server revision
+     * @param {string} gardenId - Garden UUID
+     * @param {number} revision - Revision returned by the server
+     */
+    markSynced(gardenId, revision) {
+        this.state.garden_id = gardenId;
+        this.state.revision = revision;
+        this.ops = [];
+        this.save();
+    }
+
+    /**
+     * Whether the pending edits can be sent incrementally instead of the whole garden
+     * @returns {boolean}
+     */
+    canSync() {
+        return Boolean(this.state.garden_id) && Number.isInteger(this.state.revision)
+            && this.ops !== null;
+    }
+
     /**
      * Toggle a plant/color combination (add if not present, remove if present)
      * @param {string} plantId - Plant UUID
@@ -64,8 +112,10 @@ class GardenState {
         if (index >= 0) {
             // Remove if already selected
             this.state.plants.splice(index, 1);
+            this.recordOp({ op: 'remove_plant', plant_id: plantId, color_id: colorId });
         } else {
             // Add if not selected
+            this.recordOp({ op: 'add_plant', plant_id: plantId, color_id: colorId });
             this.state.plants.push({
                 plant_id: plantId,
                 color_id: colorId,
@@ -116,6 +166,7 @@ class GardenState {
     updateDimensions(width, length) {
         this.state.width = parseFloat(width);
         this.state.length = parseFloat(length);
+        this.recordOp({ op: 'set', width: this.state.width, length: this.state.length });
         this.save();
     }
 
@@ -125,6 +176,7 @@ class GardenState {
      */
     updateName(name) {
         this.state.name = name;
+        this.recordOp({ op: 'set', name });
         this.save();
     }
 
@@ -143,6 +195,7 @@ class GardenState {
 
         if (plant) {
             plant.positions.push({ x, y });
+            this.recordOp({ op: 'add', plant_id: plantId, color_id: colorId, to: { x, y } });
             this.save();
             return plant.positions.length - 1;
         }
@@ -157,13 +210,21 @@ class GardenState {
      * @param {number} index - Position index
      * @param {number} x - X coordinate in feet
      * @param {number} y - Y coordinate in feet
+     * @param {Object} [from] - Stored coordinates before the move, when the position object
+     *     was already mutated (e.g. while dragging)
      */
-    updatePosition(plantId, colorId, index, x, y) {
+    updatePosition(plantId, colorId, index, x, y, from) {
         const plant = this.state.plants.find(
             p => p.plant_id === plantId && p.color_id === colorId
         );
 
         if (plant && plant.positions[index]) {
+            const previous = from || { ...plant.positions[index] };
+            if (previous.x !== x || previous.y !== y) {
+                this.recordOp({
+                    op: 'move', plant_id: plantId, color_id: colorId, from: previous, to: { x, y }
+                });
+            }
             plant.positions[index] = { x, y };
             this.save();
         }
@@ -181,6 +242,9 @@ class GardenState {
         );
 
         if (plant && plant.positions[index] !== undefined) {
+            this.recordOp({
+                op: 'remove', plant_id: plantId, color_id: colorId, from: { ...plant.positions[index] }
+            });
             plant.positions.splice(index, 1);
             this.save();
         }
@@ -246,6 +310,7 @@ class GardenState {
      */
     clear() {
         this.state = { plants: [] };
+        this.ops = [];
         this.save();
     }
 }
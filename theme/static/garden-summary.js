@@ -3,6 +3,9 @@
  * Fetches plant details from localStorage selections and displays analytics
  */
 
+// Longer summaries are POSTed, URLs past a few KB get rejected by proxies
+const MAX_GET_URL_LENGTH = 4000;
+
 document.addEventListener('DOMContentLoaded', async () => {
     await loadGardenSummary();
 });
@@ -16,24 +19,48 @@ async function loadGardenSummary() {
         return;
     }
     
-    // Get API URL from data attribute
-    const apiUrl = document.querySelector('[data-api-url]').dataset.apiUrl;
+    // Get API URLs from data attributes
+    const dataset = document.querySelector('[data-api-url]').dataset;
+    const apiUrl = dataset.apiUrl;
+
+    // A saved garden without unsaved edits is summarized by the server in one small request
+    const pendingOps = JSON.parse(localStorage.getItem('floret_garden_ops') || '[]');
+    if (gardenState.garden_id && pendingOps.length === 0) {
+        try {
+            const analyticsUrl = dataset.analyticsUrl.replace(
+                dataset.analyticsPlaceholder, gardenState.garden_id
+            );
+            const response = await fetch(analyticsUrl, { headers: { 'Accept': 'application/json' } });
+            // Anonymous users are redirected to the login page instead
+            if (response.ok && (response.headers.get('Content-Type') || '').startsWith('application/json')) {
+                renderAnalytics(await response.json());
+                return;
+            }
+        } catch (error) {
+            console.error('Failed to load garden analytics:', error);
+        }
+    }
     
     // Fetch plant details from API
     try {
-        const response = await fetch(apiUrl, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-                'X-CSRFToken': getCookie('csrftoken')
-            },
-            body: JSON.stringify({
-                plants: gardenState.plants.map(p => ({
-                    plant_id: p.plant_id,
-                    color_id: p.color_id
-                }))
-            })
-        });
+        // Sorted, so the same garden always maps to the same cacheable URL
+        const pairs = gardenState.plants.map(p => `${p.plant_id}:${p.color_id}`).sort();
+        const getUrl = `${apiUrl}?plants=${pairs.join(',')}`;
+        const response = getUrl.length <= MAX_GET_URL_LENGTH
+            ? await fetch(getUrl)
+            : await fetch(apiUrl, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'X-CSRFToken': getCookie('csrftoken')
+                },
+                body: JSON.stringify({
+                    plants: gardenState.plants.map(p => ({
+                        plant_id: p.plant_id,
+                        color_id: p.color_id
+                    }))
+                })
+            });
         
         const data = await response.json();
         
@@ -58,13 +85,44 @@ function renderSummary(plants) {
     document.querySelector('[data-summary-plants]').textContent = stats.plantCount;
     document.querySelector('[data-summary-colors]').textContent = stats.colorCount;
     document.querySelector('[data-summary-native]').textContent = stats.nativeCount;
-    document.querySelector('[data-summary-niches]').textContent = `${stats.nicheCount}/6`;
+    const nicheTotal = document.querySelector('[data-niche-count]').dataset.nicheCount;
+    document.querySelector('[data-summary-niches]').textContent = `${stats.nicheCount}/${nicheTotal}`;
     
     // Render sections
     renderColorPalette(stats.colors);
     renderFeatures(stats.features);
     renderHeightDistribution(plants);
-    renderBloomCalendar(plants, stats.colors);
+    renderBloomCalendar(bloomColorsOf(plants));
+    renderPlantsList(plants);
+}
+
+function renderAnalytics(analytics) {
+    if (analytics.plant_count === 0) {
+        showEmptyState();
+        return;
+    }
+    document.getElementById('empty-state').classList.add('hidden');
+
+    const colors = new Map(analytics.colors.map(color => [color.id, color]));
+    const plants = analytics.plants.map(plant => ({
+        ...plant,
+        color_hex: colors.get(plant.color_id).hex,
+        color_name: colors.get(plant.color_id).name
+    }));
+
+    document.querySelector('[data-summary-plants]').textContent = analytics.plant_count;
+    document.querySelector('[data-summary-colors]').textContent = analytics.color_count;
+    document.querySelector('[data-summary-native]').textContent = analytics.native.plants;
+    document.querySelector('[data-summary-niches]').textContent =
+        `${analytics.niches.covered}/${analytics.niches.total}`;
+
+    renderColorPalette(analytics.colors);
+    renderFeatures(analytics.features);
+    renderHeightDistribution(plants);
+    renderBloomCalendar(new Map(analytics.bloom.map(month => [
+        month.month,
+        new Set(Object.keys(month.colors).map(colorId => colors.get(colorId).hex))
+    ])));
     renderPlantsList(plants);
 }
 
@@ -186,7 +244,7 @@ function renderHeightDistribution(plants) {
     }).join('');
 }
 
-function renderBloomCalendar(plants, colors) {
+function renderBloomCalendar(bloomData) {
     const container = document.getElementById('bloom-calendar');
     
     const months = [
@@ -204,22 +262,6 @@ function renderBloomCalendar(plants, colors) {
         { key: 'dec', label: 'Dec' }
     ];
     
-    // Build bloom data by month
-    const bloomData = new Map();
-    months.forEach(month => {
-        bloomData.set(month.key, new Set());
-    });
-    
-    plants.forEach(plant => {
-        if (plant.bloom && Array.isArray(plant.bloom)) {
-            plant.bloom.forEach(monthKey => {
-                if (bloomData.has(monthKey)) {
-                    bloomData.get(monthKey).add(plant.color_hex);
-                }
-            });
-        }
-    });
-    
     container.innerHTML = months.map(month => {
         const colorSet = bloomData.get(month.key);
         const hasBloom = colorSet && colorSet.size > 0;
@@ -239,6 +281,27 @@ function renderBloomCalendar(plants, colors) {
     }).join('');
 }
 
+/**
+ * Bloom colors by month key, from plant details
+ * @returns {Map<string, Set<string>>}
+ */
+function bloomColorsOf(plants) {
+    const bloomData = new Map(
+        ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+            .map(month => [month, new Set()])
+    );
+    plants.forEach(plant => {
+        if (plant.bloom && Array.isArray(plant.bloom)) {
+            plant.bloom.forEach(monthKey => {
+                if (bloomData.has(monthKey)) {
+                    bloomData.get(monthKey).add(plant.color_hex);
+                }
+            });
+        }
+    });
+    return bloomData;
+}
+
 function renderPlantsList(plants) {
     const container = document.getElementById('selected-plants-list');
     
@@ -27,19 +27,19 @@ function initializeFilters() {
     const nicheFilterText = document.getElementById('niche-filter-text');
     const nicheOptions = document.querySelectorAll('.niche-option');
     
-    const sunFilterBtn = document.getElementById('sun-filter-btn');
     const sunFilterText = document.getElementById('sun-filter-text');
     const sunOptions = document.querySelectorAll('.sun-option');
     
-    const bloomFilterBtn = document.getElementById('bloom-filter-btn');
     const bloomFilterText = document.getElementById('bloom-filter-text');
     const bloomOptions = document.querySelectorAll('.bloom-option');
+    const bloomMatchAll = document.getElementById('bloom-match-all');
     
     let activeFilters = {
         search: '',
         niche: '',
-        sun: '',
-        bloom: '',
+        sun: [],
+        bloom: [],
+        bloomMatch: 'any',
         native: false,
         buyable: false,
         heightMin: null,
@@ -61,15 +61,77 @@ function initializeFilters() {
         debounceTimer = setTimeout(() => {
             // Trigger HTMX to reload plant list
             htmx.trigger(document.body, 'filterUpdate');
+            updateFacetCounts();
         }, 500);
     }
 
+    async function updateFacetCounts() {
+        const facetsUrl = filtersInput.dataset.facetsUrl;
+        if (!facetsUrl) {
+            return;
+        }
+
+        try {
+            const params = new URLSearchParams({ filters: filtersInput.value });
+            const response = await fetch(`${facetsUrl}?${params}`);
+            if (!response.ok) {
+                return;
+            }
+            const data = await response.json();
+            applyFacetCounts(data.facets);
+        } catch (error) {
+            console.error('Failed to load facet counts:', error);
+        }
+    }
+
+    function applyFacetCounts(facets) {
+        const setOptionCount = (option, count) => {
+            const badge = option.querySelector('.facet-count');
+            if (badge) {
+                badge.textContent = count;
+            }
+            option.classList.toggle('opacity-50', count === 0);
+        };
+
+        nicheOptions.forEach(option => {
+            if (option.dataset.value) {
+                setOptionCount(option, facets.niche[option.dataset.value] || 0);
+            }
+        });
+        sunOptions.forEach(option => {
+            if (option.dataset.value) {
+                setOptionCount(option, facets.sun[option.dataset.value] || 0);
+            }
+        });
+        bloomOptions.forEach(option => {
+            if (option.dataset.value) {
+                setOptionCount(option, facets.bloom[option.dataset.value] || 0);
+            }
+        });
+
+        colorSwatches.forEach(swatch => {
+            const count = facets.colors[swatch.dataset.color] || 0;
+            swatch.dataset.count = count;
+            swatch.classList.toggle('opacity-30', count === 0);
+        });
+        featureIcons.forEach(icon => {
+            const count = facets.features[icon.dataset.feature] || 0;
+            icon.dataset.count = count;
+            icon.classList.toggle('opacity-30', count === 0);
+        });
+    }
+
+    function optionLabel(option) {
+        const label = option.querySelector('.facet-label');
+        return (label || option).textContent.trim();
+    }
+
     // Niche dropdown handlers
     nicheOptions.forEach(option => {
         option.addEventListener('click', (e) => {
             e.preventDefault();
             const value = option.dataset.value;
-            const text = option.textContent.trim();
+            const text = optionLabel(option);
             
             nicheFilter.value = value;
             nicheFilterText.textContent = text;
@@ -86,48 +148,77 @@ function initializeFilters() {
         });
     });
 
-    // Sun dropdown handlers
-    sunOptions.forEach(option => {
-        option.addEventListener('click', (e) => {
-            e.preventDefault();
-            const value = option.dataset.value;
-            const text = option.textContent.trim();
-            
-            sunFilter.value = value;
-            sunFilterText.textContent = text;
-            
-            sunOptions.forEach(opt => opt.classList.remove('active'));
-            option.classList.add('active');
-            
-            if (sunFilterBtn) {
-                sunFilterBtn.blur();
-            }
-            
-            activeFilters.sun = value;
-            triggerFilterUpdate();
-        });
-    });
+    // Sun and bloom select several values: full or partial sun, blooms some time in
+    // May-Jul, or with "every month" checked, in each of them
+    function bindMultiSelect(options, input, text, anyLabel, key, describe) {
+        const order = Array.from(options, opt => opt.dataset.value);
 
-    // Bloom dropdown handlers
-    bloomOptions.forEach(option => {
-        option.addEventListener('click', (e) => {
-            e.preventDefault();
-            const value = option.dataset.value;
-            const text = option.textContent.trim();
-            
-            bloomFilter.value = value;
-            bloomFilterText.textContent = text;
-            
-            bloomOptions.forEach(opt => opt.classList.remove('active'));
-            option.classList.add('active');
-            
-            if (bloomFilterBtn) {
-                bloomFilterBtn.blur();
+        const render = () => {
+            const selected = activeFilters[key];
+            input.value = selected.join(',');
+            options.forEach(opt => {
+                const value = opt.dataset.value;
+                opt.classList.toggle('active', value ? selected.includes(value) : !selected.length);
+            });
+            if (text) {
+                text.textContent = selected.length ? describe(selected) : anyLabel;
             }
-            
-            activeFilters.bloom = value;
-            triggerFilterUpdate();
+        };
+
+        options.forEach(option => {
+            option.addEventListener('click', (e) => {
+                e.preventDefault();
+                const value = option.dataset.value;
+                const selected = activeFilters[key];
+
+                if (!value) {
+                    activeFilters[key] = [];
+                } else if (selected.includes(value)) {
+                    activeFilters[key] = selected.filter(v => v !== value);
+                } else {
+                    // Kept in menu order, so a season reads as a range
+                    activeFilters[key] = [...selected, value].sort(
+                        (a, b) => order.indexOf(a) - order.indexOf(b)
+                    );
+                }
+                render();
+                triggerFilterUpdate();
+            });
         });
+        return render;
+    }
+
+    function labelsOf(options, values) {
+        return values.map(value => optionLabel(
+            Array.from(options).find(opt => opt.dataset.value === value)
+        ));
+    }
+
+    const renderSun = bindMultiSelect(
+        sunOptions, sunFilter, sunFilterText, 'Any Sun', 'sun',
+        values => labelsOf(sunOptions, values).join(' or ')
+    );
+
+    const bloomOrder = Array.from(bloomOptions, opt => opt.dataset.value);
+    const renderBloom = bindMultiSelect(
+        bloomOptions, bloomFilter, bloomFilterText, 'Any Bloom Month', 'bloom',
+        values => {
+            const labels = labelsOf(bloomOptions, values);
+            const positions = values.map(value => bloomOrder.indexOf(value));
+            const contiguous = positions.every((pos, i) => !i || pos === positions[i - 1] + 1);
+            const months = contiguous && labels.length > 2
+                ? `${labels[0]}–${labels[labels.length - 1]}`
+                : labels.join(', ');
+            return activeFilters.bloomMatch === 'all' && labels.length > 1
+                ? `Every month ${months}`
+                : months;
+        }
+    );
+
+    bloomMatchAll?.addEventListener('change', (e) => {
+        activeFilters.bloomMatch = e.target.checked ? 'all' : 'any';
+        renderBloom();
+        triggerFilterUpdate();
     });
 
     // Search input
@@ -207,8 +298,9 @@ function initializeFilters() {
         // Reset form inputs
         searchInput.value = '';
         nicheFilter.value = '';
-        sunFilter.value = '';
-        bloomFilter.value = '';
+        if (bloomMatchAll) {
+            bloomMatchAll.checked = false;
+        }
         nativeFilter.checked = false;
         buyableFilter.checked = false;
         heightMin.value = '';
@@ -227,26 +319,6 @@ function initializeFilters() {
             }
         });
         
-        if (sunFilterText) {
-            sunFilterText.textContent = 'Any Sun';
-        }
-        sunOptions.forEach(opt => {
-            opt.classList.remove('active');
-            if (opt.dataset.value === '') {
-                opt.classList.add('active');
-            }
-        });
-        
-        if (bloomFilterText) {
-            bloomFilterText.textContent = 'Any Bloom Month';
-        }
-        bloomOptions.forEach(opt => {
-            opt.classList.remove('active');
-            if (opt.dataset.value === '') {
-                opt.classList.add('active');
-            }
-        });
-
         // Reset color and feature selections
         colorSwatches.forEach(swatch => swatch.classList.remove('active'));
         featureIcons.forEach(icon => icon.classList.remove('active'));
@@ -255,8 +327,9 @@ function initializeFilters() {
         activeFilters = {
             search: '',
             niche: '',
-            sun: '',
-            bloom: '',
+            sun: [],
+            bloom: [],
+            bloomMatch: 'any',
             native: false,
             buyable: false,
             heightMin: null,
@@ -266,7 +339,11 @@ function initializeFilters() {
             colors: [],
             features: []
         };
+        renderSun();
+        renderBloom();
 
         triggerFilterUpdate();
     });
+
+    updateFacetCounts();
 }